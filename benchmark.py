@@ -0,0 +1,265 @@
+"""
+Reproducible benchmarks of the generation engines:
+
+    python benchmark.py run --output data/bench.json
+    python benchmark.py run --engines numpy --in-place --trace-allocations
+    python benchmark.py compare data/bench_old.json data/bench.json --threshold 0.1
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import enums
+import patterns
+from field import Field
+from utils import Vector2
+
+DEFAULT_SEED = 42
+DEFAULT_SIZES = (35, 256, 1024, 4096, 8192)
+DEFAULT_DENSITIES = (10, 30, 50)
+DEFAULT_ENGINES = (enums.EngineTypes.numpy, enums.EngineTypes.bitboard, enums.EngineTypes.tiled,
+                   enums.EngineTypes.parallel, enums.EngineTypes.sparse, enums.EngineTypes.hashlife)
+DEFAULT_WORKERS = os.cpu_count() or 1
+DEFAULT_THRESHOLD = 0.1
+
+# amount of cell updates a single case aims for, the amount of generations is derived from it
+CELL_BUDGET = 50_000_000
+MIN_GENERATIONS = 3
+MAX_GENERATIONS = 200
+# engines that walk cells in Python are only measured on boards up to this many cells
+SLOW_ENGINES_MAX_CELLS = 1024 * 1024
+SLOW_ENGINES = (enums.EngineTypes.sparse, enums.EngineTypes.hashlife)
+
+PATTERN_WORKLOADS = {
+    "r_pentomino": (patterns.PATTERNS["r_pentomino"], 256),
+    "gosper_gun": (patterns.PATTERNS["gosper_glider_gun"], 256),
+}
+
+
+def getBoundaryMode(engine_type: enums.EngineTypes.__dict__) -> enums.BoundaryModes.__dict__:
+    if engine_type in SLOW_ENGINES:
+        return enums.BoundaryModes.unbounded
+    return enums.BoundaryModes.dead
+
+
+def getGenerations(cells: int) -> int:
+    return max(MIN_GENERATIONS, min(MAX_GENERATIONS, CELL_BUDGET // cells))
+
+
+def getCaseName(engine_type: enums.EngineTypes.__dict__, workload: str, size: int, workers: int,
+                in_place: bool = False) -> str:
+    """
+    Parallel cases are named by their worker count and in-place runs by the mode too,
+    so only runs measured the same way are compared
+    """
+    name = f"{engine_type.name}/{workload}/{size}x{size}"
+    if engine_type == enums.EngineTypes.parallel:
+        name += f"/w{workers}"
+    if in_place:
+        name += "/in_place"
+    return name
+
+
+def measureAllocations(tick, generations: int) -> tuple[int, int]:
+    """
+    Medians of the bytes a generation allocated at its peak and of the blocks it left allocated.
+    tracemalloc and the block count are process-wide, the benchmark steps in a single thread so they only see the tick
+    """
+    peak_bytes = []
+    blocks = []
+    tracemalloc.start()
+    try:
+        for _ in range(generations):
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+            blocks_before = sys.getallocatedblocks()
+            tick()
+            blocks.append(sys.getallocatedblocks() - blocks_before)
+            peak_bytes.append(tracemalloc.get_traced_memory()[1] - traced_before)
+    finally:
+        tracemalloc.stop()
+
+    return int(statistics.median(peak_bytes)), int(statistics.median(blocks))
+
+
+def measureCase(name: str, field: Field, engine_type, workload: str, size: int, density: int | None,
+                workers: int, in_place: bool = False, trace_allocations: bool = False) -> dict:
+    cells = size * size
+    generations = getGenerations(cells)
+    tick = field.processTickInPlace if in_place else field.processTick
+
+    tick()  # warm up caches and lazily allocated buffers
+    tick_times = []
+    for _ in range(generations):
+        start_time = time.perf_counter()
+        tick()
+        tick_times.append(time.perf_counter() - start_time)
+
+    # traced separately, tracemalloc slows the ticks down
+    allocated_bytes, allocated_blocks = measureAllocations(tick, generations) if trace_allocations else (None, None)
+
+    median = statistics.median(tick_times)
+    return {
+        "name": name,
+        "engine": engine_type.name,
+        "workload": workload,
+        "size": size,
+        "density": density,
+        "workers": workers if engine_type == enums.EngineTypes.parallel else None,
+        "in_place": in_place,
+        "generations": generations,
+        "seconds_per_generation_median": median,
+        "seconds_per_generation_mean": statistics.fmean(tick_times),
+        "generations_per_second": 1 / median if median else float("inf"),
+        "cells_per_second": cells / median if median else float("inf"),
+        "allocated_bytes_per_generation_median": allocated_bytes,
+        "allocated_blocks_per_generation_median": allocated_blocks,
+        "final_population": field.getEngine().getPopulation(),
+    }
+
+
+def iterCases(engine_types, sizes, densities, seed: int, workers: int, in_place: bool = False):
+    for engine_type in engine_types:
+        for size in sizes:
+            if engine_type in SLOW_ENGINES and size * size > SLOW_ENGINES_MAX_CELLS:
+                continue
+            for density in densities:
+                np.random.seed(seed)
+                field = Field(enums.FieldStartModes.random_field, density, Vector2(size, size), engine_type,
+                              workers, boundary_mode=getBoundaryMode(engine_type))
+                name = f"{getCaseName(engine_type, 'soup', size, workers, in_place)}/d{density}"
+                yield name, field, engine_type, "soup", size, density
+
+        for workload, (pattern, size) in PATTERN_WORKLOADS.items():
+            field = Field(enums.FieldStartModes.empty_field, 0, Vector2(size, size), engine_type,
+                          workers, boundary_mode=getBoundaryMode(engine_type))
+            field.stampPattern(pattern.cells, (size - pattern.cells.shape[0]) // 2, (size - pattern.cells.shape[1]) // 2)
+            yield getCaseName(engine_type, workload, size, workers, in_place), field, engine_type, workload, size, None
+
+
+def runBenchmarks(args: argparse.Namespace) -> dict:
+    results = []
+    cases = iterCases(args.engines, args.sizes, args.densities, args.seed, args.workers, args.in_place)
+    for name, field, engine_type, workload, size, density in cases:
+        try:
+            result = measureCase(name, field, engine_type, workload, size, density, args.workers,
+                                 args.in_place, args.trace_allocations)
+        finally:
+            field.close()
+        results.append(result)
+        line = f"{name}: {result['seconds_per_generation_median'] * 1000:.3f} ms/generation, " \
+               f"{result['cells_per_second']:.3e} cells/s"
+        if args.trace_allocations:
+            line += f", {result['allocated_bytes_per_generation_median']} B " \
+                    f"and {result['allocated_blocks_per_generation_median']} blocks allocated/generation"
+        print(line)
+
+    return {
+        "meta": {
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compareResults(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """
+    Returns names of cases whose median generation time grew by more than threshold (0.1 = 10%)
+    """
+    baseline_results = {result["name"]: result for result in baseline["results"]}
+    regressions = []
+
+    for result in current["results"]:
+        baseline_result = baseline_results.get(result["name"])
+        if baseline_result is None:
+            print(f"{result['name']}: new case")
+            continue
+
+        old = baseline_result["seconds_per_generation_median"]
+        new = result["seconds_per_generation_median"]
+        change = (new - old) / old if old else 0.0
+        verdict = "REGRESSION" if change > threshold else "ok"
+        if change > threshold:
+            regressions.append(result["name"])
+        print(f"{result['name']}: {old * 1000:.3f} -> {new * 1000:.3f} ms/generation ({change:+.1%}) {verdict}")
+
+    return regressions
+
+
+def parseIntList(value: str) -> tuple[int, ...]:
+    return tuple(int(part) for part in value.split(","))
+
+
+def parseEngineList(value: str) -> tuple[enums.EngineTypes.__dict__, ...]:
+    try:
+        return tuple(enums.EngineTypes[part] for part in value.split(","))
+    except KeyError as ex:
+        raise argparse.ArgumentTypeError(f"Unacceptable engine: {ex}")
+
+
+def createParser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Game of life engine benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run the benchmarks and write the results to JSON")
+    run_parser.add_argument("--output", default="data/bench.json")
+    run_parser.add_argument("--sizes", type=parseIntList, default=DEFAULT_SIZES, help="comma separated board sides")
+    run_parser.add_argument("--densities", type=parseIntList, default=DEFAULT_DENSITIES,
+                            help="comma separated not_empty_cells_percent_approx values")
+    run_parser.add_argument("--engines", type=parseEngineList, default=DEFAULT_ENGINES, help="comma separated engine names")
+    run_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    run_parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                            help=f"worker processes of the parallel engine, default {DEFAULT_WORKERS}")
+    run_parser.add_argument("--in-place", action="store_true",
+                            help="step with processTickInPlace between the preallocated generation buffers")
+    run_parser.add_argument("--trace-allocations", action="store_true",
+                            help="also measure the memory a generation allocates, in extra untimed generations")
+
+    compare_parser = subparsers.add_parser("compare", help="flag regressions between two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="allowed relative slowdown, default 0.1")
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = createParser().parse_args(argv)
+
+    match args.command:
+        case "run":
+            report = runBenchmarks(args)
+            with open(args.output, "w") as file:
+                json.dump(report, file, indent=2)
+            print(f"results saved to {args.output}")
+
+        case "compare":
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+            with open(args.current) as file:
+                current = json.load(file)
+
+            regressions = compareResults(baseline, current, args.threshold)
+            if regressions:
+                print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+                return 1
+            print("no regressions")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
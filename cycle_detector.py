@@ -0,0 +1,100 @@
+from collections import deque
+
+import numpy as np
+
+DEFAULT_HISTORY_SIZE = 1024
+# generations between the checks of Field.advance in headless runs
+DEFAULT_CHECK_INTERVAL = 64
+ZOBRIST_SEED = 0x9E3779B97F4A7C15
+
+
+def zobristKeys(indices: np.ndarray) -> np.ndarray:
+    """
+    Pseudo random 64 bit key of every flat cell index (splitmix64), computed on the fly instead of kept in a table
+    that would be as big as the board
+    """
+    with np.errstate(over="ignore"):
+        keys = indices.astype(np.uint64) + np.uint64(ZOBRIST_SEED)
+        keys = (keys ^ (keys >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        keys = (keys ^ (keys >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return keys ^ (keys >> np.uint64(31))
+
+
+class Cycle:
+    def __init__(self, start_generation: int, period: int):
+        self.start_generation = start_generation
+        self.period = period
+
+    def __str__(self):
+        if self.period == 1:
+            return f"static since generation {self.start_generation}"
+        return f"period {self.period} since generation {self.start_generation}"
+
+
+class CycleDetector:
+    """
+    Keeps the Zobrist hash of the board (XOR of the keys of the alive cells) up to date from the cells that flip,
+    and remembers the generations of the last history_size hashes, so a repeated board is found in O(flipped cells).
+    A 64 bit hash can collide, a false cycle is that unlikely that the board is not compared
+    """
+    def __init__(self, width: int, history_size: int = DEFAULT_HISTORY_SIZE):
+        self.width = width
+        self.history_size = history_size
+        self.__hash = 0
+        self.__generations: dict[int, int] = {}
+        self.__hashes: deque[int] = deque()
+        self.__cycle: Cycle | None = None
+
+    def __hashCells(self, rows: np.ndarray, cols: np.ndarray) -> int:
+        if not rows.size:
+            return 0
+        flat_indices = rows.astype(np.uint64) * np.uint64(self.width) + cols.astype(np.uint64)
+        return int(np.bitwise_xor.reduce(zobristKeys(flat_indices)))
+
+    def getHash(self) -> int:
+        return self.__hash
+
+    def getCycle(self) -> Cycle | None:
+        return self.__cycle
+
+    def reset(self, grid: np.ndarray, generation: int):
+        """
+        Rehashes the whole board and forgets the history, for boards that were replaced
+        """
+        self.__hash = self.__hashCells(*np.nonzero(grid))
+        self.forgetHistory(generation)
+
+    def forgetHistory(self, generation: int):
+        """
+        For boards that were edited: states seen before the edit do not make a cycle with the ones after it
+        """
+        self.__generations.clear()
+        self.__hashes.clear()
+        self.__cycle = None
+        self.__remember(generation)
+
+    def applyChanged(self, changed: tuple[np.ndarray, np.ndarray]):
+        self.__hash ^= self.__hashCells(*changed)
+
+    def update(self, changed: tuple[np.ndarray, np.ndarray], generation: int) -> Cycle | None:
+        """
+        Applies the cells flipped by a generation step, returns the cycle the first time it is found
+        """
+        self.applyChanged(changed)
+        if self.__cycle is not None:
+            return None
+
+        first_generation = self.__generations.get(self.__hash)
+        if first_generation is not None:
+            self.__cycle = Cycle(first_generation, generation - first_generation)
+            return self.__cycle
+
+        self.__remember(generation)
+        return None
+
+    def __remember(self, generation: int):
+        self.__generations[self.__hash] = generation
+        self.__hashes.append(self.__hash)
+        if len(self.__hashes) > self.history_size:
+            # a hash is only remembered while it has not been seen before, so it is in the deque once
+            del self.__generations[self.__hashes.popleft()]
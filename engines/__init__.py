@@ -0,0 +1 @@
+from engines import base, numpy_engine, bitboard_engine, hashlife_engine, sparse_engine, tiled_engine, parallel_engine
@@ -0,0 +1,77 @@
+import numpy as np
+
+import enums
+import rules
+from utils import Vector2
+
+
+class Engine:
+    """
+    Common interface of the generation engines used by Field.
+    The board is addressed as [i][j] (row, column) and exposed as a uint8 array of 0/1 states.
+    step() returns row and column indices of the cells that flipped during the generation
+    """
+    SUPPORTED_BOUNDARY_MODES = (enums.BoundaryModes.dead, enums.BoundaryModes.toroidal, enums.BoundaryModes.mirror)
+
+    def __init__(self, grid_size: Vector2, rule: rules.Rule = rules.CONWAY,
+                 boundary_mode: enums.BoundaryModes.__dict__ = enums.BoundaryModes.dead):
+        if boundary_mode not in self.SUPPORTED_BOUNDARY_MODES:
+            raise Exception(f"{type(self).__name__} does not support boundary mode: {boundary_mode}")
+
+        self.grid_size = grid_size
+        self.rule = rule
+        self.boundary_mode = boundary_mode
+        self.generation = 0
+
+    def getGrid(self) -> np.ndarray:
+        raise NotImplementedError
+
+    def setGrid(self, grid: np.ndarray):
+        raise NotImplementedError
+
+    def getRows(self, top: int, bottom: int) -> np.ndarray:
+        return self.getGrid()[top:bottom]
+
+    def getCellState(self, i: int, j: int) -> int:
+        return int(self.getGrid()[i, j])
+
+    def getCellStates(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """
+        States of the cells (rows[k], cols[k]), engines that do not keep the board as an array override it
+        """
+        return self.getGrid()[rows, cols]
+
+    def setCellState(self, i: int, j: int, state: int):
+        raise NotImplementedError
+
+    def setRegion(self, top: int, left: int, block: np.ndarray):
+        """
+        Writes block into the board with its top left corner at (top, left), block has to fit inside the board
+        """
+        for i, j in np.ndindex(block.shape):
+            self.setCellState(top + i, left + j, int(block[i, j]))
+
+    def getPopulation(self) -> int:
+        return int(np.count_nonzero(self.getGrid()))
+
+    def step(self) -> tuple[np.ndarray, np.ndarray]:
+        raise NotImplementedError
+
+    def stepInPlace(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Same as step, engines that keep preallocated generation buffers override it to step without temporary arrays
+        """
+        return self.step()
+
+    def advance(self, generations: int) -> tuple[np.ndarray, np.ndarray]:
+        before = self.getGrid().copy()
+        for _ in range(generations):
+            self.step()
+
+        return np.nonzero(self.getGrid() != before)
+
+    def checkpoint(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
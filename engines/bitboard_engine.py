@@ -0,0 +1,197 @@
+import numpy as np
+
+from engines.base import Engine
+import enums
+import rules
+from utils import Vector2
+
+WORD_BITS = 64
+WORD_DTYPE = np.dtype("<u8")
+
+
+def packGrid(grid: np.ndarray) -> np.ndarray:
+    """
+    Packs a uint8 board into rows of little-endian uint64 words, bit b of word w holds column w * 64 + b
+    """
+    height, width = grid.shape
+    words_per_row = (width + WORD_BITS - 1) // WORD_BITS
+
+    padded = np.zeros((height, words_per_row * WORD_BITS), dtype=np.uint8)
+    padded[:, :width] = grid
+
+    return np.packbits(padded, axis=1, bitorder="little").view(WORD_DTYPE)
+
+
+def unpackGrid(words: np.ndarray, width: int) -> np.ndarray:
+    return np.unpackbits(words.view(np.uint8), axis=1, bitorder="little")[:, :width]
+
+
+def halfAdd(a: np.ndarray, b: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    return a ^ b, a & b
+
+
+def fullAdd(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    a_xor_b = a ^ b
+    return a_xor_b ^ c, (a & b) | (a_xor_b & c)
+
+
+def shiftRows(words: np.ndarray, offset: int, boundary_mode: enums.BoundaryModes.__dict__) -> np.ndarray:
+    """
+    Row i of the result is row i + offset (offset is -1 or 1) of words, rows outside the board come from the boundary mode
+    """
+    shifted = np.zeros_like(words)
+    edge_row = 0 if offset < 0 else -1
+    if offset < 0:
+        shifted[1:] = words[:-1]
+    else:
+        shifted[:-1] = words[1:]
+
+    match boundary_mode:
+        case enums.BoundaryModes.dead:
+            pass
+        case enums.BoundaryModes.toroidal:
+            shifted[edge_row] = words[-1 - edge_row]
+        case enums.BoundaryModes.mirror:
+            shifted[edge_row] = words[edge_row]
+        case other:
+            raise Exception(f"Unacceptable boundary mode: {other}")
+
+    return shifted
+
+
+def countNeighbourBits(words: np.ndarray, width: int,
+                       boundary_mode: enums.BoundaryModes.__dict__ = enums.BoundaryModes.dead) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Counts the eight neighbours of every cell of a packed board at once (64 cells per operation)
+    Returns the count as four bit planes: 1s, 2s, 4s and 8s
+    """
+    one = WORD_DTYPE.type(1)
+    carry_shift = WORD_DTYPE.type(WORD_BITS - 1)
+    last_bit = WORD_DTYPE.type((width - 1) % WORD_BITS)
+
+    # west[j] = cell[j - 1], east[j] = cell[j + 1], carrying bits across word boundaries
+    west = words << one
+    west[:, 1:] |= words[:, :-1] >> carry_shift
+    east = words >> one
+    east[:, :-1] |= words[:, 1:] << carry_shift
+
+    match boundary_mode:
+        case enums.BoundaryModes.dead:
+            pass
+        case enums.BoundaryModes.toroidal:
+            west[:, 0] |= (words[:, -1] >> last_bit) & one
+            east[:, -1] |= (words[:, 0] & one) << last_bit
+        case enums.BoundaryModes.mirror:
+            west[:, 0] |= words[:, 0] & one
+            east[:, -1] |= words[:, -1] & (one << last_bit)
+        case other:
+            raise Exception(f"Unacceptable boundary mode: {other}")
+
+    north = shiftRows(words, -1, boundary_mode)
+    north_west = shiftRows(west, -1, boundary_mode)
+    north_east = shiftRows(east, -1, boundary_mode)
+
+    south = shiftRows(words, 1, boundary_mode)
+    south_west = shiftRows(west, 1, boundary_mode)
+    south_east = shiftRows(east, 1, boundary_mode)
+
+    sum_a, carry_a = fullAdd(north_west, north, north_east)
+    sum_b, carry_b = fullAdd(west, east, south_west)
+    sum_c, carry_c = halfAdd(south, south_east)
+
+    ones, carry_d = fullAdd(sum_a, sum_b, sum_c)
+    twos_partial, fours_a = fullAdd(carry_a, carry_b, carry_c)
+    twos, fours_b = halfAdd(twos_partial, carry_d)
+    fours, eights = halfAdd(fours_a, fours_b)
+
+    return ones, twos, fours, eights
+
+
+def matchCount(planes: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray], count: int) -> np.ndarray:
+    """
+    Bits of the cells whose amount of neighbours equals count
+    """
+    ones, twos, fours, eights = planes
+    if count == 8:
+        return eights.copy()
+
+    matched = ~eights
+    for plane, bit in ((ones, 1), (twos, 2), (fours, 4)):
+        matched &= plane if count & bit else ~plane
+    return matched
+
+
+class BitboardEngine(Engine):
+    def __init__(self, grid_size: Vector2, rule: rules.Rule = rules.CONWAY,
+                 boundary_mode: enums.BoundaryModes.__dict__ = enums.BoundaryModes.dead):
+        super().__init__(grid_size, rule, boundary_mode)
+        self.__words_per_row = (grid_size.x + WORD_BITS - 1) // WORD_BITS
+        self.__words = np.zeros((grid_size.y, self.__words_per_row), dtype=WORD_DTYPE)
+
+        self.__last_word_mask = np.full(self.__words_per_row, np.iinfo(WORD_DTYPE).max, dtype=WORD_DTYPE)
+        tail_bits = grid_size.x % WORD_BITS
+        if tail_bits:
+            self.__last_word_mask[-1] = (1 << tail_bits) - 1
+
+    def getGrid(self) -> np.ndarray:
+        return unpackGrid(self.__words, self.grid_size.x)
+
+    def setGrid(self, grid: np.ndarray):
+        self.__words = packGrid(grid)
+
+    def getRows(self, top: int, bottom: int) -> np.ndarray:
+        return unpackGrid(self.__words[top:bottom], self.grid_size.x)
+
+    def getCellState(self, i: int, j: int) -> int:
+        return int(self.__words[i, j // WORD_BITS] >> WORD_DTYPE.type(j % WORD_BITS)) & 1
+
+    def getCellStates(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        words = self.__words[rows, cols // WORD_BITS]
+        return ((words >> (cols % WORD_BITS).astype(WORD_DTYPE)) & WORD_DTYPE.type(1)).astype(np.uint8)
+
+    def setCellState(self, i: int, j: int, state: int):
+        bit = WORD_DTYPE.type(1 << (j % WORD_BITS))
+        if state:
+            self.__words[i, j // WORD_BITS] |= bit
+        else:
+            self.__words[i, j // WORD_BITS] &= ~bit
+
+    def setRegion(self, top: int, left: int, block: np.ndarray):
+        bottom = top + block.shape[0]
+        rows = self.getRows(top, bottom)
+        rows[:, left:left + block.shape[1]] = block
+        self.__words[top:bottom] = packGrid(rows)
+
+    def getPopulation(self) -> int:
+        return int(np.unpackbits(self.__words.view(np.uint8)).sum(dtype=np.int64))
+
+    def getWords(self) -> np.ndarray:
+        return self.__words
+
+    def step(self) -> tuple[np.ndarray, np.ndarray]:
+        words = self.__words
+        planes = countNeighbourBits(words, self.grid_size.x, self.boundary_mode)
+
+        born = np.zeros_like(words)
+        for count in self.rule.birth:
+            born |= matchCount(planes, count)
+        survived = np.zeros_like(words)
+        for count in self.rule.survival:
+            survived |= matchCount(planes, count)
+
+        new_words = (born & ~words) | (survived & words)
+        new_words &= self.__last_word_mask
+
+        changed = self.__unpackChanged(words ^ new_words)
+
+        self.__words = new_words
+        self.generation += 1
+
+        return changed
+
+    def __unpackChanged(self, diff: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        rows, word_indices = np.nonzero(diff)
+        bits = np.unpackbits(diff[rows, word_indices].view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+        changed_words, changed_bits = np.nonzero(bits)
+
+        return rows[changed_words], word_indices[changed_words] * WORD_BITS + changed_bits
@@ -0,0 +1,353 @@
+import numpy as np
+
+from engines.base import Engine
+import enums
+import rules
+from utils import Vector2
+
+BLOCK_LEVEL = 3
+DEFAULT_MAX_NODES = 2_000_000
+# getCellStates looks up at most this many cells one by one in the tree, more are read from a render
+CELL_LOOKUP_LIMIT = 256
+
+
+class Node:
+    """
+    Canonical quadtree node of size 2^k x 2^k, a/b/c/d are the nw/ne/sw/se quadrants
+    """
+    __slots__ = ("k", "a", "b", "c", "d", "n", "results", "block")
+
+    def __init__(self, k: int, a, b, c, d, n: int):
+        self.k = k
+        self.a = a
+        self.b = b
+        self.c = c
+        self.d = d
+        self.n = n
+        self.results: dict[int, Node] = {}
+        self.block: np.ndarray | None = None
+
+
+class HashLifeEngine(Engine):
+    """
+    Unbounded universe stored as a hash-consed quadtree with memoized RESULT nodes.
+    The window [0, grid_size.y) x [0, grid_size.x) is what getGrid exposes, cells outside it keep evolving.
+    When the node table outgrows max_nodes between two root jumps, everything unreachable from the root is dropped
+    along with the memoized results that point to dropped nodes. advance is cut into root jumps whose length
+    adapts to the nodes the previous jumps created, so the table stays within a small multiple of max_nodes
+    during long advances instead of growing without a bound inside a single huge jump
+    """
+    SUPPORTED_BOUNDARY_MODES = (enums.BoundaryModes.unbounded,)
+
+    def __init__(self, grid_size: Vector2, rule: rules.Rule = rules.CONWAY,
+                 boundary_mode: enums.BoundaryModes.__dict__ = enums.BoundaryModes.unbounded, max_nodes: int = DEFAULT_MAX_NODES):
+        if rule.isBirthOnZero():
+            raise Exception(f"Rules with birth on 0 neighbours are not supported in an unbounded universe: {rule}")
+
+        super().__init__(grid_size, rule, boundary_mode)
+        self.__table_rows = rule.table.tolist()
+        self.max_nodes = max_nodes
+
+        self.__off = Node(0, None, None, None, None, 0)
+        self.__on = Node(0, None, None, None, None, 1)
+        self.__table: dict[tuple[int, int, int, int], Node] = {}
+        self.__zeros: list[Node] = [self.__off]
+        self.__block_nodes: dict[bytes, Node] = {}
+
+        self.__root = self.__getZero(self.__getWindowLevel())
+        self.__origin_i = 0
+        self.__origin_j = 0
+        # the longest root jump is 2^max_jump_level generations, see __jump
+        self.__max_jump_level = 0
+
+    def __getWindowLevel(self) -> int:
+        size = max(self.grid_size.x, self.grid_size.y, 1 << BLOCK_LEVEL)
+        return (size - 1).bit_length()
+
+    def __join(self, a: Node, b: Node, c: Node, d: Node) -> Node:
+        key = (id(a), id(b), id(c), id(d))
+        node = self.__table.get(key)
+        if node is None:
+            node = Node(a.k + 1, a, b, c, d, a.n + b.n + c.n + d.n)
+            self.__table[key] = node
+        return node
+
+    def __getZero(self, k: int) -> Node:
+        while len(self.__zeros) <= k:
+            z = self.__zeros[-1]
+            self.__zeros.append(self.__join(z, z, z, z))
+        return self.__zeros[k]
+
+    def __centre(self, m: Node) -> Node:
+        z = self.__getZero(m.k - 1)
+        return self.__join(self.__join(z, z, z, m.a),
+                           self.__join(z, z, m.b, z),
+                           self.__join(z, m.c, z, z),
+                           self.__join(m.d, z, z, z))
+
+    @staticmethod
+    def __isPadded(m: Node) -> bool:
+        return m.a.n == m.a.d.d.n and m.b.n == m.b.c.c.n and m.c.n == m.c.b.b.n and m.d.n == m.d.a.a.n
+
+    def __life4x4(self, m: Node) -> Node:
+        cells = [[0] * 4 for _ in range(4)]
+        for qi, quadrant in ((0, m.a), (1, m.b), (2, m.c), (3, m.d)):
+            top, left = (qi // 2) * 2, (qi % 2) * 2
+            for si, leaf in ((0, quadrant.a), (1, quadrant.b), (2, quadrant.c), (3, quadrant.d)):
+                cells[top + si // 2][left + si % 2] = leaf.n
+
+        new_leaves = []
+        for i in (1, 2):
+            for j in (1, 2):
+                neighbours = sum(cells[i + di][j + dj] for di in (-1, 0, 1) for dj in (-1, 0, 1)) - cells[i][j]
+                alive = self.__table_rows[cells[i][j]][neighbours]
+                new_leaves.append(self.__on if alive else self.__off)
+
+        return self.__join(*new_leaves)
+
+    def __successor(self, m: Node, j: int) -> Node:
+        """
+        Centre 2^(k-1) square of m advanced by 2^j generations (j is capped at k-2)
+        """
+        j = min(j, m.k - 2)
+        result = m.results.get(j)
+        if result is not None:
+            return result
+
+        if m.n == 0:
+            result = m.a
+        elif m.k == 2:
+            result = self.__life4x4(m)
+        else:
+            join = self.__join
+            c1 = self.__successor(m.a, j)
+            c2 = self.__successor(join(m.a.b, m.b.a, m.a.d, m.b.c), j)
+            c3 = self.__successor(m.b, j)
+            c4 = self.__successor(join(m.a.c, m.a.d, m.c.a, m.c.b), j)
+            c5 = self.__successor(join(m.a.d, m.b.c, m.c.b, m.d.a), j)
+            c6 = self.__successor(join(m.b.c, m.b.d, m.d.a, m.d.b), j)
+            c7 = self.__successor(m.c, j)
+            c8 = self.__successor(join(m.c.b, m.d.a, m.c.d, m.d.c), j)
+            c9 = self.__successor(m.d, j)
+
+            if j < m.k - 2:
+                result = join(join(c1.d, c2.c, c4.b, c5.a),
+                              join(c2.d, c3.c, c5.b, c6.a),
+                              join(c4.d, c5.c, c7.b, c8.a),
+                              join(c5.d, c6.c, c8.b, c9.a))
+            else:
+                result = join(self.__successor(join(c1, c2, c4, c5), j),
+                              self.__successor(join(c2, c3, c5, c6), j),
+                              self.__successor(join(c4, c5, c7, c8), j),
+                              self.__successor(join(c5, c6, c8, c9), j))
+
+        m.results[j] = result
+        return result
+
+    def __expandRoot(self):
+        self.__origin_i -= 1 << (self.__root.k - 1)
+        self.__origin_j -= 1 << (self.__root.k - 1)
+        self.__root = self.__centre(self.__root)
+
+    def __stepRoot(self, j: int):
+        while self.__root.k < j + 2 or not self.__isPadded(self.__root):
+            self.__expandRoot()
+        self.__expandRoot()
+
+        self.__origin_i += 1 << (self.__root.k - 2)
+        self.__origin_j += 1 << (self.__root.k - 2)
+        self.__root = self.__successor(self.__root, j)
+
+    def __jump(self, j: int):
+        """
+        Advances the root by 2^j generations. The root is pinned in between jumps, so the table is collected there.
+        A jump that created more than a half of max_nodes lowers the longest jump, a cheap one raises it
+        """
+        node_count = len(self.__table)
+        self.__stepRoot(j)
+
+        created = len(self.__table) - node_count
+        if created > self.max_nodes // 2:
+            self.__max_jump_level = max(j - 1, 0)
+        elif created < self.max_nodes // 8 and j == self.__max_jump_level:
+            self.__max_jump_level += 1
+
+        if len(self.__table) > self.max_nodes:
+            self.__collectGarbage()
+
+    def __buildNode(self, section: np.ndarray, k: int) -> Node:
+        if not section.any():
+            return self.__getZero(k)
+        if k == 0:
+            return self.__on
+        if k == BLOCK_LEVEL:
+            key = section.tobytes()
+            node = self.__block_nodes.get(key)
+            if node is None:
+                node = self.__block_nodes[key] = self.__buildQuadrants(section, k)
+            return node
+        return self.__buildQuadrants(section, k)
+
+    def __buildQuadrants(self, section: np.ndarray, k: int) -> Node:
+        half = 1 << (k - 1)
+        return self.__join(self.__buildNode(section[:half, :half], k - 1),
+                           self.__buildNode(section[:half, half:], k - 1),
+                           self.__buildNode(section[half:, :half], k - 1),
+                           self.__buildNode(section[half:, half:], k - 1))
+
+    def __getBlock(self, node: Node) -> np.ndarray:
+        if node.block is None:
+            size = 1 << node.k
+            half = size // 2
+            block = np.zeros((size, size), dtype=np.uint8)
+            self.__renderNode(node.a, 0, 0, block, 0, 0)
+            self.__renderNode(node.b, 0, half, block, 0, 0)
+            self.__renderNode(node.c, half, 0, block, 0, 0)
+            self.__renderNode(node.d, half, half, block, 0, 0)
+            node.block = block
+        return node.block
+
+    def __renderNode(self, node: Node, top: int, left: int, out: np.ndarray, out_top: int, out_left: int):
+        size = 1 << node.k
+        height, width = out.shape
+        if node.n == 0 or top + size <= out_top or left + size <= out_left \
+                or top >= out_top + height or left >= out_left + width:
+            return
+
+        if node.k == 0:
+            out[top - out_top, left - out_left] = 1
+            return
+
+        if node.k == BLOCK_LEVEL:
+            block = self.__getBlock(node)
+            i0, j0 = max(top, out_top), max(left, out_left)
+            i1, j1 = min(top + size, out_top + height), min(left + size, out_left + width)
+            out[i0 - out_top:i1 - out_top, j0 - out_left:j1 - out_left] = block[i0 - top:i1 - top, j0 - left:j1 - left]
+            return
+
+        half = size // 2
+        self.__renderNode(node.a, top, left, out, out_top, out_left)
+        self.__renderNode(node.b, top, left + half, out, out_top, out_left)
+        self.__renderNode(node.c, top + half, left, out, out_top, out_left)
+        self.__renderNode(node.d, top + half, left + half, out, out_top, out_left)
+
+    def __setNodeCell(self, node: Node, i: int, j: int, state: int) -> Node:
+        if node.k == 0:
+            return self.__on if state else self.__off
+
+        half = 1 << (node.k - 1)
+        a, b, c, d = node.a, node.b, node.c, node.d
+        if i < half and j < half:
+            a = self.__setNodeCell(a, i, j, state)
+        elif i < half:
+            b = self.__setNodeCell(b, i, j - half, state)
+        elif j < half:
+            c = self.__setNodeCell(c, i - half, j, state)
+        else:
+            d = self.__setNodeCell(d, i - half, j - half, state)
+        return self.__join(a, b, c, d)
+
+    def __collectGarbage(self):
+        table: dict[tuple[int, int, int, int], Node] = {}
+        stack = [self.__root, *self.__zeros]
+        while stack:
+            node = stack.pop()
+            if node.k == 0:
+                continue
+            key = (id(node.a), id(node.b), id(node.c), id(node.d))
+            if key in table:
+                continue
+            table[key] = node
+            stack.extend((node.a, node.b, node.c, node.d))
+
+        # a kept result has to point to a kept node, a dropped one could be rebuilt as a different object
+        kept = {id(node) for node in table.values()}
+        for node in table.values():
+            if node.results:
+                node.results = {j: result for j, result in node.results.items() if id(result) in kept}
+
+        self.__table = table
+        self.__block_nodes = {key: node for key, node in self.__block_nodes.items() if id(node) in kept}
+
+    def getNodeCount(self) -> int:
+        return len(self.__table)
+
+    def getUniversePopulation(self) -> int:
+        return self.__root.n
+
+    def getGrid(self) -> np.ndarray:
+        grid = np.zeros((self.grid_size.y, self.grid_size.x), dtype=np.uint8)
+        self.__renderNode(self.__root, self.__origin_i, self.__origin_j, grid, 0, 0)
+        return grid
+
+    def getRows(self, top: int, bottom: int) -> np.ndarray:
+        bottom = min(bottom, self.grid_size.y)
+        top = min(top, bottom)
+        rows = np.zeros((bottom - top, self.grid_size.x), dtype=np.uint8)
+        self.__renderNode(self.__root, self.__origin_i, self.__origin_j, rows, top, 0)
+        return rows
+
+    def setGrid(self, grid: np.ndarray):
+        k = self.__getWindowLevel()
+        size = 1 << k
+        section = np.zeros((size, size), dtype=np.uint8)
+        section[:grid.shape[0], :grid.shape[1]] = grid
+
+        self.__root = self.__buildNode(section, k)
+        self.__origin_i = 0
+        self.__origin_j = 0
+
+    def getCellState(self, i: int, j: int) -> int:
+        node = self.__root
+        i -= self.__origin_i
+        j -= self.__origin_j
+        size = 1 << node.k
+        if not (0 <= i < size and 0 <= j < size):
+            return 0
+
+        while node.k > 0 and node.n:
+            half = 1 << (node.k - 1)
+            if i < half and j < half:
+                node = node.a
+            elif i < half:
+                node, j = node.b, j - half
+            elif j < half:
+                node, i = node.c, i - half
+            else:
+                node, i, j = node.d, i - half, j - half
+        return node.n if node.k == 0 else 0
+
+    def getCellStates(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """
+        Few cells are looked up in the tree, more are read from a render of only their bounding box
+        """
+        if len(rows) <= CELL_LOOKUP_LIMIT:
+            return np.array([self.getCellState(i, j) for i, j in zip(rows.tolist(), cols.tolist())], dtype=np.uint8)
+
+        top, left = int(rows.min()), int(cols.min())
+        box = np.zeros((int(rows.max()) + 1 - top, int(cols.max()) + 1 - left), dtype=np.uint8)
+        self.__renderNode(self.__root, self.__origin_i, self.__origin_j, box, top, left)
+        return box[rows - top, cols - left]
+
+    def setCellState(self, i: int, j: int, state: int):
+        while not (self.__origin_i <= i < self.__origin_i + (1 << self.__root.k)
+                   and self.__origin_j <= j < self.__origin_j + (1 << self.__root.k)):
+            self.__expandRoot()
+
+        self.__root = self.__setNodeCell(self.__root, i - self.__origin_i, j - self.__origin_j, state)
+
+    def step(self) -> tuple[np.ndarray, np.ndarray]:
+        return self.advance(1)
+
+    def advance(self, generations: int) -> tuple[np.ndarray, np.ndarray]:
+        before = self.getGrid()
+
+        remaining = generations
+        while remaining:
+            j = min(remaining.bit_length() - 1, self.__max_jump_level)
+            self.__jump(j)
+            remaining -= 1 << j
+
+        self.generation += generations
+
+        return np.nonzero(self.getGrid() != before)
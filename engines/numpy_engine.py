@@ -0,0 +1,137 @@
+import numpy as np
+
+from engines.base import Engine
+import enums
+import rules
+from utils import Vector2
+
+
+def countNeighbours(padded: np.ndarray) -> np.ndarray:
+    """
+    Sums the eight shifted views of a board that has one row/column of halo on every side.
+    Result has the shape of the board without the halo
+    """
+    height = padded.shape[0] - 2
+    width = padded.shape[1] - 2
+
+    counts = np.zeros((height, width), dtype=np.uint8)
+    for di in range(3):
+        for dj in range(3):
+            if di == 1 and dj == 1:
+                continue
+            counts += padded[di:di + height, dj:dj + width]
+
+    return counts
+
+
+def fillHalo(padded: np.ndarray, boundary_mode: enums.BoundaryModes.__dict__):
+    """
+    Writes the one cell wide halo around the board so neighbour counting never has to check bounds.
+    Rows are filled first, then whole columns, which also sets the corners
+    """
+    match boundary_mode:
+        case enums.BoundaryModes.dead:
+            pass
+        case enums.BoundaryModes.toroidal:
+            padded[0, 1:-1] = padded[-2, 1:-1]
+            padded[-1, 1:-1] = padded[1, 1:-1]
+            padded[:, 0] = padded[:, -2]
+            padded[:, -1] = padded[:, 1]
+        case enums.BoundaryModes.mirror:
+            padded[0, 1:-1] = padded[1, 1:-1]
+            padded[-1, 1:-1] = padded[-2, 1:-1]
+            padded[:, 0] = padded[:, 1]
+            padded[:, -1] = padded[:, -2]
+        case other:
+            raise Exception(f"Unacceptable boundary mode: {other}")
+
+
+def calcNextState(grid: np.ndarray, counts: np.ndarray, table: np.ndarray) -> np.ndarray:
+    return table[grid, counts]
+
+
+class NumpyEngine(Engine):
+    """
+    buffer, if given, is an existing (grid_size.y + 2) x (grid_size.x + 2) array (e.g. a memory-mapped snapshot)
+    that is used as the first generation buffer without copying
+    """
+    def __init__(self, grid_size: Vector2, rule: rules.Rule = rules.CONWAY,
+                 boundary_mode: enums.BoundaryModes.__dict__ = enums.BoundaryModes.dead,
+                 buffer: np.ndarray | None = None):
+        super().__init__(grid_size, rule, boundary_mode)
+        shape = (grid_size.y + 2, grid_size.x + 2)
+        if buffer is None:
+            buffer = np.zeros(shape, dtype=np.uint8)
+        elif buffer.shape != shape:
+            raise Exception(f"Buffer of shape {buffer.shape} does not fit a board of shape {shape}")
+
+        self.__buffers = [buffer, np.zeros(shape, dtype=np.uint8)]
+        self.__current = 0
+
+        # scratch buffers of stepInPlace, allocated once
+        self.__counts = np.zeros((grid_size.y, grid_size.x), dtype=np.uint8)
+        self.__table_index = np.zeros((grid_size.y, grid_size.x), dtype=np.uint8)
+        self.__next_bits = np.zeros((grid_size.y, grid_size.x), dtype=np.uint32)
+        self.__changed_mask = np.zeros((grid_size.y, grid_size.x), dtype=bool)
+        # bit state * 9 + amount_of_neighbours is the next state, np.take would cast the whole index to intp
+        self.__rule_bits = np.uint32(rule.birth_mask | rule.survival_mask << 9)
+
+    def getGrid(self) -> np.ndarray:
+        return self.__buffers[self.__current][1:-1, 1:-1]
+
+    def setGrid(self, grid: np.ndarray):
+        self.getGrid()[:] = grid
+
+    def setCellState(self, i: int, j: int, state: int):
+        self.__buffers[self.__current][i + 1, j + 1] = state
+
+    def setRegion(self, top: int, left: int, block: np.ndarray):
+        self.getGrid()[top:top + block.shape[0], left:left + block.shape[1]] = block
+
+    def checkpoint(self):
+        """
+        Makes the first buffer hold the current generation again, so a mapped buffer ends up with the latest state
+        """
+        if self.__current != 0:
+            self.__buffers[0][:] = self.__buffers[self.__current]
+            self.__current = 0
+
+    def step(self) -> tuple[np.ndarray, np.ndarray]:
+        grid = self.getGrid()
+        fillHalo(self.__buffers[self.__current], self.boundary_mode)
+        new_grid = calcNextState(grid, countNeighbours(self.__buffers[self.__current]), self.rule.table)
+        changed = np.nonzero(new_grid != grid)
+
+        grid[:] = new_grid
+        self.generation += 1
+
+        return changed
+
+    def stepInPlace(self) -> tuple[np.ndarray, np.ndarray]:
+        src = self.__buffers[self.__current]
+        dst = self.__buffers[1 - self.__current]
+        grid = src[1:-1, 1:-1]
+        new_grid = dst[1:-1, 1:-1]
+        height, width = grid.shape
+        fillHalo(src, self.boundary_mode)
+
+        counts = self.__counts
+        counts.fill(0)
+        for di in range(3):
+            for dj in range(3):
+                if di == 1 and dj == 1:
+                    continue
+                np.add(counts, src[di:di + height, dj:dj + width], out=counts)
+
+        # flat rule table index: state * 9 + amount_of_neighbours
+        np.multiply(grid, 9, out=self.__table_index)
+        np.add(self.__table_index, counts, out=self.__table_index)
+        np.right_shift(self.__rule_bits, self.__table_index, out=self.__next_bits)
+        np.bitwise_and(self.__next_bits, 1, out=self.__next_bits)
+        np.copyto(new_grid, self.__next_bits, casting="unsafe")
+
+        np.not_equal(new_grid, grid, out=self.__changed_mask)
+        self.__current = 1 - self.__current
+        self.generation += 1
+
+        return np.nonzero(self.__changed_mask)
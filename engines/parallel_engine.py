@@ -0,0 +1,95 @@
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from engines.base import Engine
+from engines.numpy_engine import countNeighbours, calcNextState, fillHalo
+import enums
+import rules
+from utils import Vector2
+
+_worker_buffers: list[np.ndarray, ...] = []
+_worker_shared_memories: list[shared_memory.SharedMemory, ...] = []
+_worker_rule_table: np.ndarray | None = None
+
+
+def _initWorker(shared_memory_names: tuple[str, ...], shape: tuple[int, int], rule_table: np.ndarray):
+    global _worker_rule_table
+    _worker_rule_table = rule_table
+    for name in shared_memory_names:
+        shm = shared_memory.SharedMemory(name=name)
+        _worker_shared_memories.append(shm)
+        _worker_buffers.append(np.ndarray(shape, dtype=np.uint8, buffer=shm.buf))
+
+
+def _stepStrip(task: tuple[int, int, int]):
+    """
+    Computes rows [top, bottom) of the board, reading one halo row above and below the strip
+    """
+    src_index, top, bottom = task
+    src = _worker_buffers[src_index]
+    dst = _worker_buffers[1 - src_index]
+
+    counts = countNeighbours(src[top:bottom + 2])
+    dst[top + 1:bottom + 1, 1:-1] = calcNextState(src[top + 1:bottom + 1, 1:-1], counts, _worker_rule_table)
+
+
+class ParallelEngine(Engine):
+    """
+    NumPy engine that splits the board into horizontal strips stepped by a process pool.
+    Both generation buffers live in shared memory, per tick only the strip bounds are sent to the workers
+    """
+    def __init__(self, grid_size: Vector2, rule: rules.Rule = rules.CONWAY,
+                 boundary_mode: enums.BoundaryModes.__dict__ = enums.BoundaryModes.dead, worker_count: int = 1):
+        super().__init__(grid_size, rule, boundary_mode)
+        self.worker_count = max(1, min(worker_count, grid_size.y))
+
+        shape = (grid_size.y + 2, grid_size.x + 2)
+        self.__shared_memories = [shared_memory.SharedMemory(create=True, size=shape[0] * shape[1]) for _ in range(2)]
+        self.__buffers = [np.ndarray(shape, dtype=np.uint8, buffer=shm.buf) for shm in self.__shared_memories]
+        for buffer in self.__buffers:
+            buffer[:] = 0
+        self.__current = 0
+
+        strip_bounds = np.linspace(0, grid_size.y, self.worker_count + 1).astype(int)
+        self.__strips = list(zip(strip_bounds[:-1].tolist(), strip_bounds[1:].tolist()))
+
+        self.__pool = mp.Pool(self.worker_count,
+                              initializer=_initWorker,
+                              initargs=(tuple(shm.name for shm in self.__shared_memories), shape, rule.table))
+
+    def getGrid(self) -> np.ndarray:
+        return self.__buffers[self.__current][1:-1, 1:-1]
+
+    def setGrid(self, grid: np.ndarray):
+        self.getGrid()[:] = grid
+
+    def setCellState(self, i: int, j: int, state: int):
+        self.__buffers[self.__current][i + 1, j + 1] = state
+
+    def setRegion(self, top: int, left: int, block: np.ndarray):
+        self.getGrid()[top:top + block.shape[0], left:left + block.shape[1]] = block
+
+    def step(self) -> tuple[np.ndarray, np.ndarray]:
+        fillHalo(self.__buffers[self.__current], self.boundary_mode)
+        self.__pool.map(_stepStrip, [(self.__current, top, bottom) for top, bottom in self.__strips])
+
+        grid = self.getGrid()
+        self.__current = 1 - self.__current
+        self.generation += 1
+
+        return np.nonzero(self.getGrid() != grid)
+
+    def close(self):
+        if self.__pool is None:
+            return
+
+        self.__pool.terminate()
+        self.__pool.join()
+        self.__pool = None
+
+        self.__buffers = []
+        for shm in self.__shared_memories:
+            shm.close()
+            shm.unlink()
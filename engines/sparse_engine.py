@@ -0,0 +1,101 @@
+from collections import Counter
+import itertools
+
+import numpy as np
+
+from engines.base import Engine
+import enums
+import rules
+from utils import Vector2
+
+NEIGHBOUR_OFFSETS = tuple((di, dj) for di in (-1, 0, 1) for dj in (-1, 0, 1) if di or dj)
+
+
+class SparseEngine(Engine):
+    """
+    Unbounded universe that only stores coordinates of live cells, so a tick costs O(population) instead of O(area).
+    getGrid exposes the window [0, grid_size.y) x [0, grid_size.x), cells outside it keep evolving
+    """
+    SUPPORTED_BOUNDARY_MODES = (enums.BoundaryModes.unbounded,)
+
+    def __init__(self, grid_size: Vector2, rule: rules.Rule = rules.CONWAY,
+                 boundary_mode: enums.BoundaryModes.__dict__ = enums.BoundaryModes.unbounded):
+        if rule.isBirthOnZero():
+            raise Exception(f"Rules with birth on 0 neighbours are not supported in an unbounded universe: {rule}")
+
+        super().__init__(grid_size, rule, boundary_mode)
+        self.__live: set[tuple[int, int]] = set()
+        # the cells in the window sorted by row for getRows, built on demand and dropped on every change
+        self.__window_cells: tuple[np.ndarray, np.ndarray] | None = None
+
+    def __inWindow(self, cell: tuple[int, int]) -> bool:
+        return 0 <= cell[0] < self.grid_size.y and 0 <= cell[1] < self.grid_size.x
+
+    def __toIndices(self, cells: set[tuple[int, int]]) -> tuple[np.ndarray, np.ndarray]:
+        indices = np.fromiter(itertools.chain.from_iterable(cells), dtype=np.intp, count=2 * len(cells)).reshape(-1, 2)
+        in_window = (indices[:, 0] >= 0) & (indices[:, 0] < self.grid_size.y) \
+            & (indices[:, 1] >= 0) & (indices[:, 1] < self.grid_size.x)
+        return indices[in_window, 0], indices[in_window, 1]
+
+    def getLiveCells(self) -> set[tuple[int, int]]:
+        return self.__live
+
+    def __getWindowCells(self) -> tuple[np.ndarray, np.ndarray]:
+        if self.__window_cells is None:
+            rows, cols = self.__toIndices(self.__live)
+            order = np.argsort(rows, kind="stable")
+            self.__window_cells = rows[order], cols[order]
+        return self.__window_cells
+
+    def getGrid(self) -> np.ndarray:
+        grid = np.zeros((self.grid_size.y, self.grid_size.x), dtype=np.uint8)
+        grid[self.__toIndices(self.__live)] = 1
+        return grid
+
+    def setGrid(self, grid: np.ndarray):
+        rows, cols = np.nonzero(grid)
+        self.__live = set(zip(rows.tolist(), cols.tolist()))
+        self.__window_cells = None
+
+    def getRows(self, top: int, bottom: int) -> np.ndarray:
+        bottom = min(bottom, self.grid_size.y)
+        top = min(top, bottom)
+        rows, cols = self.__getWindowCells()
+        start, end = np.searchsorted(rows, (top, bottom))
+
+        block = np.zeros((bottom - top, self.grid_size.x), dtype=np.uint8)
+        block[rows[start:end] - top, cols[start:end]] = 1
+        return block
+
+    def getCellState(self, i: int, j: int) -> int:
+        return int((i, j) in self.__live)
+
+    def getCellStates(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        live = self.__live
+        return np.array([(i, j) in live for i, j in zip(rows.tolist(), cols.tolist())], dtype=np.uint8)
+
+    def setCellState(self, i: int, j: int, state: int):
+        if state:
+            self.__live.add((i, j))
+        else:
+            self.__live.discard((i, j))
+        self.__window_cells = None
+
+    def getPopulation(self) -> int:
+        return sum(1 for cell in self.__live if self.__inWindow(cell))
+
+    def step(self) -> tuple[np.ndarray, np.ndarray]:
+        live = self.__live
+        counts = Counter((i + di, j + dj) for i, j in live for di, dj in NEIGHBOUR_OFFSETS)
+
+        table = self.rule.table.tolist()
+        new_live = {cell for cell, neighbours in counts.items() if table[cell in live][neighbours]}
+        if table[1][0]:
+            new_live.update(cell for cell in live if cell not in counts)
+        changed = self.__toIndices(new_live ^ live)
+
+        self.__live = new_live
+        self.__window_cells = None
+        self.generation += 1
+
+        return changed
@@ -0,0 +1,95 @@
+import numpy as np
+
+from engines.base import Engine
+from engines.numpy_engine import countNeighbours, calcNextState, fillHalo
+import enums
+import rules
+from utils import Vector2
+
+TILE_SIZE = 32
+
+
+def dilateTiles(tiles: np.ndarray, wrap: bool = False) -> np.ndarray:
+    """
+    Marks every tile that touches a marked tile (8-neighbourhood), across the board edges if wrap is set
+    """
+    padded = np.pad(tiles, 1, mode="wrap" if wrap else "constant")
+
+    dilated = np.zeros_like(tiles)
+    for di in range(3):
+        for dj in range(3):
+            dilated |= padded[di:di + tiles.shape[0], dj:dj + tiles.shape[1]]
+
+    return dilated
+
+
+class TiledEngine(Engine):
+    """
+    NumPy engine that splits the board into TILE_SIZE x TILE_SIZE tiles and only recomputes tiles
+    that changed, or have a neighbour that changed, in the previous generation
+    """
+    def __init__(self, grid_size: Vector2, rule: rules.Rule = rules.CONWAY,
+                 boundary_mode: enums.BoundaryModes.__dict__ = enums.BoundaryModes.dead, tile_size: int = TILE_SIZE):
+        super().__init__(grid_size, rule, boundary_mode)
+        self.tile_size = tile_size
+        self.__padded = np.zeros((grid_size.y + 2, grid_size.x + 2), dtype=np.uint8)
+
+        tiles_shape = (-(-grid_size.y // tile_size), -(-grid_size.x // tile_size))
+        self.__active_tiles = np.ones(tiles_shape, dtype=bool)
+
+    def __markActive(self, i: int, j: int, bottom: int | None = None, right: int | None = None):
+        """
+        Marks the tiles around cell (i, j), or around the cells [i, bottom) x [j, right) if given
+        """
+        bottom = i + 1 if bottom is None else bottom
+        right = j + 1 if right is None else right
+        size = self.tile_size
+
+        changed_tile = np.zeros_like(self.__active_tiles)
+        changed_tile[i // size:(bottom - 1) // size + 1, j // size:(right - 1) // size + 1] = True
+        self.__active_tiles |= dilateTiles(changed_tile, self.boundary_mode == enums.BoundaryModes.toroidal)
+
+    def getGrid(self) -> np.ndarray:
+        return self.__padded[1:-1, 1:-1]
+
+    def setGrid(self, grid: np.ndarray):
+        self.__padded[1:-1, 1:-1] = grid
+        self.__active_tiles[:] = True
+
+    def setCellState(self, i: int, j: int, state: int):
+        self.__padded[i + 1, j + 1] = state
+        self.__markActive(i, j)
+
+    def setRegion(self, top: int, left: int, block: np.ndarray):
+        bottom, right = top + block.shape[0], left + block.shape[1]
+        self.__padded[top + 1:bottom + 1, left + 1:right + 1] = block
+        self.__markActive(top, left, bottom, right)
+
+    def step(self) -> tuple[np.ndarray, np.ndarray]:
+        size = self.tile_size
+        height, width = self.grid_size.y, self.grid_size.x
+        grid = self.getGrid()
+        fillHalo(self.__padded, self.boundary_mode)
+
+        updates = []
+        for ti, tj in zip(*np.nonzero(self.__active_tiles)):
+            top, left = ti * size, tj * size
+            bottom, right = min(top + size, height), min(left + size, width)
+
+            tile = grid[top:bottom, left:right]
+            new_tile = calcNextState(tile, countNeighbours(self.__padded[top:bottom + 2, left:right + 2]), self.rule.table)
+            tile_rows, tile_cols = np.nonzero(new_tile != tile)
+            if len(tile_rows):
+                updates.append((top, left, new_tile, tile_rows + top, tile_cols + left))
+
+        dirty_tiles = np.zeros_like(self.__active_tiles)
+        for top, left, new_tile, _, _ in updates:
+            grid[top:top + new_tile.shape[0], left:left + new_tile.shape[1]] = new_tile
+            dirty_tiles[top // size, left // size] = True
+
+        self.__active_tiles = dilateTiles(dirty_tiles, self.boundary_mode == enums.BoundaryModes.toroidal)
+        self.generation += 1
+
+        if not updates:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        return np.concatenate([update[3] for update in updates]), np.concatenate([update[4] for update in updates])
@@ -12,3 +12,35 @@ class FieldStartModes(Enum):
 class GameStates(Enum):
     start_menu = 1
     playing = 2
+
+class BoundaryModes(Enum):
+    dead = 1
+    toroidal = 2
+    mirror = 3
+    unbounded = 4
+
+class SaveCompressions(Enum):
+    none = 0
+    zlib = 1
+    lzma = 2
+
+class EngineTypes(Enum):
+    numpy = 1
+    bitboard = 2
+    hashlife = 3
+    sparse = 4
+    tiled = 5
+    parallel = 6
+
+class SaveFormats(Enum):
+    binary = 1
+    rle = 2
+    plaintext = 3
+
+class StampModes(Enum):
+    overlay = 1  # OR the pattern into the board
+    toggle = 2  # XOR the pattern into the board
+
+class RenderModes(Enum):
+    cells = 1  # only the changed cells are drawn, one rect each, straight from the state array
+    surface = 2  # the whole board is copied into a surface and blitted at once
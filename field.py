@@ -0,0 +1,467 @@
+import threading
+
+import numpy as np
+
+import engines
+import enums
+import pattern_format
+from cycle_detector import Cycle, CycleDetector, DEFAULT_HISTORY_SIZE
+from generation_buffers import Generation, GenerationBuffers, Region
+from history import History, DEFAULT_CAPACITY, DEFAULT_KEYFRAME_INTERVAL, DEFAULT_MAX_BYTES
+import metrics
+import rules
+import save_format
+from utils import Vector2
+
+SAVE_FILE_PATH = "data/save.bin"
+
+
+class Field:
+    """
+    The board state without anything to display it, views draw from acquireGeneration.
+    Not thread-safe by itself: when a field is shared between threads, the ones that step or change it hold getLock(),
+    readers take consistent generations from publishGeneration/acquireGeneration instead of reading the engine
+    """
+    def __init__(self,
+                 start_mode: enums.FieldStartModes.__dict__,
+                 not_empty_cells_percent_approx: int,
+                 grid_size: Vector2,
+                 engine_type: enums.EngineTypes.__dict__ = enums.EngineTypes.numpy,
+                 worker_count: int = 1,
+                 rule: rules.Rule = rules.CONWAY,
+                 boundary_mode: enums.BoundaryModes.__dict__ = enums.BoundaryModes.dead):
+
+        self.__start_mode = start_mode
+        self.__not_empty_cells_percent_approx = not_empty_cells_percent_approx
+        self.__grid_size = grid_size
+        self.__engine_type = engine_type
+        self.__worker_count = worker_count
+        self.__rule = rule
+        self.__boundary_mode = boundary_mode
+
+        self.__engine: engines.base.Engine | None = None
+        self.__snapshot: save_format.Snapshot | None = None
+        self.__lock = threading.RLock()
+        self.__generations: GenerationBuffers | None = None
+        # set by the view, None publishes the whole board
+        self.__publish_region: Region | None = None
+        self.__cycle_detector: CycleDetector | None = None
+        self.__cycle_check_interval = 1
+        self.__history: History | None = None
+        self.__metrics: metrics.Metrics | None = None
+        self.initField()
+
+    def __createEngine(self, buffer: np.ndarray | None = None) -> engines.base.Engine:
+        match self.__engine_type:
+            case enums.EngineTypes.numpy:
+                return engines.numpy_engine.NumpyEngine(self.__grid_size, self.__rule, self.__boundary_mode, buffer)
+            case enums.EngineTypes.bitboard:
+                return engines.bitboard_engine.BitboardEngine(self.__grid_size, self.__rule, self.__boundary_mode)
+            case enums.EngineTypes.hashlife:
+                return engines.hashlife_engine.HashLifeEngine(self.__grid_size, self.__rule, self.__boundary_mode)
+            case enums.EngineTypes.sparse:
+                return engines.sparse_engine.SparseEngine(self.__grid_size, self.__rule, self.__boundary_mode)
+            case enums.EngineTypes.tiled:
+                return engines.tiled_engine.TiledEngine(self.__grid_size, self.__rule, self.__boundary_mode)
+            case enums.EngineTypes.parallel:
+                return engines.parallel_engine.ParallelEngine(self.__grid_size, self.__rule, self.__boundary_mode,
+                                                              self.__worker_count)
+            case other:
+                raise Exception(f"Unacceptable engine type: {other}")
+
+    def initField(self):
+        self.__closeEngine()
+        self.__engine = self.__createEngine()
+        self.refillField()
+
+    def refillField(self):
+        """
+        Fills the board of the current engine again by the start mode and restarts it at generation 0
+        """
+        match self.__start_mode:
+            case enums.FieldStartModes.empty_field:
+                self.__engine.setGrid(np.zeros((self.__grid_size.y, self.__grid_size.x), dtype=np.uint8))
+            case enums.FieldStartModes.full_field:
+                self.__engine.setGrid(np.ones((self.__grid_size.y, self.__grid_size.x), dtype=np.uint8))
+            case enums.FieldStartModes.random_field:
+                self.__engine.setGrid(self.getRandomGrid(self.__grid_size, self.__not_empty_cells_percent_approx))
+        self.__engine.generation = 0
+
+        self.__markAllChanged()
+        self.__resetTracking()
+
+    def processTick(self):
+        self.__syncCells(self.__engine.step())
+
+    def processTickInPlace(self):
+        self.__syncCells(self.__engine.stepInPlace())
+
+    def advance(self, n_generations: int):
+        """
+        With history or metrics the generations are stepped one by one, with cycle detection alone the engine
+        advances a check interval at a time. It stops at the first cycle found
+        """
+        if self.__cycle_detector is None and self.__history is None and self.__metrics is None:
+            self.__syncCells(self.__engine.advance(n_generations))
+            return
+
+        chunk = 1 if self.__history is not None or self.__metrics is not None else self.__cycle_check_interval
+        for chunk_start in range(0, n_generations, chunk):
+            cycle = self.__syncCells(self.__engine.advance(min(chunk, n_generations - chunk_start)))
+            if cycle is not None:
+                if chunk > 1:
+                    self.__refineCyclePeriod(cycle)
+                break
+
+    def __refineCyclePeriod(self, cycle: Cycle):
+        """
+        A repeat between checks a chunk apart only gives a multiple of the period, the board is stepped until
+        it is back at the current state, at most that many generations. The board and the generation are put back
+        afterwards, so advance still ends at the generation it was asked for
+        """
+        grid = self.__engine.getGrid().copy()
+        generation = self.__engine.generation
+        current_hash = self.__cycle_detector.getHash()
+        for period in range(1, cycle.period + 1):
+            self.__cycle_detector.applyChanged(self.__engine.step())
+            if self.__cycle_detector.getHash() == current_hash:
+                cycle.period = period
+                break
+
+        self.__cycle_detector.applyChanged(np.nonzero(self.__engine.getGrid() != grid))
+        self.__engine.setGrid(grid)
+        self.__engine.generation = generation
+
+    def __syncCells(self, changed: tuple[np.ndarray, np.ndarray], stepped: bool = True) -> Cycle | None:
+        """
+        changed holds every flipped cell once, returns the cycle when a step just closed one
+        """
+        if self.__generations is not None:
+            self.__generations.addChanged(changed)
+
+        generation = self.__engine.generation
+        if self.__history is not None:
+            if not stepped:
+                self.__history.applyEdit(changed, generation)
+            else:
+                self.__history.record(changed, generation)
+                if self.__history.needsKeyframe(generation):
+                    self.__history.addKeyframe(self.__engine.getGrid(), generation)
+
+        if self.__metrics is not None:
+            states = self.__engine.getCellStates(*changed)
+            if stepped:
+                self.__metrics.record(changed, states, generation)
+            else:
+                self.__metrics.applyEdit(changed, states)
+
+        if self.__cycle_detector is None:
+            return None
+        if stepped:
+            return self.__cycle_detector.update(changed, generation)
+
+        self.__cycle_detector.applyChanged(changed)
+        self.__cycle_detector.forgetHistory(generation)
+        return None
+
+    def __markAllChanged(self):
+        if self.__generations is not None:
+            self.__generations.markAllChanged()
+
+    def __resetTracking(self):
+        """
+        Restarts the cycle detection, the history and the metrics on a board that was replaced
+        """
+        if self.__cycle_detector is not None:
+            self.__cycle_detector.width = self.__grid_size.x
+            self.__cycle_detector.reset(self.__engine.getGrid(), self.__engine.generation)
+        if self.__history is not None:
+            self.__history.reset(self.__engine.getGrid(), self.__engine.generation)
+        if self.__metrics is not None:
+            self.__metrics.reset(self.__engine.getGrid())
+
+    def enableCycleDetection(self, history_size: int = DEFAULT_HISTORY_SIZE, check_interval: int = 1):
+        """
+        Hashes the board to find still lifes and oscillators. Ticks are checked every generation, advance checks
+        every check_interval generations so fast engines keep their jumps: a cycle is then found up to
+        check_interval generations after it started, start_generation is the first checked generation in it,
+        and the period is found by stepping at most one more period. Unbounded engines only report the cells of the window,
+        what evolves outside of it would go unhashed and show up as false cycles, so they are refused
+        """
+        if self.__boundary_mode == enums.BoundaryModes.unbounded:
+            raise Exception("Cycle detection only covers the window and is not available for unbounded boards")
+
+        if check_interval < 1:
+            raise Exception(f"Incorrect cycle check interval: {check_interval}")
+
+        self.__cycle_detector = CycleDetector(self.__grid_size.x, history_size)
+        self.__cycle_check_interval = check_interval
+        self.__resetTracking()
+
+    def getCycle(self) -> Cycle | None:
+        """
+        The cycle the board is in, None if none was found since the last edit
+        """
+        if self.__cycle_detector is None:
+            return None
+        return self.__cycle_detector.getCycle()
+
+    def enableHistory(self, capacity: int = DEFAULT_CAPACITY,
+                      keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Records the last capacity generations, at most about max_bytes of them, for seekGeneration.
+        advance then steps generation by generation
+        """
+        self.__history = History(capacity, keyframe_interval, max_bytes)
+        self.__history.reset(self.__engine.getGrid(), self.__engine.generation)
+
+    def getHistoryRange(self) -> tuple[int, int] | None:
+        """
+        First and last recorded generation, None without history
+        """
+        if self.__history is None:
+            return None
+        return self.__history.getRange()
+
+    def enableMetrics(self, capacity: int = metrics.DEFAULT_CAPACITY, sink_path: str | None = None):
+        """
+        Records the statistics of every generation, also into a .csv or .jsonl file at sink_path if given,
+        advance then steps generation by generation
+        """
+        if self.__metrics is not None:
+            self.__metrics.close()
+        self.__metrics = metrics.Metrics(capacity, metrics.MetricsSink(sink_path) if sink_path is not None else None)
+        self.__metrics.reset(self.__engine.getGrid())
+
+    def getMetrics(self) -> metrics.Metrics | None:
+        return self.__metrics
+
+    def seekGeneration(self, generation: int):
+        """
+        Rewinds or replays the board to a recorded generation, the closest recorded one if it is out of range.
+        The later generations stay recorded until the board is stepped or edited from there
+        """
+        if self.__history is None:
+            raise Exception("History is not enabled")
+
+        first_generation, last_generation = self.__history.getRange()
+        generation = min(max(generation, first_generation), last_generation)
+        if generation == self.__engine.generation:
+            return
+
+        grid = self.__history.getGrid(generation)
+        changed = np.nonzero(self.__engine.getGrid() != grid)
+        self.__engine.setGrid(grid)
+        self.__engine.generation = generation
+
+        if self.__generations is not None:
+            self.__generations.addChanged(changed)
+        if self.__cycle_detector is not None:
+            self.__cycle_detector.applyChanged(changed)
+            self.__cycle_detector.forgetHistory(generation)
+        if self.__metrics is not None:
+            self.__metrics.applyEdit(changed, grid[changed])
+
+    @staticmethod
+    def getRandomGrid(grid_size: Vector2, percent: int) -> np.ndarray:
+        if not (0 <= percent <= 100):
+            raise Exception("Not allowed percentage provided!")
+
+        rand_nums = np.random.randint(0, 100, size=(grid_size.y, grid_size.x))
+
+        return (rand_nums <= percent).astype(np.uint8)
+
+    def getEngine(self) -> engines.base.Engine:
+        return self.__engine
+
+    def __closeEngine(self):
+        if self.__engine is not None:
+            self.__engine.close()
+        self.__closeSnapshot()
+
+    def close(self):
+        self.__closeEngine()
+        if self.__metrics is not None:
+            self.__metrics.close()
+
+    def getLock(self) -> threading.RLock:
+        return self.__lock
+
+    def setPublishRegion(self, region: Region | None):
+        """
+        Makes publishGeneration copy only the region a view shows, so the copies do not grow with the board.
+        Called from the view's thread, the next publish picks it up
+        """
+        self.__publish_region = region
+
+    def publishGeneration(self):
+        """
+        Copies the board, or the publish region of it, for acquireGeneration if it or the region changed
+        since the last copy and the last copy was already taken
+        """
+        if self.__generations is None:
+            self.__generations = GenerationBuffers()
+
+        region = self.__publish_region
+        if (self.__generations.hasPendingChanges() or region != self.__generations.getPublishedRegion()) \
+                and self.__generations.isFrontTaken():
+            self.__generations.publish(self.__readRegion(region), self.__engine.generation, region)
+
+    def __readRegion(self, region: Region | None) -> np.ndarray:
+        """
+        Reads the region in row chunks, so engines that unpack rows never unpack more than a chunk at once
+        """
+        if region is None:
+            return self.__engine.getGrid()
+
+        top, left, bottom, right, step = region
+        bottom, right = min(bottom, self.__grid_size.y), min(right, self.__grid_size.x)
+        if bottom <= top or right <= left:
+            return np.zeros((0, 0), dtype=np.uint8)
+
+        rows_per_chunk = max(save_format.DEFAULT_ROWS_PER_CHUNK // step, 1) * step
+        return np.concatenate([self.__engine.getRows(chunk_top, min(chunk_top + rows_per_chunk, bottom))[::step, left:right:step]
+                               for chunk_top in range(top, bottom, rows_per_chunk)])
+
+    def acquireGeneration(self) -> Generation | None:
+        """
+        The newest published board, None before the first publishGeneration
+        """
+        generations = self.__generations
+        if generations is None:
+            return None
+        return generations.acquire()
+
+    def paintCells(self, cells: list[tuple[int, int], ...], state: int):
+        """
+        Sets every (i, j) of cells inside the board to state
+        """
+        changed_cells = []
+        for i, j in cells:
+            if 0 <= i < self.__grid_size.y and 0 <= j < self.__grid_size.x \
+                    and self.__engine.getCellState(i, j) != state:
+                self.__engine.setCellState(i, j, state)
+                changed_cells.append((i, j))
+        if not changed_cells:
+            return
+
+        indices = np.array(changed_cells, dtype=np.intp)
+        self.__syncCells((indices[:, 0], indices[:, 1]), stepped=False)
+
+    def stampPattern(self, cells: np.ndarray, top: int, left: int,
+                     mode: enums.StampModes.__dict__ = enums.StampModes.overlay):
+        """
+        Writes a pattern bitmask into the board as one block, the part that sticks out of the board is cut off
+        """
+        bottom = min(top + cells.shape[0], self.__grid_size.y)
+        right = min(left + cells.shape[1], self.__grid_size.x)
+        cells = cells[max(-top, 0):max(bottom - top, 0), max(-left, 0):max(right - left, 0)]
+        top, left = max(top, 0), max(left, 0)
+        if not cells.size:
+            return
+
+        old_block = np.array(self.__engine.getRows(top, bottom)[:, left:right])
+        match mode:
+            case enums.StampModes.overlay:
+                block = old_block | cells
+            case enums.StampModes.toggle:
+                block = old_block ^ cells
+            case other:
+                raise Exception(f"Unacceptable stamp mode: {other}")
+
+        self.__engine.setRegion(top, left, block)
+        rows, cols = np.nonzero(block != old_block)
+        self.__syncCells((rows + top, cols + left), stepped=False)
+
+    def saveField(self, path: str = SAVE_FILE_PATH,
+                  compression: enums.SaveCompressions.__dict__ = enums.SaveCompressions.zlib):
+        """
+        The format follows the extension: .rle, .cells or the binary save format otherwise,
+        compression only applies to the binary one
+        """
+        height, width = self.__grid_size.y, self.__grid_size.x
+        rows_per_chunk = save_format.DEFAULT_ROWS_PER_CHUNK
+        row_chunks = (self.__engine.getRows(top, min(top + rows_per_chunk, height))
+                      for top in range(0, height, rows_per_chunk))
+
+        match pattern_format.getSaveFormat(path):
+            case enums.SaveFormats.rle:
+                pattern_format.writeRle(path, width, height, row_chunks, str(self.__rule))
+            case enums.SaveFormats.plaintext:
+                pattern_format.writePlaintext(path, row_chunks)
+            case enums.SaveFormats.binary:
+                save_format.writeSave(path, width, height, row_chunks, compression, rows_per_chunk)
+
+    def loadField(self, path: str = SAVE_FILE_PATH):
+        """
+        Loads a pattern or save file into the top left corner, see saveField for the formats
+        """
+        height, width = self.__grid_size.y, self.__grid_size.x
+        match pattern_format.getSaveFormat(path):
+            case enums.SaveFormats.rle:
+                grid = save_format.fillGrid(pattern_format.iterRleRows(path), height, width)
+            case enums.SaveFormats.plaintext:
+                grid = save_format.fillGrid(pattern_format.iterPlaintextRows(path), height, width)
+            case _:
+                grid = save_format.loadGrid(path, height, width)
+
+        self.__engine.setGrid(grid)
+        self.__markAllChanged()
+        self.__resetTracking()
+
+    def openSnapshot(self, path: str):
+        """
+        Maps a snapshot file and runs the numpy engine directly on it, nothing is read until it is touched.
+        The field takes the size of the snapshot
+        """
+        self.__checkSnapshotEngine()
+        snapshot = save_format.Snapshot(path)
+        grid_size = Vector2(snapshot.header.width, snapshot.header.height)
+
+        self.__closeEngine()
+        self.__grid_size = grid_size
+        self.__snapshot = snapshot
+        self.__engine = self.__createEngine(snapshot.board)
+        self.__engine.generation = snapshot.header.generation
+        self.__markAllChanged()
+        self.__resetTracking()
+
+    def createSnapshot(self, path: str):
+        """
+        Writes the current field into a new snapshot file and continues running on it
+        """
+        self.__checkSnapshotEngine()
+        if self.__snapshot is not None and self.__snapshot.path == path:
+            self.checkpointSnapshot()
+            return
+
+        height, width = self.__grid_size.y, self.__grid_size.x
+        rows_per_chunk = save_format.DEFAULT_ROWS_PER_CHUNK
+        row_chunks = ((top, self.__engine.getRows(top, min(top + rows_per_chunk, height)))
+                      for top in range(0, height, rows_per_chunk))
+
+        save_format.createSnapshot(path, width, height, row_chunks, self.__engine.generation).close()
+        self.openSnapshot(path)
+
+    def __checkSnapshotEngine(self):
+        """
+        Checked before anything is closed or written, so a refused snapshot leaves the field running as it was
+        """
+        if self.__engine_type != enums.EngineTypes.numpy:
+            raise Exception(f"Only the numpy engine can run on a snapshot, not {self.__engine_type.name}")
+
+    def checkpointSnapshot(self):
+        """
+        Flushes the current generation to the opened snapshot file
+        """
+        if self.__snapshot is None:
+            raise Exception("No snapshot is opened")
+
+        self.__engine.checkpoint()
+        self.__snapshot.setGeneration(self.__engine.generation)
+        self.__snapshot.flush()
+
+    def __closeSnapshot(self):
+        if self.__snapshot is not None:
+            self.__snapshot.close()
+            self.__snapshot = None
@@ -0,0 +1,171 @@
+"""
+Headless entry point, runs a simulation without pygame:
+
+    python -m game_of_life run --size 4096x4096 --gens 10000 --rule B3/S23 --seed 42
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+import cycle_detector
+import enums
+import rules
+from field import Field
+from utils import Vector2
+
+DEFAULT_OUTPUT_PATH = "data/headless_save.bin"
+
+
+def parseSize(size: str) -> Vector2:
+    try:
+        width, height = (int(part) for part in size.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Incorrect size, expected WIDTHxHEIGHT: {size}")
+
+    return Vector2(width, height)
+
+
+def parseRule(rulestring: str) -> rules.Rule:
+    try:
+        return rules.Rule(rulestring)
+    except Exception as ex:
+        raise argparse.ArgumentTypeError(str(ex))
+
+
+def parseEnum(enum_type):
+    def parse(name: str):
+        try:
+            return enum_type[name]
+        except KeyError:
+            raise argparse.ArgumentTypeError(f"Unacceptable value {name}, choose from: {', '.join(enum_type.__members__)}")
+
+    return parse
+
+
+def createParser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="game_of_life", description="Game of life without GUI")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="simulate a board and save the final state")
+    run_parser.add_argument("--size", type=parseSize, default=Vector2(35, 35), help="WIDTHxHEIGHT, default 35x35")
+    run_parser.add_argument("--gens", type=int, default=100, help="amount of generations to simulate")
+    run_parser.add_argument("--rule", type=parseRule, default=rules.CONWAY, help="rulestring, default B3/S23")
+    run_parser.add_argument("--seed", type=int, default=None, help="seed of the random start field")
+    run_parser.add_argument("--density", type=int, default=30, help="approximate percent of alive cells at start")
+    run_parser.add_argument("--engine", type=parseEnum(enums.EngineTypes), default=enums.EngineTypes.numpy)
+    run_parser.add_argument("--boundary", type=parseEnum(enums.BoundaryModes), default=None,
+                            help="default is unbounded for hashlife and sparse engines, dead otherwise")
+    run_parser.add_argument("--workers", type=int, default=1, help="worker processes of the parallel engine")
+    run_parser.add_argument("--report-every", type=int, default=0, help="print throughput every N generations")
+    run_parser.add_argument("--input", default=None, help="save file, .rle or .cells pattern to start from instead of a random field")
+    run_parser.add_argument("--output", default=DEFAULT_OUTPUT_PATH,
+                            help=f"where the final field is saved, .rle and .cells paths are written as patterns, "
+                                 f"default {DEFAULT_OUTPUT_PATH}")
+    run_parser.add_argument("--snapshot", default=None,
+                            help="memory-mapped snapshot to resume from if it exists, it is created otherwise "
+                                 "and checkpointed after every report, numpy engine only")
+    run_parser.add_argument("--no-stop-on-cycle", dest="stop_on_cycle", action="store_false",
+                            help="keep running once the board is static or oscillating, it stops there by default")
+    run_parser.add_argument("--cycle-history", type=int, default=cycle_detector.DEFAULT_HISTORY_SIZE,
+                            help=f"amount of checks a period has to repeat within, default {cycle_detector.DEFAULT_HISTORY_SIZE}")
+    run_parser.add_argument("--cycle-check-every", type=int, default=cycle_detector.DEFAULT_CHECK_INTERVAL,
+                            help=f"generations between cycle checks, the engine advances that many at once, "
+                                 f"default {cycle_detector.DEFAULT_CHECK_INTERVAL}")
+    run_parser.add_argument("--metrics", default=None,
+                            help="write population, births, deaths and bounding box of every generation "
+                                 "to this .csv or .jsonl file")
+    run_parser.add_argument("--compression", type=parseEnum(enums.SaveCompressions), default=enums.SaveCompressions.zlib)
+
+    return parser
+
+
+def formatThroughput(generations: int, cells: int, elapsed: float) -> str:
+    elapsed = max(elapsed, 1e-9)
+    return f"{generations / elapsed:.2f} generations/s, {generations * cells / elapsed:.3e} cells/s"
+
+
+def run(args: argparse.Namespace):
+    if args.seed is not None:
+        random.seed(args.seed)
+        np.random.seed(args.seed)
+
+    boundary_mode = args.boundary
+    if boundary_mode is None:
+        match args.engine:
+            case enums.EngineTypes.hashlife | enums.EngineTypes.sparse:
+                boundary_mode = enums.BoundaryModes.unbounded
+            case _:
+                boundary_mode = enums.BoundaryModes.dead
+
+    start_mode = enums.FieldStartModes.empty_field if args.input else enums.FieldStartModes.random_field
+    field = Field(start_mode, args.density, args.size, args.engine, args.workers, args.rule, boundary_mode)
+    if args.input:
+        field.loadField(args.input)
+    if args.snapshot:
+        if os.path.exists(args.snapshot):
+            field.openSnapshot(args.snapshot)
+            print(f"resumed {args.snapshot} at generation {field.getEngine().generation}")
+        else:
+            field.createSnapshot(args.snapshot)
+    if args.stop_on_cycle and boundary_mode == enums.BoundaryModes.unbounded:
+        # covers hashlife, whose jumps would otherwise be cut into check intervals
+        print(f"warning: not stopping on cycles with the {args.engine.name} engine, an unbounded board "
+              f"only hashes its window and cells outside of it would be missed")
+    elif args.stop_on_cycle:
+        field.enableCycleDetection(args.cycle_history, args.cycle_check_every)
+    if args.metrics:
+        field.enableMetrics(sink_path=args.metrics)
+
+    size = field.getEngine().grid_size
+    cells = size.x * size.y
+    chunk = args.report_every if args.report_every > 0 else args.gens
+    print(f"{size.x}x{size.y} board, {args.rule}, {args.engine.name} engine, {boundary_mode.name} boundary, "
+          f"{args.gens} generations")
+
+    try:
+        start_time = time.perf_counter()
+        generations_done = 0
+        while generations_done < args.gens:
+            chunk_generations = min(chunk, args.gens - generations_done)
+            chunk_start_time = time.perf_counter()
+            chunk_start_generation = field.getEngine().generation
+            field.advance(chunk_generations)
+            # advance stops early at a cycle
+            chunk_generations = field.getEngine().generation - chunk_start_generation
+            generations_done += chunk_generations
+            if args.snapshot:
+                field.checkpointSnapshot()
+
+            if args.report_every > 0:
+                print(f"generation {generations_done}: "
+                      f"{formatThroughput(chunk_generations, cells, time.perf_counter() - chunk_start_time)}")
+
+            cycle = field.getCycle()
+            if cycle is not None:
+                print(f"stopped at generation {field.getEngine().generation}: the board is {cycle}")
+                break
+
+        elapsed = time.perf_counter() - start_time
+        print(f"done in {elapsed:.3f}s: {formatThroughput(generations_done, cells, elapsed)}, "
+              f"population {field.getEngine().getPopulation()}")
+
+        field.saveField(args.output, args.compression)
+        print(f"final field saved to {args.output}")
+    finally:
+        field.close()
+
+
+def main(argv: list[str] | None = None):
+    args = createParser().parse_args(argv)
+
+    match args.command:
+        case "run":
+            run(args)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
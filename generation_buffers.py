@@ -0,0 +1,138 @@
+import threading
+
+import numpy as np
+
+# with more pending changed cell batches than this, the next generation is published as changed everywhere
+MAX_PENDING_CHANGES = 64
+
+# (top, left, bottom, right, step): rows top..bottom and columns left..right of the board, every step-th of them
+Region = tuple[int, int, int, int, int]
+
+
+class Generation:
+    """
+    A published board, or the part of it given by region, with the cells that changed since the previously
+    published one. changed holds board coordinates and is None when every cell has to be treated as changed.
+    grid is read-only and is not reused while the reader holds it
+    """
+    def __init__(self, grid: np.ndarray, generation: int, changed: tuple[np.ndarray, np.ndarray] | None,
+                 region: Region | None = None):
+        self.grid = grid
+        self.generation = generation
+        self.changed = changed
+        self.region = region
+
+    def getOrigin(self) -> tuple[int, int, int]:
+        """
+        (top, left, step) of grid in the board
+        """
+        if self.region is None:
+            return 0, 0, 1
+        top, left, _, _, step = self.region
+        return top, left, step
+
+
+class GenerationBuffers:
+    """
+    Triple buffer between the thread that steps the board (writer) and the GUI (reader).
+    The writer copies the board into the buffer that is neither the front one nor the one the reader holds
+    and only takes the lock to swap it to the front, so neither side waits while the other copies or draws.
+    A buffer takes the shape of what is published into it, a view that publishes only its region
+    keeps the buffers as small as the region
+    """
+    def __init__(self):
+        self.__buffers: list[np.ndarray | None] = [None, None, None]
+        self.__lock = threading.Lock()
+
+        self.__front = 0
+        self.__held = 0
+        self.__front_generation = 0
+        self.__front_region: Region | None = None
+        self.__front_changed: tuple[np.ndarray, np.ndarray] | None = None
+        # nothing was published yet, so there is nothing new to take
+        self.__front_taken = True
+        self.__published = False
+
+        # writer side only
+        self.__pending_changes: list[tuple[np.ndarray, np.ndarray], ...] = []
+        self.__pending_all = True
+        self.__published_region: Region | None = None
+
+    def addChanged(self, changed: tuple[np.ndarray, np.ndarray]):
+        if self.__pending_all:
+            return
+
+        self.__pending_changes.append(changed)
+        if len(self.__pending_changes) > MAX_PENDING_CHANGES:
+            self.markAllChanged()
+
+    def markAllChanged(self):
+        self.__pending_changes = []
+        self.__pending_all = True
+
+    def hasPendingChanges(self) -> bool:
+        return self.__pending_all or bool(self.__pending_changes)
+
+    def getPublishedRegion(self) -> Region | None:
+        return self.__published_region
+
+    def isFrontTaken(self) -> bool:
+        """
+        Whether the reader already took the newest generation, there is no use publishing faster than that
+        """
+        with self.__lock:
+            return self.__front_taken
+
+    def publish(self, grid: np.ndarray, generation: int, region: Region | None = None):
+        with self.__lock:
+            back = next(index for index in range(3) if index != self.__front and index != self.__held)
+        if self.__buffers[back] is None or self.__buffers[back].shape != grid.shape:
+            self.__buffers[back] = np.empty(grid.shape, dtype=np.uint8)
+        np.copyto(self.__buffers[back], grid)
+
+        if self.__pending_all or region != self.__published_region:
+            changed = None
+        elif self.__pending_changes:
+            changed = (np.concatenate([rows for rows, _ in self.__pending_changes]),
+                       np.concatenate([cols for _, cols in self.__pending_changes]))
+        else:
+            changed = (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp))
+        self.__pending_changes = []
+        self.__pending_all = False
+        self.__published_region = region
+
+        with self.__lock:
+            if not self.__front_taken and self.__front_changed is not None and changed is not None:
+                # the reader skipped the previous generation, so it still has to see its changes
+                changed = (np.concatenate((self.__front_changed[0], changed[0])),
+                           np.concatenate((self.__front_changed[1], changed[1])))
+            elif not self.__front_taken:
+                changed = None
+
+            self.__front = back
+            self.__front_generation = generation
+            self.__front_region = region
+            self.__front_changed = changed
+            self.__front_taken = False
+            self.__published = True
+
+    def acquire(self) -> Generation | None:
+        """
+        Takes the newest generation and releases the previously taken one, changes are only reported once.
+        None before the first publish
+        """
+        with self.__lock:
+            if not self.__published:
+                return None
+            self.__held = self.__front
+            if self.__front_taken:
+                changed = (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp))
+            else:
+                changed = self.__front_changed
+            self.__front_taken = True
+            generation = self.__front_generation
+            region = self.__front_region
+
+        grid = self.__buffers[self.__held].view()
+        grid.flags.writeable = False
+        return Generation(grid, generation, changed, region)
@@ -1,9 +1,13 @@
 import copy
+import math
 import time
 
+import numpy as np
 import pygame as pg
+import pygame.pixelcopy
 
 import enums
+from gui.viewport import Viewport, calcDensityMap
 from utils import Vector2
 
 
@@ -62,6 +66,9 @@ class Cell(GUI_Object):
     def setInactive(self):
         self.color = self.inactive_color
 
+    def getRect(self) -> pg.Rect:
+        return pg.Rect(self.pos.getTuple(), self.size.getTuple())
+
     def draw(self) -> None:
         pg.draw.rect(self.screen, self.active_color, (self.pos.getTuple(), self.size.getTuple()))
         pg.draw.rect(self.screen, self.color, (self.inner_rect_pos.getTuple(), self.inner_rect_size.getTuple()))
@@ -71,25 +78,168 @@ class Cell(GUI_Object):
 
 
 class Grid(GUI_Object):
+    """
+    The lines are drawn once into a transparent overlay surface, so a frame costs a single blit
+    """
+    # in a viewport the lines are hidden when cells get smaller than this many pixels
+    MIN_VIEW_ZOOM = 4
+
     def __init__(self, screen: pg.display, pos: Vector2, size: Vector2, color: Colors.__dict__, grid_size: Vector2, thickness: int):
         super().__init__(screen, pos, size, color)
         self.grid_size = grid_size
         self.thickness = thickness
-        self.lines = []
-        for i in range(1, grid_size.x):
-            self.lines.append(((self.size.x // grid_size.x * i + self.pos.x, 0 + self.pos.y), (self.size.x // grid_size.x * i + self.pos.x, self.size.y + self.pos.y)))
-        for i in range(1, grid_size.y + 1):
-            self.lines.append(((0 + self.pos.x, self.size.y // grid_size.y * i + self.pos.y), (self.size.x + self.pos.x, self.size.x // grid_size.x * i + self.pos.y)))
-
+        self.__view_spacing = None
+        self.__view_overlay: pg.Surface | None = None
+
+        self.overlay = None
+        if thickness > 0:
+            self.overlay = pg.Surface(size.getTuple(), pg.SRCALPHA)
+            for i in range(1, grid_size.x):
+                x = self.size.x // grid_size.x * i
+                pg.draw.line(self.overlay, self.color, (x, 0), (x, self.size.y), self.thickness)
+            for i in range(1, grid_size.y + 1):
+                y = self.size.y // grid_size.y * i
+                pg.draw.line(self.overlay, self.color, (0, y), (self.size.x, y), self.thickness)
 
     def draw(self):
-        for line in self.lines:
-            pg.draw.line(self.screen, self.color, line[0], line[1], self.thickness)
+        if self.overlay is not None:
+            self.screen.blit(self.overlay, self.pos.getTuple())
+
+    def drawView(self, viewport: Viewport):
+        """
+        Lines between the visible cells, the overlay is rebuilt only when the zoom changes
+        """
+        if self.thickness <= 0 or viewport.zoom < self.MIN_VIEW_ZOOM:
+            return
+
+        spacing = round(viewport.zoom)
+        if self.__view_spacing != spacing:
+            self.__view_spacing = spacing
+            self.__view_overlay = pg.Surface((viewport.size.x + spacing, viewport.size.y + spacing), pg.SRCALPHA)
+            for x in range(0, viewport.size.x + spacing, spacing):
+                pg.draw.line(self.__view_overlay, self.color, (x, 0), (x, viewport.size.y + spacing), self.thickness)
+            for y in range(0, viewport.size.y + spacing, spacing):
+                pg.draw.line(self.__view_overlay, self.color, (0, y), (viewport.size.x + spacing, y), self.thickness)
+
+        first_cell_pos = viewport.worldToScreen(Vector2(math.floor(viewport.left), math.floor(viewport.top)))
+        self.screen.set_clip(pg.Rect(viewport.pos.getTuple(), viewport.size.getTuple()))
+        self.screen.blit(self.__view_overlay, (round(first_cell_pos.x), round(first_cell_pos.y)))
+        self.screen.set_clip(None)
 
 
     def update(self) -> Ellipsis:
         self.draw()
 
+class CellsView:
+    """
+    Draws the board one rect per cell straight from a state array, nothing is kept per cell:
+    the rect of cell (i, j) is computed when it is drawn
+    """
+    def __init__(self, screen: pg.display, pos: Vector2, grid_size: Vector2, cell_size: Vector2, cell_margin: Vector2,
+                 inactive_color: Colors.__dict__, active_color: Colors.__dict__):
+        self.screen = screen
+        self.pos = pos
+        self.grid_size = grid_size
+        self.cell_size = cell_size
+        self.cell_margin = cell_margin
+        self.inactive_color = inactive_color
+        self.active_color = active_color
+
+    def getRect(self) -> pg.Rect:
+        return pg.Rect(self.pos.getTuple(), (self.grid_size * self.cell_size).getTuple())
+
+    def getCellRect(self, i: int, j: int) -> pg.Rect:
+        return pg.Rect(self.pos.x + j * self.cell_size.x + self.cell_margin.x // 2,
+                       self.pos.y + i * self.cell_size.y + self.cell_margin.y // 2,
+                       self.cell_size.x - self.cell_margin.x, self.cell_size.y - self.cell_margin.y)
+
+    def drawCells(self, grid: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> list[pg.Rect, ...]:
+        """
+        Draws the cells (rows[k], cols[k]) in their state in grid, returns their rects
+        """
+        rects = []
+        for i, j, state in zip(rows.tolist(), cols.tolist(), grid[rows, cols].tolist()):
+            rect = self.getCellRect(i, j)
+            self.screen.fill(self.active_color if state else self.inactive_color, rect)
+            rects.append(rect)
+        return rects
+
+    def drawAll(self, grid: np.ndarray):
+        """
+        Clears the board area and draws only the alive cells
+        """
+        self.screen.fill(self.inactive_color, self.getRect())
+        for i, j in zip(*(indices.tolist() for indices in np.nonzero(grid))):
+            self.screen.fill(self.active_color, self.getCellRect(i, j))
+
+
+class Board(GUI_Object):
+    """
+    Draws the visible part of the board in one blit: the visible cells are copied into an 8-bit palettized surface
+    with a pixel per cell, or per block of cells shown as their density when zoomed out, which is scaled by the zoom
+    """
+    # a zoomed out pixel averages at most this many x this many of its cells
+    MAX_DENSITY_SAMPLES = 2
+
+    def __init__(self, screen: pg.display, viewport: Viewport,
+                 inactive_color: Colors.__dict__, active_color: Colors.__dict__):
+        super().__init__(screen, viewport.pos, viewport.size, inactive_color)
+        self.viewport = viewport
+        self.palette = [tuple(inactive + (active - inactive) * value // 255 for inactive, active in zip(inactive_color, active_color))
+                        for value in range(256)]
+        self.__surfaces: dict[tuple[int, int], pg.Surface] = {}
+
+    def __getSurface(self, size: tuple[int, int]) -> pg.Surface:
+        """
+        Palettized surfaces are reused between frames, they only change when the visible area does
+        """
+        surface = self.__surfaces.get(size)
+        if surface is None:
+            if len(self.__surfaces) > 8:
+                self.__surfaces.clear()
+            surface = pg.Surface(size, depth=8)
+            surface.set_palette(self.palette)
+            self.__surfaces[size] = surface
+        return surface
+
+    def getRect(self) -> pg.Rect:
+        return pg.Rect(self.pos.getTuple(), self.size.getTuple())
+
+    def getSampledRegion(self) -> tuple[int, int, int, int, int]:
+        """
+        The part of the board drawView needs, see Viewport.getSampledRegion
+        """
+        return self.viewport.getSampledRegion(self.MAX_DENSITY_SAMPLES)
+
+    def drawView(self, cells: np.ndarray, top: int, left: int, step: int):
+        """
+        cells holds every step-th row and column of the board from (top, left), usually getSampledRegion.
+        They are placed by their own origin and step, so cells read for the previous viewport are still drawn right
+        """
+        self.screen.fill(self.color, self.getRect())
+        if not cells.size:
+            return
+
+        # pixels per cell of the sampled array
+        zoom = self.viewport.zoom * step
+        if zoom < 1:
+            pixels = calcDensityMap(cells, round(1 / zoom))
+            zoom = 1
+        else:
+            pixels = np.multiply(cells, 255, dtype=np.uint8)
+
+        cells_surface = self.__getSurface((pixels.shape[1], pixels.shape[0]))
+        pg.pixelcopy.array_to_surface(cells_surface, pixels.T)
+        if zoom > 1:
+            scaled_size = (round(pixels.shape[1] * zoom), round(pixels.shape[0] * zoom))
+            cells_surface = pg.transform.scale(cells_surface, scaled_size, self.__getSurface(scaled_size))
+
+        screen_pos = self.viewport.worldToScreen(Vector2(left, top))
+        self.screen.set_clip(self.getRect())
+        self.screen.blit(cells_surface, (round(screen_pos.x), round(screen_pos.y)))
+        self.screen.set_clip(None)
+
+
 class Menu(GUI_Object):
 
     def __init__(self, screen: pg.display, pos: Vector2, size: Vector2, color: Colors.__dict__, menu_layout: dict):
@@ -119,17 +269,24 @@ class Menu(GUI_Object):
 
 
 class GUI_Drawer:
-    def __init__(self, grid_size: Vector2, grid_thickness: int, cell_size: Vector2, menu_size: Vector2, menu_layout: dict, max_fps: int = 60):
+    # with more changed rects than this a single full display update is cheaper
+    MAX_DIRTY_RECTS = 2048
+
+    def __init__(self, grid_size: Vector2, grid_thickness: int, cell_size: Vector2, menu_size: Vector2, menu_layout: dict, max_fps: int = 60,
+                 view_size: Vector2 | None = None, cell_margin: Vector2 = Vector2(0, 0)):
+        """
+        view_size is the size of the board area in pixels, by default the whole board fits at cell_size
+        """
         pg.init()
         self.pg_events = pg.event.get()
         pg.font.init()
         self.pg_font = pg.font.SysFont('Roboto Mono', 20)
 
-        grid_screen_size = grid_size * cell_size
+        grid_screen_size = grid_size * cell_size if view_size is None else view_size
 
         menu_size.x = grid_screen_size.x
 
-        self.screen_size = grid_size * cell_size
+        self.screen_size = Vector2(grid_screen_size.x, grid_screen_size.y)
         self.screen_size.y += menu_size.y
 
         self.screen = pg.display.set_mode(self.screen_size.getTuple())
@@ -137,7 +294,16 @@ class GUI_Drawer:
         self.__max_fps = max_fps
 
         self.grid = Grid(self.screen,  Vector2(0, 0), grid_screen_size, Colors.white, grid_size, grid_thickness)
-        self.menu = Menu(self.screen, Vector2(0, self.screen_size.y - menu_size.y), menu_size, Colors.white, menu_layout)
+        self.viewport = Viewport(Vector2(0, 0), grid_screen_size, grid_size, cell_size.x)
+        self.board = Board(self.screen, self.viewport, Colors.black, Colors.purple)
+        self.cells_view = CellsView(self.screen, Vector2(0, 0), grid_size, cell_size, cell_margin, Colors.black, Colors.purple)
+        self.menu_pos = Vector2(0, self.screen_size.y - menu_size.y)
+        self.menu_size = menu_size
+        self.menu = Menu(self.screen, self.menu_pos, menu_size, Colors.white, menu_layout)
+
+        self.__dirty_rects: list[pg.Rect, ...] = []
+        self.__full_update = True
+        self.__overlay_rect: pg.Rect | None = None
 
     def renderCurrentStateText(self, text: str, text_pos: Vector2):
         text_surface = self.pg_font.render(text, True, Colors.white)
@@ -149,9 +315,64 @@ class GUI_Drawer:
     def drawGrid(self):
         self.grid.update()
 
+    def drawBoard(self, cells: np.ndarray, top: int, left: int, step: int):
+        self.board.drawView(cells, top, left, step)
+        self.addDirtyRect(self.board.getRect())
+
+    def drawCells(self, grid: np.ndarray, changed: tuple[np.ndarray, np.ndarray] | None):
+        """
+        Redraws the changed cells of the board, all of them when changed is None
+        """
+        if changed is None:
+            self.cells_view.drawAll(grid)
+            self.addDirtyRect(self.cells_view.getRect())
+            return
+
+        for rect in self.cells_view.drawCells(grid, *changed):
+            self.addDirtyRect(rect)
+
+    def drawGridView(self):
+        self.grid.drawView(self.viewport)
+
     def drawMenu(self):
         self.menu.update()
 
+    def drawOverlay(self, lines: list[str, ...], pos: Vector2):
+        """
+        Text lines on a black box, drawn over whatever is below them
+        """
+        surfaces = [self.pg_font.render(line, True, Colors.white) for line in lines]
+        if not surfaces:
+            return
+
+        line_height = self.pg_font.get_height()
+        rect = pg.Rect(pos.getTuple(), (max(surface.get_width() for surface in surfaces), line_height * len(surfaces)))
+        # the box only grows, so a shorter line does not leave the end of the previous one behind
+        if self.__overlay_rect is not None and self.__overlay_rect.topleft == rect.topleft:
+            rect.union_ip(self.__overlay_rect)
+        self.__overlay_rect = rect
+        self.screen.fill(Colors.black, rect)
+        for line_index, surface in enumerate(surfaces):
+            self.screen.blit(surface, (pos.x, pos.y + line_index * line_height))
+        self.addDirtyRect(rect)
+
+    def drawPlot(self, values: np.ndarray, pos: Vector2, size: Vector2, color: Colors.__dict__ = Colors.purple):
+        """
+        Line plot of values scaled to fit the rect, the last size.x values at most
+        """
+        rect = pg.Rect(pos.getTuple(), size.getTuple())
+        pg.draw.rect(self.screen, Colors.gray, rect, 1)
+        self.addDirtyRect(rect)
+
+        values = values[-(size.x - 2):]
+        if len(values) < 2:
+            return
+
+        low, high = int(values.min()), int(values.max())
+        xs = pos.x + 1 + np.arange(len(values)) * (size.x - 3) // (len(values) - 1)
+        ys = pos.y + size.y - 2 - (values - low) * (size.y - 3) // max(high - low, 1)
+        pg.draw.lines(self.screen, color, False, np.column_stack((xs, ys)).tolist())
+
 
     def drawStartMenu(self):
         self.start_menu.update()
@@ -159,8 +380,29 @@ class GUI_Drawer:
     def clearScreen(self, color: Colors.__dict__ = Colors.black):
         self.screen.fill(color)
 
+    def clearMenu(self, color: Colors.__dict__ = Colors.black):
+        self.screen.fill(color, (self.menu_pos.getTuple(), self.menu_size.getTuple()))
+
+    def addDirtyRect(self, rect: pg.Rect):
+        self.__dirty_rects.append(rect)
+
+    def markScreenDirty(self):
+        self.__full_update = True
+
+    def getMenuRect(self) -> pg.Rect:
+        return pg.Rect(self.menu_pos.getTuple(), self.menu_size.getTuple())
+
     def updateScreen(self):
-        pg.display.update()
+        """
+        Pushes only the rects added since the previous frame to the display
+        """
+        if self.__full_update or len(self.__dirty_rects) > self.MAX_DIRTY_RECTS:
+            pg.display.update()
+        elif self.__dirty_rects:
+            pg.display.update(self.__dirty_rects)
+
+        self.__dirty_rects = []
+        self.__full_update = False
         self.clock.tick(self.__max_fps)
 
 
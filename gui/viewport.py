@@ -0,0 +1,106 @@
+import math
+
+import numpy as np
+
+from utils import Vector2
+
+
+def calcDensityMap(sampled: np.ndarray, block: int) -> np.ndarray:
+    """
+    Averages block x block blocks of cells into 0..255 densities, the cells are usually already strided
+    (see Viewport.getSampledRegion), so the cost depends on the pixels shown
+    """
+    height, width = -(-sampled.shape[0] // block), -(-sampled.shape[1] // block)
+    padded = sampled
+    if sampled.shape != (height * block, width * block):
+        padded = np.zeros((height * block, width * block), dtype=np.uint8)
+        padded[:sampled.shape[0], :sampled.shape[1]] = sampled
+
+    density = padded.reshape(height, block, width, block).sum(axis=(1, 3), dtype=np.uint32)
+    return (density * 255 // (block * block)).astype(np.uint8)
+
+
+class Viewport:
+    """
+    World to screen transform of the board area: the cell in row i, column j is drawn at
+    pos + ((j - left) * zoom, (i - top) * zoom), a zoom below 1 packs several cells into a pixel
+    """
+    # below 1 only 1 / 2^n, so a pixel always covers a whole square block of cells
+    ZOOM_LEVELS = tuple(1 / 2 ** n for n in range(10, 0, -1)) + (1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 48, 64)
+
+    def __init__(self, pos: Vector2, size: Vector2, grid_size: Vector2, zoom: float):
+        self.pos = pos
+        self.size = size
+        self.grid_size = grid_size
+        self.zoom = zoom
+        self.left = 0.0
+        self.top = 0.0
+
+    def getCellsPerPixel(self) -> int:
+        return 1 if self.zoom >= 1 else round(1 / self.zoom)
+
+    def screenToWorld(self, screen_pos: Vector2) -> Vector2:
+        return Vector2(self.left + (screen_pos.x - self.pos.x) / self.zoom,
+                       self.top + (screen_pos.y - self.pos.y) / self.zoom)
+
+    def worldToScreen(self, world_pos: Vector2) -> Vector2:
+        return Vector2(self.pos.x + (world_pos.x - self.left) * self.zoom,
+                       self.pos.y + (world_pos.y - self.top) * self.zoom)
+
+    def isOnScreen(self, screen_pos: Vector2) -> bool:
+        return self.pos.x <= screen_pos.x < self.pos.x + self.size.x \
+            and self.pos.y <= screen_pos.y < self.pos.y + self.size.y
+
+    def pan(self, dx: float, dy: float):
+        """
+        Moves the board by (dx, dy) pixels
+        """
+        self.left -= dx / self.zoom
+        self.top -= dy / self.zoom
+        self.__clamp()
+
+    def zoomAt(self, steps: int, screen_pos: Vector2):
+        """
+        Moves steps zoom levels in (positive) or out, keeping the cell under screen_pos in place
+        """
+        if steps > 0:
+            larger = [level for level in self.ZOOM_LEVELS if level > self.zoom]
+            zoom = larger[min(steps, len(larger)) - 1] if larger else self.zoom
+        else:
+            smaller = [level for level in self.ZOOM_LEVELS if level < self.zoom]
+            zoom = smaller[max(steps, -len(smaller))] if smaller else self.zoom
+
+        anchor = self.screenToWorld(screen_pos)
+        self.zoom = zoom
+        self.left = anchor.x - (screen_pos.x - self.pos.x) / zoom
+        self.top = anchor.y - (screen_pos.y - self.pos.y) / zoom
+        self.__clamp()
+
+    def __clamp(self):
+        """
+        Stops panning once a board edge passes the middle of the screen
+        """
+        view_width, view_height = self.size.x / self.zoom, self.size.y / self.zoom
+        self.left = min(max(self.left, -view_width / 2), max(self.grid_size.x - view_width / 2, 0))
+        self.top = min(max(self.top, -view_height / 2), max(self.grid_size.y - view_height / 2, 0))
+
+    def getSampledRegion(self, max_samples: int) -> tuple[int, int, int, int, int]:
+        """
+        (top, left, bottom, right, step) of the visible cells when a zoomed out pixel reads at most
+        max_samples x max_samples evenly strided cells of its block
+        """
+        top, left, bottom, right = self.getVisibleCells()
+        return top, left, bottom, right, max(1, self.getCellsPerPixel() // max_samples)
+
+    def getVisibleCells(self) -> tuple[int, int, int, int]:
+        """
+        (top, left, bottom, right) of the visible cells, top and left aligned to whole pixels at zoom below 1
+        """
+        cells_per_pixel = self.getCellsPerPixel()
+        top, left = math.floor(self.top), math.floor(self.left)
+        top, left = top - top % cells_per_pixel, left - left % cells_per_pixel
+        bottom = math.ceil(self.top + self.size.y / self.zoom)
+        right = math.ceil(self.left + self.size.x / self.zoom)
+
+        return (min(max(top, 0), self.grid_size.y), min(max(left, 0), self.grid_size.x),
+                min(max(bottom, 0), self.grid_size.y), min(max(right, 0), self.grid_size.x))
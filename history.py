@@ -0,0 +1,186 @@
+from collections import deque
+
+import numpy as np
+
+DEFAULT_CAPACITY = 10000
+DEFAULT_KEYFRAME_INTERVAL = 256
+DEFAULT_MAX_BYTES = 256 << 20
+
+
+class History:
+    """
+    The last capacity generations of a board as the flat indices of the cells every generation flipped,
+    plus a bit-packed copy of the whole board every keyframe_interval generations, or sooner once the deltas since
+    the last keyframe take a quarter of max_bytes. Beyond capacity generations or max_bytes the oldest are dropped.
+    Cells flipped by edits are kept as small lists next to the deltas instead of being merged into them,
+    so an edit costs O(edited cells). A generation is rebuilt from the closest keyframe or from the last rebuilt one,
+    whichever is nearer, flipping a delta again undoes it, so scrubbing one generation at a time costs one delta
+    """
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        if capacity < 1 or keyframe_interval < 1 or max_bytes < 1:
+            raise Exception(f"Incorrect history size: capacity {capacity}, keyframe interval {keyframe_interval}, "
+                            f"max bytes {max_bytes}")
+
+        self.capacity = capacity
+        self.keyframe_interval = keyframe_interval
+        self.max_bytes = max_bytes
+        self.__shape: tuple[int, int] = (0, 0)
+        self.__index_dtype = np.uint32
+        # deltas[k] turns generation first_generation + k into the next one
+        self.__deltas: deque[np.ndarray] = deque()
+        # edits[g] are the cells flipped by edits made at generation g, in the order they were made.
+        # A keyframe is the board as stepped into its generation, before its edits
+        self.__edits: dict[int, list[np.ndarray]] = {}
+        self.__keyframes: dict[int, np.ndarray] = {}
+        self.__byte_count = 0
+        self.__first_generation = 0
+        self.__cached_grid: np.ndarray | None = None
+        self.__cached_generation = 0
+
+    def getRange(self) -> tuple[int, int]:
+        """
+        First and last generation that can be rebuilt
+        """
+        return self.__first_generation, self.__first_generation + len(self.__deltas)
+
+    def getByteCount(self) -> int:
+        """
+        Bytes taken by the deltas, the edits and the keyframes
+        """
+        return self.__byte_count
+
+    def reset(self, grid: np.ndarray, generation: int):
+        self.__shape = grid.shape
+        self.__index_dtype = np.min_scalar_type(max(grid.size - 1, 0))
+        self.__deltas.clear()
+        self.__edits.clear()
+        self.__keyframes.clear()
+        self.__byte_count = 0
+        self.__first_generation = generation
+        self.__cached_grid = None
+        self.addKeyframe(grid, generation)
+
+    def __flatten(self, changed: tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+        return np.ravel_multi_index(changed, self.__shape).astype(self.__index_dtype)
+
+    def record(self, changed: tuple[np.ndarray, np.ndarray], generation: int):
+        """
+        Adds the cells flipped by the step into generation, the generations after the one it was stepped from
+        are dropped first
+        """
+        self.truncate(generation - 1)
+        delta = self.__flatten(changed)
+        self.__deltas.append(delta)
+        self.__byte_count += delta.nbytes
+
+        while len(self.__keyframes) > 1 and (len(self.__deltas) > self.capacity + self.keyframe_interval
+                                             or self.__byte_count > self.max_bytes):
+            self.__dropOldest()
+
+    def needsKeyframe(self, generation: int) -> bool:
+        last_keyframe = max(self.__keyframes)
+        if generation - last_keyframe >= self.keyframe_interval:
+            return True
+
+        delta_count = len(self.__deltas) - (last_keyframe - self.__first_generation)
+        return sum(self.__deltas[-k].nbytes for k in range(1, delta_count + 1)) > self.max_bytes // 4
+
+    def addKeyframe(self, grid: np.ndarray, generation: int):
+        self.__deleteKeyframe(generation)
+        keyframe = np.packbits(grid, axis=None)
+        self.__keyframes[generation] = keyframe
+        self.__byte_count += keyframe.nbytes
+
+    def __deleteKeyframe(self, generation: int):
+        keyframe = self.__keyframes.pop(generation, None)
+        if keyframe is not None:
+            self.__byte_count -= keyframe.nbytes
+
+    def __deleteEdits(self, generation: int):
+        for flipped in self.__edits.pop(generation, ()):
+            self.__byte_count -= flipped.nbytes
+
+    def applyEdit(self, changed: tuple[np.ndarray, np.ndarray], generation: int):
+        """
+        Adds the cells flipped by an edit made at generation, the generations after it are dropped
+        """
+        self.truncate(generation)
+        flipped = self.__flatten(changed)
+        if not flipped.size:
+            return
+
+        self.__edits.setdefault(generation, []).append(flipped)
+        self.__byte_count += flipped.nbytes
+        if self.__cached_grid is not None and self.__cached_generation == generation:
+            self.__cached_grid.ravel()[flipped] ^= 1
+
+    def __applyEdits(self, flat_grid: np.ndarray, generation: int):
+        for flipped in self.__edits.get(generation, ()):
+            flat_grid[flipped] ^= 1
+
+    def truncate(self, generation: int):
+        first_generation, last_generation = self.getRange()
+        if not first_generation <= generation < last_generation:
+            return
+
+        for _ in range(last_generation - generation):
+            self.__byte_count -= self.__deltas.pop().nbytes
+        for edit_generation in [key for key in self.__edits if key > generation]:
+            self.__deleteEdits(edit_generation)
+        for keyframe_generation in [key for key in self.__keyframes if key > generation]:
+            self.__deleteKeyframe(keyframe_generation)
+        if self.__cached_generation > generation:
+            self.__cached_grid = None
+
+    def __dropOldest(self):
+        """
+        Drops the oldest keyframe and the deltas up to the next one, so the history always starts at a keyframe
+        and keeps at least capacity generations
+        """
+        self.__deleteKeyframe(self.__first_generation)
+        next_keyframe = min(self.__keyframes)
+        for _ in range(next_keyframe - self.__first_generation):
+            self.__byte_count -= self.__deltas.popleft().nbytes
+        # the edits at next_keyframe stay, its keyframe does not hold them
+        for edit_generation in [key for key in self.__edits if key < next_keyframe]:
+            self.__deleteEdits(edit_generation)
+        self.__first_generation = next_keyframe
+
+        if self.__cached_grid is not None and self.__cached_generation < next_keyframe:
+            self.__cached_grid = None
+
+    def __unpackKeyframe(self, generation: int) -> np.ndarray:
+        cell_count = self.__shape[0] * self.__shape[1]
+        return np.unpackbits(self.__keyframes[generation], count=cell_count).reshape(self.__shape)
+
+    def getGrid(self, generation: int) -> np.ndarray:
+        """
+        Rebuilds generation, the returned board is read-only and only valid until the next call
+        """
+        first_generation, last_generation = self.getRange()
+        if not first_generation <= generation <= last_generation:
+            raise Exception(f"Generation {generation} is not in the history {first_generation}..{last_generation}")
+
+        keyframe_generation = max(key for key in self.__keyframes if key <= generation)
+        if self.__cached_grid is None \
+                or abs(generation - self.__cached_generation) > generation - keyframe_generation:
+            self.__cached_grid = self.__unpackKeyframe(keyframe_generation)
+            self.__applyEdits(self.__cached_grid.ravel(), keyframe_generation)
+            self.__cached_generation = keyframe_generation
+
+        flat_grid = self.__cached_grid.ravel()
+        if generation > self.__cached_generation:
+            for delta_generation in range(self.__cached_generation, generation):
+                flat_grid[self.__deltas[delta_generation - first_generation]] ^= 1
+                self.__applyEdits(flat_grid, delta_generation + 1)
+        else:
+            # going back undoes the edits of the generation and then the delta that led into it
+            for delta_generation in range(self.__cached_generation, generation, -1):
+                self.__applyEdits(flat_grid, delta_generation)
+                flat_grid[self.__deltas[delta_generation - 1 - first_generation]] ^= 1
+        self.__cached_generation = generation
+
+        grid = self.__cached_grid.view()
+        grid.flags.writeable = False
+        return grid
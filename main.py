@@ -1,20 +1,27 @@
 import builtins
 import random
 import time
+import tracemalloc
 from enum import Enum
 import threading
 import sys
 import math
 from collections.abc import Callable
 
+import numpy as np
 import pygame as pg
 
+import cycle_detector
 import gui
-from utils import Vector2
+import history
+import metrics
+from field import Field
+from utils import Vector2, bresenhamLine
 import enums
-
-SAVE_FILE_PATH = "data/save.bin"
-SAVE_FILE_PATTERN = bytearray([1, 1, 1, 0, 0, 1, 0, 0])
+import patterns
+import profiler
+import rules
+from tick_scheduler import TickScheduler
 
 
 class Cell:
@@ -58,206 +65,27 @@ class Cell:
         return self.__gui_object
 
     def update(self, process_clicks: bool, mouse_click_state: tuple[int], mouse_pos: Vector2):
-        gui_obj = self.__gui_object
-        gui_obj.update()
+        self.__gui_object.update()
 
         if process_clicks:
-            is_mouse_pressed = mouse_click_state[0]
-            is_mouse_inside = gui_obj.checkMouseWithinBounds(mouse_pos)
+            self.processClick(mouse_click_state, mouse_pos)
+
+    def processClick(self, mouse_click_state: tuple[int], mouse_pos: Vector2):
+        gui_obj = self.__gui_object
+        is_mouse_pressed = mouse_click_state[0]
+        is_mouse_inside = gui_obj.checkMouseWithinBounds(mouse_pos)
 
-            if is_mouse_inside and is_mouse_pressed:
-                if gui_obj.next_time_mouse_click_accepted <= time.time():
-                    gui_obj.next_time_mouse_click_accepted = time.time() + gui_obj.MOUSE_CLICK_ACCEPT_TIME_INTERVAL
-                    self.changeState()
+        if is_mouse_inside and is_mouse_pressed:
+            if gui_obj.next_time_mouse_click_accepted <= time.time():
+                gui_obj.next_time_mouse_click_accepted = time.time() + gui_obj.MOUSE_CLICK_ACCEPT_TIME_INTERVAL
+                self.changeState()
+                self.doOnClick()
 
     def doOnClick(self):
         for do_on_click_events in self.do_on_click_events:
             do_on_click_events()
 
 
-class Field:
-    def __init__(self,
-                 gui_drawer: gui.classes.GUI_Drawer,
-                 start_mode: enums.FieldStartModes.__dict__,
-                 not_empty_cells_percent_approx: int,
-                 grid_size: Vector2,
-                 grid_thickness: int,
-                 cell_size: Vector2,
-                 cell_margin: Vector2, ):
-
-        self.__gui_drawer = gui_drawer
-        self.__start_mode = start_mode
-        self.__not_empty_cells_percent_approx = not_empty_cells_percent_approx
-        self.__grid_size = grid_size
-        self.__cell_size = cell_size
-        self.__cell_margin = cell_margin
-        self.__grid_thickness = grid_thickness
-
-        self.__field: list[list[Cell, ...], ...]
-        self.initField()
-
-    def initField(self):
-        self.__field: list[list[Cell, ...], ...] = []
-
-        cell_size_with_margin = self.__cell_size - self.__cell_margin
-        cell_offset_margin_compensation = Vector2(self.__cell_margin.x // 2, self.__cell_margin.y // 2)
-
-        for i in range(self.__grid_size.y):
-            tmp = []
-            for j in range(self.__grid_size.x):
-                pos = Vector2(j * self.__cell_size.x + cell_offset_margin_compensation.x,
-                              i * self.__cell_size.y + cell_offset_margin_compensation.y)
-                gui_obj = gui.classes.Cell(self.__gui_drawer.screen,
-                                           pos,
-                                           cell_size_with_margin,
-                                           gui.classes.Colors.black,
-                                           gui.classes.Colors.purple
-                                           )
-
-                match self.__start_mode:
-                    case enums.FieldStartModes.empty_field:
-                        cell = Cell(gui_obj)
-                    case enums.FieldStartModes.full_field:
-                        cell = Cell(gui_obj)
-                        cell.changeState()
-                    case enums.FieldStartModes.random_field:
-                        cell = self.randCellState(gui_obj, self.__not_empty_cells_percent_approx)
-
-                tmp.append(cell)
-
-            self.__field.append(tmp)
-
-    def processTick(self) -> list[list[Cell, ...], ...]:
-        new_field = []
-
-        for i in range(len(self.__field)):
-            tmp = []
-            for j in range(len(self.__field[0])):
-                cell = self.__field[i][j]
-
-                neighbours = self.__getAmountOfNeighbours(i, j)
-                new_cell = Cell(cell.getGUIObject(), cell.getState())
-
-                if cell.getState() == enums.CellStates.not_empty:
-                    if neighbours == 2 or neighbours == 3:
-                        pass
-                    else:
-                        new_cell.changeState()
-
-                if cell.getState() == enums.CellStates.empty:
-                    if neighbours == 3:
-                        new_cell.changeState()
-                    else:
-                        pass
-
-                tmp.append(new_cell)
-
-            new_field.append(tmp)
-
-        self.__field = new_field
-
-        return new_field
-
-    def __getAmountOfNeighbours(self, i, j) -> int:
-        amount_of_neighbours = 0
-
-        if i > 0 and self.__field[i - 1][j].getState() == enums.CellStates.not_empty:
-            amount_of_neighbours += 1
-        if i > 0 and j + 1 < len(self.__field[i]) and self.__field[i - 1][j + 1].getState() == enums.CellStates.not_empty:
-            amount_of_neighbours += 1
-        if j + 1 < len(self.__field[i]) and self.__field[i][j + 1].getState() == enums.CellStates.not_empty:
-            amount_of_neighbours += 1
-        if i + 1 < len(self.__field) and j + 1 < len(self.__field[i]) and self.__field[i + 1][j + 1].getState() == enums.CellStates.not_empty:
-            amount_of_neighbours += 1
-        if i + 1 < len(self.__field) and self.__field[i + 1][j].getState() == enums.CellStates.not_empty:
-            amount_of_neighbours += 1
-        if i + 1 < len(self.__field) and j > 0 and self.__field[i + 1][j - 1].getState() == enums.CellStates.not_empty:
-            amount_of_neighbours += 1
-        if j > 0 and self.__field[i][j - 1].getState() == enums.CellStates.not_empty:
-            amount_of_neighbours += 1
-        if i > 0 and j > 0 and self.__field[i - 1][j - 1].getState() == enums.CellStates.not_empty:
-            amount_of_neighbours += 1
-
-        return amount_of_neighbours
-
-    @staticmethod
-    def getRandomCellState(percent: int) -> enums.CellStates.__dict__:
-        if not (0 <= percent <= 100):
-            raise Exception("Not allowed percentage provided!")
-
-        rand_num = random.randint(0, 100 - 1)
-
-        if 0 <= rand_num <= percent:
-            return enums.CellStates.not_empty
-        else:
-            return enums.CellStates.empty
-
-    @classmethod
-    def randCellState(cls, gui_obj: gui.classes.Cell, not_empty_cells_percent_approx: int) -> Cell:
-        rand_cell_state = cls.getRandomCellState(not_empty_cells_percent_approx)
-
-        match rand_cell_state:
-            case enums.CellStates.empty:
-                cell = Cell(gui_obj)
-
-            case enums.CellStates.not_empty:
-                cell = Cell(gui_obj)
-                cell.changeState()
-
-        return cell
-
-    def getField(self) -> list[list[Cell, ...], ...]:
-        return self.__field
-
-    def saveField(self):
-        with open(SAVE_FILE_PATH, "wb") as file:
-            file.write(SAVE_FILE_PATTERN)
-            array = []
-            for i in range(len(self.__field)):
-                for j in range(len(self.__field[i])):
-                    match self.__field[i][j].getState():
-                        case enums.CellStates.empty:
-                            array.append(0)
-                        case enums.CellStates.not_empty:
-                            array.append(1)
-                array.append(255)
-
-            file.write(bytearray(array))
-
-    def loadField(self):
-        for i in range(len(self.__field)):
-            for j in range(len(self.__field[i])):
-                self.__field[i][j].setInactive()
-
-        with open(SAVE_FILE_PATH, "rb") as file:
-            start_pattern = file.read()[:len(SAVE_FILE_PATTERN)]
-            if start_pattern != SAVE_FILE_PATTERN:
-                raise Exception("Incorrect save file!")
-            file.seek(len(SAVE_FILE_PATTERN))
-
-            i, j = 0, 0
-            for byte in file.read():
-                if len(self.__field) < i:
-                    continue
-                if len(self.__field[i]) < j:
-                    continue
-
-                try:
-                    match byte:
-                        case 0:
-                            self.__field[i][j].setInactive()
-                            j += 1
-                        case 1:
-                            self.__field[i][j].setActive()
-                            j += 1
-
-                        case 255:
-                            i += 1
-                            j = 0
-
-                except IndexError as ex:
-                    raise Exception(f"Program can not load field that is bigger than active field yet or save file is corrupted: {ex}")
-
 class GameObject:
     def __init__(self, gui_obj: gui.classes.GUI_Object, on_click_event: Callable):
         self.gui_obj = gui_obj
@@ -300,10 +128,51 @@ class Game:
     # GRID_THICKNESS = round(0.08 * (CELL_SIZE.x + CELL_SIZE.y) / 2)
     GRID_THICKNESS = 0
     FIELD_START_MODE = enums.FieldStartModes.random_field
+    ENGINE_TYPE = enums.EngineTypes.numpy
+    WORKER_COUNT = 4
+    RULE = rules.CONWAY_RULESTRING
+    # hashlife and sparse engines only work with BoundaryModes.unbounded, the rest with dead, toroidal or mirror
+    BOUNDARY_MODE = enums.BoundaryModes.dead
     NOT_EMPTY_CELLS_PERCENT_APPROX = 30
     MAX_GAME_ITERATIONS_PER_SECOND = 10
     PERFORM_ACTIONS_IN_PLACE = False
+    # surface mode draws boards with millions of cells without creating an object per cell
+    RENDER_MODE = enums.RenderModes.cells
+    # board area of the window in surface mode, None fits the whole board at CELL_SIZE;
+    # mouse wheel zooms, right button drag and arrow keys pan
+    VIEW_SIZE = None
+    PAN_STEP = 50
+    # tracemalloc and the block count are process-wide, so the figure also holds what the GUI thread allocated
+    # meanwhile, "python benchmark.py run --in-place --trace-allocations" measures a tick alone
+    TRACE_ALLOCATIONS = False
+    # 't' toggles the phase timing overlay, 'p' starts and stops a cProfile capture of both threads
+    PROFILE_PHASES = False
+    PHASE_SAMPLE_COUNT = profiler.DEFAULT_SAMPLE_COUNT
+    PROFILE_DIRECTORY = "data"
+    # .rle and .cells paths are saved in those formats, anything else in the binary save format
+    SAVE_FILE_PATH = "data/save.bin"
+    SAVE_COMPRESSION = enums.SaveCompressions.zlib
     CAP_FPS_TO_REAL_TIME_TICKS = False
+    # amount of gliders a single PlaceGlider click drops at random places
+    PLACE_GLIDER_COUNT = 100
+    STAMP_MODE = enums.StampModes.overlay
+    # pauses the game once the board is static or oscillating with a period up to CYCLE_HISTORY_SIZE,
+    # not available for the unbounded boundary mode
+    STOP_ON_CYCLE = True
+    CYCLE_HISTORY_SIZE = cycle_detector.DEFAULT_HISTORY_SIZE
+    # while paused ',' and '.' step one generation back and forth through the history,
+    # page up and page down HISTORY_SCRUB_STEP generations, home and end jump to the oldest and the newest one
+    RECORD_HISTORY = True
+    HISTORY_SIZE = history.DEFAULT_CAPACITY
+    HISTORY_KEYFRAME_INTERVAL = history.DEFAULT_KEYFRAME_INTERVAL
+    HISTORY_SCRUB_STEP = 100
+    # population, births, deaths and bounding box of every generation, also written to a .csv or .jsonl file if set
+    RECORD_METRICS = True
+    METRICS_SIZE = metrics.DEFAULT_CAPACITY
+    METRICS_FILE_PATH = None
+    # relative to the menu, the latest statistics are written above the plot
+    POPULATION_PLOT_POS = Vector2(200, 88)
+    POPULATION_PLOT_HEIGHT = 40
     MENU_SIZE = Vector2(0, 200)
     GAME_ACTIVE = True
     GUI_ACTIVE = True
@@ -342,23 +211,41 @@ class Game:
         self.max_iterations_per_second = self.MAX_GAME_ITERATIONS_PER_SECOND
         self.perform_actions_in_place = self.PERFORM_ACTIONS_IN_PLACE
         self.field_start_mode = self.FIELD_START_MODE
-
-        self.gui_drawer = gui.classes.GUI_Drawer(self.GRID_SIZE, self.GRID_THICKNESS, self.CELL_SIZE, self.MENU_SIZE, self.MENU_LAYOUT, self.MAX_FPS)
-        self.field = Field(self.gui_drawer,
-                           self.field_start_mode,
+        self.engine_type = self.ENGINE_TYPE
+        self.worker_count = self.WORKER_COUNT
+        self.rule = rules.Rule(self.RULE)
+        self.boundary_mode = self.BOUNDARY_MODE
+        self.render_mode = self.RENDER_MODE
+
+        self.gui_drawer = gui.classes.GUI_Drawer(self.GRID_SIZE, self.GRID_THICKNESS, self.CELL_SIZE, self.MENU_SIZE, self.MENU_LAYOUT, self.MAX_FPS,
+                                                 self.VIEW_SIZE if self.render_mode == enums.RenderModes.surface else None,
+                                                 self.CELL_MARGIN)
+        self.field = Field(self.field_start_mode,
                            self.not_empty_cells_percent_approx,
                            self.GRID_SIZE,
-                           self.GRID_THICKNESS,
-                           self.CELL_SIZE,
-                           self.CELL_MARGIN)
+                           self.engine_type,
+                           self.worker_count,
+                           self.rule,
+                           self.boundary_mode)
 
         self.max_iterations_per_second = self.MAX_GAME_ITERATIONS_PER_SECOND
         self.perform_iterations_on_original_field = self.PERFORM_ACTIONS_IN_PLACE
-        self.calcNextIterationTime()
 
         self.shutdown = False
         self.game_active = self.GAME_ACTIVE
         self.gui_active = self.GUI_ACTIVE
+        self.tick_scheduler = TickScheduler(self.max_iterations_per_second, not self.game_active)
+        # set by the simulation thread when it paused itself on a cycle, the GUI then switches GameActive off
+        self.cycle_found = threading.Event()
+        self.__paused_on_cycle: cycle_detector.Cycle | None = None
+        # an unbounded board only hashes its window, see Field.enableCycleDetection
+        if self.STOP_ON_CYCLE and self.boundary_mode != enums.BoundaryModes.unbounded:
+            self.field.enableCycleDetection(self.CYCLE_HISTORY_SIZE)
+        if self.RECORD_HISTORY:
+            self.field.enableHistory(self.HISTORY_SIZE, self.HISTORY_KEYFRAME_INTERVAL)
+        if self.RECORD_METRICS:
+            self.field.enableMetrics(self.METRICS_SIZE, self.METRICS_FILE_PATH)
+        self.__redraw_all_cells = True
 
         self.__frames_passed = 0
         self.__next_fps_update_time = time.time() + 1
@@ -368,6 +255,18 @@ class Game:
         self.__next_ticks_update_time = time.time() + 1
         self._ticks_per_second = round(self.__ticks_passed / self.__next_ticks_update_time)
 
+        self.__paint_state: int | None = None
+        self.__last_painted_cell: tuple[int, int] | None = None
+
+        self.trace_allocations = self.TRACE_ALLOCATIONS
+        self._tick_allocated_blocks = 0
+        self._tick_allocated_bytes = 0
+        if self.trace_allocations:
+            tracemalloc.start()
+
+        self.phase_timer = profiler.PhaseTimer(self.PHASE_SAMPLE_COUNT, self.PROFILE_PHASES)
+        self.profile_capture = profiler.ProfileCapture(self.PROFILE_DIRECTORY)
+
         self.processEvents()
 
 
@@ -387,13 +286,6 @@ class Game:
             self.__next_fps_update_time = time.time() + 1
             return self._fps
 
-    def calcNextIterationTime(self):
-        if self.max_iterations_per_second == 0:
-            self.iterations_interval = math.inf
-        else:
-            self.iterations_interval: float = 1 / self.max_iterations_per_second
-        self.next_iteration_time = time.time() + self.iterations_interval
-
 
     def processEvents(self):
         self.pg_events = pg.event.get()
@@ -407,28 +299,165 @@ class Game:
                     self.game_active = not self.game_active
                 if event.key == 103: # 'g'
                     self.gui_active = not self.gui_active
+                if event.key == pg.K_t:
+                    self.phase_timer.setEnabled(not self.phase_timer.isEnabled())
+                    # the overlay covered cells that are only redrawn when they change
+                    self.__redraw_all_cells = True
+                    self.gui_drawer.markScreenDirty()
+                if event.key == pg.K_p:
+                    self.profile_capture.toggle()
+                if not self.game_active and self.RECORD_HISTORY:
+                    self.processHistoryKey(event.key)
+
+            if self.render_mode == enums.RenderModes.surface:
+                self.processViewportEvent(event)
+
+    def processHistoryKey(self, key: int):
+        first_generation, last_generation = self.field.getHistoryRange()
+        generation = self.field.getEngine().generation
+        match key:
+            case pg.K_COMMA:
+                generation -= 1
+            case pg.K_PERIOD:
+                generation += 1
+            case pg.K_PAGEUP:
+                generation -= self.HISTORY_SCRUB_STEP
+            case pg.K_PAGEDOWN:
+                generation += self.HISTORY_SCRUB_STEP
+            case pg.K_HOME:
+                generation = first_generation
+            case pg.K_END:
+                generation = last_generation
+            case _:
+                return
+
+        with self.field.getLock():
+            self.field.seekGeneration(generation)
+
+    def processViewportEvent(self, event: pg.event.Event):
+        viewport = self.gui_drawer.viewport
+        match event.type:
+            case pg.MOUSEWHEEL:
+                mouse_pos = Vector2(*pg.mouse.get_pos())
+                if viewport.isOnScreen(mouse_pos):
+                    viewport.zoomAt(event.y, mouse_pos)
+            case pg.MOUSEMOTION:
+                if event.buttons[2]:
+                    viewport.pan(*event.rel)
+            case pg.KEYDOWN:
+                match event.key:
+                    case pg.K_LEFT:
+                        viewport.pan(self.PAN_STEP, 0)
+                    case pg.K_RIGHT:
+                        viewport.pan(-self.PAN_STEP, 0)
+                    case pg.K_UP:
+                        viewport.pan(0, self.PAN_STEP)
+                    case pg.K_DOWN:
+                        viewport.pan(0, -self.PAN_STEP)
 
     def processIteration(self):
         self.calcIterationsPerSecond()
         if self.game_active:
-            if self.perform_iterations_on_original_field:
-                processGameIterationInPlace(self.field)
-            else:
-                self.field.processTick()
+            if self.trace_allocations:
+                tracemalloc.reset_peak()
+                traced_before = tracemalloc.get_traced_memory()[0]
+                blocks_before = sys.getallocatedblocks()
+
+            with self.phase_timer.measure("tick"):
+                if self.perform_iterations_on_original_field:
+                    processGameIterationInPlace(self.field)
+                else:
+                    self.field.processTick()
             self.__ticks_passed += 1
 
-    def runGame(self):
-        while not self.shutdown:
-            self.processEvents()
+            if self.trace_allocations:
+                self._tick_allocated_blocks = sys.getallocatedblocks() - blocks_before
+                self._tick_allocated_bytes = tracemalloc.get_traced_memory()[1] - traced_before
 
-            if self.next_iteration_time <= time.time():
+    def runGame(self):
+        """
+        Simulation thread: sleeps until the scheduler says a tick is due, steps and publishes the new generation
+        """
+        while self.tick_scheduler.waitForTick():
+            self.profile_capture.sync("game")
+            with self.field.getLock():
                 self.processIteration()
-                self.calcNextIterationTime()
+                with self.phase_timer.measure("publish"):
+                    self.field.publishGeneration()
+                cycle = self.field.getCycle()
+
+            # a cycle is paused on once, resuming keeps the board cycling until it is edited
+            if cycle is not None and cycle is not self.__paused_on_cycle:
+                self.__paused_on_cycle = cycle
+                self.tick_scheduler.setPaused(True)
+                self.cycle_found.set()
+
+        self.profile_capture.finish("game")
+
+    def getCellUnderMouse(self, mouse_pos: Vector2) -> tuple[int, int] | None:
+        if self.render_mode == enums.RenderModes.surface:
+            viewport = self.gui_drawer.viewport
+            if not viewport.isOnScreen(mouse_pos):
+                return None
+            world_pos = viewport.screenToWorld(mouse_pos)
+            i, j = math.floor(world_pos.y), math.floor(world_pos.x)
+        else:
+            i, j = mouse_pos.y // self.CELL_SIZE.y, mouse_pos.x // self.CELL_SIZE.x
+
+        if 0 <= i < self.GRID_SIZE.y and 0 <= j < self.GRID_SIZE.x:
+            return i, j
+        return None
+
+    def processPainting(self, mouse_click_state, mouse_pos):
+        """
+        A press flips the cell under the mouse, dragging paints that state along the line between mouse samples
+        """
+        if not mouse_click_state[0]:
+            self.__paint_state = None
+            return
+
+        cell = self.getCellUnderMouse(mouse_pos)
+        if cell is None:
+            self.__last_painted_cell = None
+            return
+
+        if self.__paint_state is None:
+            self.__paint_state = 1 - self.field.getEngine().getCellState(*cell)
+            self.__last_painted_cell = None
+
+        with self.field.getLock():
+            self.field.paintCells(bresenhamLine(self.__last_painted_cell or cell, cell), self.__paint_state)
+        self.__last_painted_cell = cell
 
     def processGUICells(self, mouse_click_state, mouse_pos):
-        for line in self.field.getField():
-            for cell in line:
-                cell.update(not self.game_active, mouse_click_state, mouse_pos)
+        if not self.game_active:
+            self.processPainting(mouse_click_state, mouse_pos)
+
+        if self.render_mode == enums.RenderModes.surface:
+            # only the visible part is copied for the view, however big the board is
+            self.field.setPublishRegion(self.gui_drawer.board.getSampledRegion())
+
+        # edits made while the simulation sleeps and viewport moves are published from here,
+        # a running tick is never waited for
+        if self.field.getLock().acquire(blocking=False):
+            try:
+                self.field.publishGeneration()
+            finally:
+                self.field.getLock().release()
+
+        generation = self.field.acquireGeneration()
+        if generation is None:
+            return
+
+        if self.render_mode == enums.RenderModes.surface:
+            self.gui_drawer.drawBoard(generation.grid, *generation.getOrigin())
+            return
+
+        changed = generation.changed
+        if self.__redraw_all_cells:
+            changed = None
+            self.__redraw_all_cells = False
+        self.gui_drawer.drawCells(generation.grid, changed)
 
     def processGUIMenu(self, mouse_click_state, mouse_pos):
         for menu_btn, menu_text in zip(self.gui_drawer.menu.buttons, self.gui_drawer.menu.texts):
@@ -437,6 +466,11 @@ class Game:
 
             match menu_text:
                 case "GameActive":
+                    if self.cycle_found.is_set():
+                        self.cycle_found.clear()
+                        if menu_btn.getState() == enums.CellStates.not_empty:
+                            menu_btn.changeState()
+
                     state = menu_btn.getState()
                     match state:
                         case enums.CellStates.not_empty:
@@ -460,9 +494,8 @@ class Game:
                     state = menu_btn.getState()
                     match state:
                         case enums.CellStates.not_empty:
-                            self.field.is_initializing = True
-                            self.field.initField()
-                            self.field.is_initializing = True
+                            with self.field.getLock():
+                                self.field.refillField()
                             menu_btn.changeState()
 
                         case enums.CellStates.empty:
@@ -499,7 +532,8 @@ class Game:
                     state = menu_btn.getState()
                     match state:
                         case enums.CellStates.not_empty:
-                            self.field.saveField()
+                            with self.field.getLock():
+                                self.field.saveField(self.SAVE_FILE_PATH, self.SAVE_COMPRESSION)
                             menu_btn.changeState()
 
                         case enums.CellStates.empty:
@@ -511,7 +545,8 @@ class Game:
                     state = menu_btn.getState()
                     match state:
                         case enums.CellStates.not_empty:
-                            self.field.loadField()
+                            with self.field.getLock():
+                                self.field.loadField(self.SAVE_FILE_PATH)
                             menu_btn.changeState()
 
                         case enums.CellStates.empty:
@@ -523,7 +558,7 @@ class Game:
                     state = menu_btn.getState()
                     match state:
                         case enums.CellStates.not_empty:
-                            raise NotImplementedError
+                            self.placeGliders()
                             menu_btn.changeState()
 
                         case enums.CellStates.empty:
@@ -535,7 +570,7 @@ class Game:
                     state = menu_btn.getState()
                     match state:
                         case enums.CellStates.not_empty:
-                            raise NotImplementedError
+                            self.placeMirrorer()
                             menu_btn.changeState()
 
                         case enums.CellStates.empty:
@@ -544,22 +579,66 @@ class Game:
                             raise Exception(f"Unacceptable argument: {other}")
 
 
-    def processGUI(self):
+    def placeGliders(self):
+        variants = patterns.PATTERNS["glider"].variants
+        with self.field.getLock():
+            for _ in range(self.PLACE_GLIDER_COUNT):
+                cells = random.choice(variants)
+                self.field.stampPattern(cells,
+                                        random.randint(0, self.GRID_SIZE.y - cells.shape[0]),
+                                        random.randint(0, self.GRID_SIZE.x - cells.shape[1]),
+                                        self.STAMP_MODE)
+
+    def placeMirrorer(self):
+        """
+        Drops a glider and its mirror images across both centre lines of the board, so the four fly symmetrically
+        """
+        cells = random.choice(patterns.PATTERNS["glider"].variants)
+        top = random.randint(0, self.GRID_SIZE.y - cells.shape[0])
+        left = random.randint(0, self.GRID_SIZE.x - cells.shape[1])
+        mirrored_top = self.GRID_SIZE.y - cells.shape[0] - top
+        mirrored_left = self.GRID_SIZE.x - cells.shape[1] - left
+
+        with self.field.getLock():
+            self.field.stampPattern(cells, top, left, self.STAMP_MODE)
+            self.field.stampPattern(np.fliplr(cells), top, mirrored_left, self.STAMP_MODE)
+            self.field.stampPattern(np.flipud(cells), mirrored_top, left, self.STAMP_MODE)
+            self.field.stampPattern(np.flipud(np.fliplr(cells)), mirrored_top, mirrored_left, self.STAMP_MODE)
 
-        self.gui_drawer.clearScreen()
+    def processGUI(self):
+        if self.gui_active:
+            self.gui_drawer.clearMenu()
+            self.gui_drawer.addDirtyRect(self.gui_drawer.getMenuRect())
+        else:
+            self.gui_drawer.clearScreen()
+            self.gui_drawer.markScreenDirty()
+            self.__redraw_all_cells = True
 
         mouse_pos = pg.mouse.get_pos()
         mouse_pos = Vector2(mouse_pos[0], mouse_pos[1])
         mouse_click_state = pg.mouse.get_pressed()
 
-        self.processGUIMenu(mouse_click_state, mouse_pos)
+        with self.phase_timer.measure("menu"):
+            self.processGUIMenu(mouse_click_state, mouse_pos)
 
         if self.gui_active:
-            self.processGUICells(mouse_click_state, mouse_pos)
+            with self.phase_timer.measure("cells"):
+                self.processGUICells(mouse_click_state, mouse_pos)
+
+            with self.phase_timer.measure("grid"):
+                if self.render_mode == enums.RenderModes.surface:
+                    self.gui_drawer.drawGridView()
+                else:
+                    self.gui_drawer.drawGrid()
+                self.gui_drawer.drawMenu()
 
-            self.gui_drawer.drawGrid()
-            self.gui_drawer.drawMenu()
+        with self.phase_timer.measure("text"):
+            self.processGUIText()
+
+        self.__frames_passed += 1
+        self.calcFPS()
 
+    def processGUIText(self):
         text_pos = Vector2(0, self.gui_drawer.screen_size.y - self.gui_drawer.pg_font.get_height())
         self.gui_drawer.renderCurrentStateText('You can draw whatever you want if you stop the game processing',
                                                text_pos)
@@ -574,8 +653,46 @@ class Game:
                            self.gui_drawer.screen_size.y - self.gui_drawer.pg_font.get_height() * 3)
         self.gui_drawer.renderCurrentStateText(f"Max iterations_per_second: {self.max_iterations_per_second}", text_pos)
 
-        self.__frames_passed += 1
-        self.calcFPS()
+        history_range = self.field.getHistoryRange()
+        if history_range is not None and not self.game_active:
+            text_pos = Vector2(0, self.gui_drawer.screen_size.y - self.gui_drawer.pg_font.get_height() * 3)
+            self.gui_drawer.renderCurrentStateText(
+                f"generation {self.field.getEngine().generation} of {history_range[0]}..{history_range[1]}", text_pos)
+
+        self.drawMetrics()
+
+        cycle = self.field.getCycle()
+        if cycle is not None:
+            text_pos = Vector2(0, self.gui_drawer.screen_size.y - self.gui_drawer.pg_font.get_height() * 2)
+            self.gui_drawer.renderCurrentStateText(f"The board is {cycle}", text_pos)
+
+        if self.trace_allocations:
+            text_pos = Vector2(self.gui_drawer.screen_size.x - 400,
+                               self.gui_drawer.screen_size.y - self.gui_drawer.pg_font.get_height() * 4)
+            self.gui_drawer.renderCurrentStateText(f"process alloc during tick: {self._tick_allocated_bytes} B, "
+                                                   f"{self._tick_allocated_blocks} blocks", text_pos)
+
+        if self.phase_timer.isEnabled():
+            self.gui_drawer.drawOverlay(self.phase_timer.getReport(), Vector2(5, 5))
+
+    def drawMetrics(self):
+        """
+        Read without the field lock, a row the simulation thread is writing at the same time only shows for a frame
+        """
+        field_metrics = self.field.getMetrics()
+        if field_metrics is None or field_metrics.getLatest() is None:
+            return
+
+        stats = field_metrics.getLatest()
+        text = f"population {stats.population} +{stats.births} -{stats.deaths}"
+        if stats.bounding_box is not None:
+            top, left, bottom, right = stats.bounding_box
+            text += f" box {right - left}x{bottom - top}"
+        plot_pos = self.gui_drawer.menu_pos + self.POPULATION_PLOT_POS
+        self.gui_drawer.renderCurrentStateText(text, plot_pos - Vector2(0, self.gui_drawer.pg_font.get_height() + 2))
+
+        plot_size = Vector2(self.gui_drawer.screen_size.x - plot_pos.x - 10, self.POPULATION_PLOT_HEIGHT)
+        self.gui_drawer.drawPlot(field_metrics.getColumn("population"), plot_pos, plot_size)
 
     def capFPS(self):
         if not self.game_active or self._ticks_per_second < 5:
@@ -584,47 +701,47 @@ class Game:
             self.gui_drawer.setMaxFPS(self._ticks_per_second + 1)
 
     def runGUI(self):
+        """
+        Main thread: pumps the events and draws the newest published generation
+        """
         while not self.shutdown:
+            self.profile_capture.sync("gui")
+            frame_start_time = time.perf_counter()
+            with self.phase_timer.measure("events"):
+                self.processEvents()
             self.processGUI()
+            self.tick_scheduler.setPaused(not self.game_active or self.cycle_found.is_set())
+            self.tick_scheduler.setTicksPerSecond(self.max_iterations_per_second)
 
             self.capFPS()
 
-            self.gui_drawer.updateScreen()
+            with self.phase_timer.measure("screen"):
+                self.gui_drawer.updateScreen()
+            if self.phase_timer.isEnabled():
+                self.phase_timer.record("frame", time.perf_counter() - frame_start_time)
+
+        self.tick_scheduler.stop()
+        self.profile_capture.finish("gui")
 
-    def runGUI_threaded(self):
-        self.gui_thread = threading.Thread(target=self.runGUI, args=())
-        self.gui_thread.start()
+    def runGame_threaded(self):
+        self.game_thread = threading.Thread(target=self.runGame, args=())
+        self.game_thread.start()
 
     def runStartMenu(self):
         while 1:
             self.gui_drawer.drawStartMenu()
 
-        self.runGUI_threaded()
-        self.runGame()
+        self.runGame_threaded()
+        self.runGUI()
+        self.game_thread.join()
+        self.field.close()
 
-def processGameIterationInPlace(_field: list[list[Cell, ...], ...]):
+def processGameIterationInPlace(_field: Field):
     """
-    Doesnt work properly due to per-line processing
+    Steps the engine between its two preallocated generation buffers,
+    the GUI only redraws the flipped cells
     """
-    raise NotImplementedError
-    for i in range(len(_field)):
-        for j in range(len(_field[0])):
-            cell = _field[i][j]
-            neighbours = getAmountOfNeighbours(_field, i, j)
-
-            if cell.state == classes.CellStates.not_empty:
-                if neighbours == 2 or neighbours == 3:
-                    pass
-                else:
-                    cell.state = classes.CellStates.empty
-                    cell.gui_object.color = gui.classes.Colors.black
-
-            if cell.state == classes.CellStates.empty:
-                if neighbours == 3:
-                    cell.state = classes.CellStates.not_empty
-                    cell.gui_object.color = gui.classes.Colors.purple
-                else:
-                    pass
+    _field.processTickInPlace()
 
 def calcScreenSize(grid_size: Vector2, cell_size: Vector2) -> Vector2:
     return Vector2(grid_size.x * cell_size.x, grid_size.y * cell_size.y)
@@ -0,0 +1,140 @@
+import csv
+import json
+import os
+
+import numpy as np
+
+DEFAULT_CAPACITY = 4096
+METRICS_FIELDS = ("generation", "population", "births", "deaths", "top", "left", "bottom", "right")
+
+
+class GenerationStats:
+    """
+    bounding_box is (top, left, bottom, right) of the alive cells with bottom and right exclusive, None on an empty board
+    """
+    def __init__(self, generation: int, population: int, births: int, deaths: int,
+                 bounding_box: tuple[int, int, int, int] | None):
+        self.generation = generation
+        self.population = population
+        self.births = births
+        self.deaths = deaths
+        self.bounding_box = bounding_box
+
+    def toDict(self) -> dict[str, int | None]:
+        top, left, bottom, right = self.bounding_box if self.bounding_box is not None else (None,) * 4
+        return {"generation": self.generation, "population": self.population, "births": self.births,
+                "deaths": self.deaths, "top": top, "left": left, "bottom": bottom, "right": right}
+
+
+class MetricsSink:
+    """
+    Appends every recorded generation to a .csv or .jsonl file
+    """
+    def __init__(self, path: str):
+        self.path = path
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in (".csv", ".jsonl"):
+            raise Exception(f"Unacceptable metrics file, expected .csv or .jsonl: {path}")
+
+        self.__file = open(path, "w", newline="")
+        self.__csv_writer = None
+        if extension == ".csv":
+            self.__csv_writer = csv.DictWriter(self.__file, METRICS_FIELDS)
+            self.__csv_writer.writeheader()
+
+    def write(self, stats: GenerationStats):
+        if self.__csv_writer is not None:
+            self.__csv_writer.writerow(stats.toDict())
+        else:
+            self.__file.write(json.dumps(stats.toDict()) + "\n")
+
+    def close(self):
+        self.__file.close()
+
+
+class Metrics:
+    """
+    Per-generation population, births, deaths and bounding box taken from the cells a step flipped:
+    the population and the alive cells of every row and column are kept up to date from them,
+    so a generation costs O(flipped cells + height + width) instead of a scan of the board.
+    The last capacity generations are kept in a ring buffer, every one is also written to the sink if there is one
+    """
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, sink: MetricsSink | None = None):
+        self.capacity = capacity
+        self.__sink = sink
+        self.__ring = np.zeros((capacity, len(METRICS_FIELDS)), dtype=np.int64)
+        self.__recorded = 0
+        self.__population = 0
+        self.__row_counts = np.zeros(0, dtype=np.int64)
+        self.__col_counts = np.zeros(0, dtype=np.int64)
+        self.__latest: GenerationStats | None = None
+
+    def reset(self, grid: np.ndarray):
+        """
+        Counts a replaced board once, the ring buffer is kept
+        """
+        self.__row_counts = np.count_nonzero(grid, axis=1).astype(np.int64)
+        self.__col_counts = np.count_nonzero(grid, axis=0).astype(np.int64)
+        self.__population = int(self.__row_counts.sum())
+
+    def __applyChanged(self, changed: tuple[np.ndarray, np.ndarray], states: np.ndarray) -> tuple[int, int]:
+        rows, cols = changed
+        born = states.astype(bool)
+        births = int(np.count_nonzero(born))
+        deaths = len(states) - births
+
+        height, width = len(self.__row_counts), len(self.__col_counts)
+        self.__row_counts += np.bincount(rows[born], minlength=height) - np.bincount(rows[~born], minlength=height)
+        self.__col_counts += np.bincount(cols[born], minlength=width) - np.bincount(cols[~born], minlength=width)
+        self.__population += births - deaths
+        return births, deaths
+
+    def applyEdit(self, changed: tuple[np.ndarray, np.ndarray], states: np.ndarray):
+        """
+        Cells flipped outside of a step, states are their new states. They count for the population only
+        """
+        self.__applyChanged(changed, states)
+
+    def record(self, changed: tuple[np.ndarray, np.ndarray], states: np.ndarray, generation: int) -> GenerationStats:
+        births, deaths = self.__applyChanged(changed, states)
+
+        bounding_box = None
+        if self.__population:
+            alive_rows, alive_cols = np.flatnonzero(self.__row_counts), np.flatnonzero(self.__col_counts)
+            bounding_box = (int(alive_rows[0]), int(alive_cols[0]), int(alive_rows[-1]) + 1, int(alive_cols[-1]) + 1)
+
+        stats = GenerationStats(generation, self.__population, births, deaths, bounding_box)
+        self.__ring[self.__recorded % self.capacity] = [
+            generation, self.__population, births, deaths, *(bounding_box if bounding_box is not None else (-1,) * 4)
+        ]
+        self.__recorded += 1
+        self.__latest = stats
+
+        if self.__sink is not None:
+            self.__sink.write(stats)
+        return stats
+
+    def getLatest(self) -> GenerationStats | None:
+        return self.__latest
+
+    def getPopulation(self) -> int:
+        return self.__population
+
+    def getRecords(self) -> np.ndarray:
+        """
+        The kept generations from the oldest one, a row per generation with the columns of METRICS_FIELDS,
+        -1 in the bounding box columns of an empty board
+        """
+        if self.__recorded <= self.capacity:
+            return self.__ring[:self.__recorded].copy()
+
+        start = self.__recorded % self.capacity
+        return np.concatenate((self.__ring[start:], self.__ring[:start]))
+
+    def getColumn(self, name: str) -> np.ndarray:
+        return self.getRecords()[:, METRICS_FIELDS.index(name)]
+
+    def close(self):
+        if self.__sink is not None:
+            self.__sink.close()
+            self.__sink = None
@@ -0,0 +1,213 @@
+"""
+Community pattern formats, read and written in row chunks so multi-megabyte patterns never become per-cell objects.
+
+RLE: "#" comment lines, a header "x = width, y = height, rule = B3/S23", then runs like "3o2b$" ended by "!".
+Plaintext (.cells): "!" comment lines, then one line per row, "O" is an alive cell and "." an empty one.
+"""
+import os
+import re
+from collections.abc import Iterator
+
+import numpy as np
+
+import enums
+import save_format
+
+RLE_LINE_LENGTH = 70
+
+RLE_HEADER_ITEM = re.compile(r"(\w+)\s*=\s*([^,\s]+)")
+RLE_TOKEN = re.compile(r"(\d*)([^\d\s])")
+
+ALIVE_CHARS = b"O*"
+
+
+def getSaveFormat(path: str) -> enums.SaveFormats.__dict__:
+    match os.path.splitext(path)[1].lower():
+        case ".rle":
+            return enums.SaveFormats.rle
+        case ".cells":
+            return enums.SaveFormats.plaintext
+        case _:
+            return enums.SaveFormats.binary
+
+
+class RleHeader:
+    def __init__(self, width: int, height: int, rule: str | None = None):
+        self.width = width
+        self.height = height
+        self.rule = rule
+
+    def pack(self) -> str:
+        header = f"x = {self.width}, y = {self.height}"
+        if self.rule is not None:
+            header += f", rule = {self.rule}"
+        return header
+
+    @classmethod
+    def unpack(cls, line: str):
+        items = {key.lower(): value for key, value in RLE_HEADER_ITEM.findall(line)}
+        if "x" not in items or "y" not in items:
+            raise Exception(f"Incorrect RLE header: {line.strip()}")
+
+        # Golly appends the bounded grid spec to the rule, e.g. B3/S23:T100,100
+        rule = items["rule"].split(":")[0] if "rule" in items else None
+        return cls(int(items["x"]), int(items["y"]), rule)
+
+
+def readRleHeader(path: str) -> RleHeader:
+    with open(path, "r") as file:
+        return _readRleHeader(file)
+
+
+def _readRleHeader(file) -> RleHeader:
+    for line in file:
+        if line.startswith("#") or not line.strip():
+            continue
+        return RleHeader.unpack(line)
+
+    raise Exception("Incorrect RLE file: no header")
+
+
+def iterRleRows(path: str, rows_per_chunk: int = save_format.DEFAULT_ROWS_PER_CHUNK) -> Iterator[tuple[int, np.ndarray]]:
+    """
+    Yields (first_row_index, rows) chunks of the pattern, a run of n cells is a single slice assignment
+    """
+    with open(path, "r") as file:
+        header = _readRleHeader(file)
+        rows = np.zeros((rows_per_chunk, header.width), dtype=np.uint8)
+        top = 0
+        i = 0
+        j = 0
+
+        pending = ""
+        finished = False
+        while not finished:
+            data = file.read(save_format.READ_SIZE)
+            if not data:
+                break
+            pending += data
+
+            # a run count may be split between two reads, keep it for the next one
+            digits_start = len(pending.rstrip("0123456789"))
+            text, pending = pending[:digits_start], pending[digits_start:]
+
+            for match in RLE_TOKEN.finditer(text):
+                count = int(match[1]) if match[1] else 1
+                tag = match[2]
+
+                if tag == "!":
+                    finished = True
+                    break
+                elif tag == "$":
+                    i += count
+                    j = 0
+                    while i >= rows_per_chunk:
+                        yield top, rows
+                        rows = np.zeros_like(rows)
+                        top += rows_per_chunk
+                        i -= rows_per_chunk
+                elif tag in "b.":
+                    j += count
+                else:
+                    # every state other than empty is alive for a two state board
+                    if j + count > header.width:
+                        raise Exception(f"RLE row {top + i} is wider than the header width {header.width}")
+                    rows[i, j:j + count] = 1
+                    j += count
+
+        yield top, rows[:i + 1]
+
+
+def iterRowRuns(row: np.ndarray) -> Iterator[tuple[int, int]]:
+    """
+    Yields (length, state) runs of a row, without the trailing empty run
+    """
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(row)) + 1))
+    lengths = np.diff(np.append(starts, len(row)))
+    states = row[starts]
+    if len(states) and not states[-1]:
+        lengths, states = lengths[:-1], states[:-1]
+
+    return zip(lengths.tolist(), states.tolist())
+
+
+def formatRun(length: int, tag: str) -> str:
+    return f"{length}{tag}" if length > 1 else tag
+
+
+def writeRle(path: str, width: int, height: int, row_chunks: Iterator[np.ndarray], rule: str | None = None):
+    """
+    row_chunks yields uint8 arrays of consecutive rows, empty rows are merged into the next "$" run
+    """
+    with open(path, "w") as file:
+        file.write(RleHeader(width, height, rule).pack() + "\n")
+
+        line_length = 0
+        skipped_rows = 0
+
+        def writeToken(token: str):
+            nonlocal line_length
+            if line_length + len(token) > RLE_LINE_LENGTH:
+                file.write("\n")
+                line_length = 0
+            file.write(token)
+            line_length += len(token)
+
+        first_row = True
+        for rows in row_chunks:
+            for row in rows:
+                runs = tuple(iterRowRuns(row))
+                if not runs:
+                    skipped_rows += 1
+                    continue
+
+                if not first_row:
+                    writeToken(formatRun(skipped_rows + 1, "$"))
+                elif skipped_rows:
+                    writeToken(formatRun(skipped_rows, "$"))
+                first_row = False
+                skipped_rows = 0
+
+                for length, state in runs:
+                    writeToken(formatRun(length, "o" if state else "b"))
+
+        writeToken("!")
+        file.write("\n")
+
+
+def iterPlaintextRows(path: str, rows_per_chunk: int = save_format.DEFAULT_ROWS_PER_CHUNK) -> Iterator[tuple[int, np.ndarray]]:
+    """
+    Yields (first_row_index, rows) chunks, lines of a chunk are padded to the longest one
+    """
+    with open(path, "rb") as file:
+        top = 0
+        lines = []
+        for line in file:
+            if line.startswith(b"!"):
+                continue
+            lines.append(line.rstrip(b"\r\n"))
+
+            if len(lines) == rows_per_chunk:
+                yield top, parsePlaintextLines(lines)
+                top += len(lines)
+                lines = []
+
+        if lines:
+            yield top, parsePlaintextLines(lines)
+
+
+def parsePlaintextLines(lines: list[bytes]) -> np.ndarray:
+    width = max(len(line) for line in lines)
+    chars = np.frombuffer(b"".join(line.ljust(width, b".") for line in lines), dtype=np.uint8)
+
+    return np.isin(chars, np.frombuffer(ALIVE_CHARS, dtype=np.uint8)).astype(np.uint8).reshape(len(lines), width)
+
+
+def writePlaintext(path: str, row_chunks: Iterator[np.ndarray], name: str | None = None):
+    with open(path, "wb") as file:
+        if name is not None:
+            file.write(f"!Name: {name}\n".encode())
+
+        for rows in row_chunks:
+            chars = np.where(rows, ord("O"), ord(".")).astype(np.uint8)
+            file.write(b"".join(line.tobytes().rstrip(b".") + b"\n" for line in chars))
@@ -0,0 +1,93 @@
+"""
+Named patterns, each precomputed once as a small uint8 bitmask together with its rotation and reflection variants
+"""
+import numpy as np
+
+import pattern_format
+
+GLIDER = """
+.O.
+..O
+OOO
+"""
+
+LWSS = """
+.O..O
+O....
+O...O
+OOOO.
+"""
+
+BLINKER = """
+OOO
+"""
+
+BLOCK = """
+OO
+OO
+"""
+
+R_PENTOMINO = """
+.OO
+OO.
+.O.
+"""
+
+ACORN = """
+.O.....
+...O...
+OO..OOO
+"""
+
+GOSPER_GLIDER_GUN = """
+........................O...........
+......................O.O...........
+............OO......OO............OO
+...........O...O....OO............OO
+OO........O.....O...OO..............
+OO........O...O.OO....O.O...........
+..........O.....O.......O...........
+...........O...O....................
+............OO......................
+"""
+
+
+def parsePlaintext(pattern: str) -> np.ndarray:
+    lines = [line.encode() for line in pattern.strip("\n").splitlines()]
+    return pattern_format.parsePlaintextLines(lines)
+
+
+def getSymmetries(cells: np.ndarray) -> tuple[np.ndarray, ...]:
+    """
+    The distinct results of the 4 rotations of cells and of its mirror image
+    """
+    variants = []
+    for image in (cells, np.fliplr(cells)):
+        for turns in range(4):
+            variant = np.ascontiguousarray(np.rot90(image, turns))
+            if not any(variant.shape == known.shape and np.array_equal(variant, known) for known in variants):
+                variants.append(variant)
+
+    return tuple(variants)
+
+
+class Pattern:
+    def __init__(self, name: str, cells: np.ndarray):
+        self.name = name
+        self.cells = cells
+        self.variants = getSymmetries(cells)
+
+    @classmethod
+    def fromPlaintext(cls, name: str, pattern: str):
+        return cls(name, parsePlaintext(pattern))
+
+
+PATTERNS = {pattern.name: pattern for pattern in (
+    Pattern.fromPlaintext("glider", GLIDER),
+    Pattern.fromPlaintext("lwss", LWSS),
+    Pattern.fromPlaintext("blinker", BLINKER),
+    Pattern.fromPlaintext("block", BLOCK),
+    Pattern.fromPlaintext("r_pentomino", R_PENTOMINO),
+    Pattern.fromPlaintext("acorn", ACORN),
+    Pattern.fromPlaintext("gosper_glider_gun", GOSPER_GLIDER_GUN),
+)}
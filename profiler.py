@@ -0,0 +1,139 @@
+import contextlib
+import cProfile
+import os
+import pstats
+import threading
+import time
+
+import numpy as np
+
+DEFAULT_SAMPLE_COUNT = 512
+PROFILE_SUMMARY_LINES = 20
+
+
+class PhaseTimer:
+    """
+    Wall time of named phases over their last sample_count runs. While disabled measure returns
+    a shared empty context, so the hooks can stay in the loops for good
+    """
+    def __init__(self, sample_count: int = DEFAULT_SAMPLE_COUNT, enabled: bool = False):
+        self.sample_count = sample_count
+        self.__enabled = enabled
+        # the simulation and GUI threads record while the GUI reads the report and toggles the timer
+        self.__lock = threading.Lock()
+        self.__samples: dict[str, np.ndarray] = {}
+        self.__recorded: dict[str, int] = {}
+        self.__disabled_context = contextlib.nullcontext()
+
+    def isEnabled(self) -> bool:
+        return self.__enabled
+
+    def setEnabled(self, enabled: bool):
+        with self.__lock:
+            if enabled and not self.__enabled:
+                self.__samples.clear()
+                self.__recorded.clear()
+            self.__enabled = enabled
+
+    def measure(self, phase: str):
+        if not self.__enabled:
+            return self.__disabled_context
+        return self.__measure(phase)
+
+    @contextlib.contextmanager
+    def __measure(self, phase: str):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start_time)
+
+    def record(self, phase: str, seconds: float):
+        with self.__lock:
+            samples = self.__samples.get(phase)
+            if samples is None:
+                samples = self.__samples[phase] = np.zeros(self.sample_count)
+                self.__recorded[phase] = 0
+
+            samples[self.__recorded[phase] % self.sample_count] = seconds
+            self.__recorded[phase] += 1
+
+    def getPercentiles(self, phase: str, percentiles: tuple[int, ...] = (50, 99)) -> tuple[float, ...]:
+        """
+        Percentiles of the phase in seconds, zeros before it was measured
+        """
+        with self.__lock:
+            samples = self.__samples.get(phase)
+            if samples is None:
+                return (0.0,) * len(percentiles)
+            samples = samples[:min(self.__recorded[phase], self.sample_count)].copy()
+
+        return tuple(float(value) for value in np.percentile(samples, percentiles))
+
+    def getReport(self) -> list[str, ...]:
+        """
+        A line per phase in the order they were first measured: p50 and p99 in milliseconds
+        """
+        lines = []
+        with self.__lock:
+            phases = list(self.__samples)
+        for phase in phases:
+            p50, p99 = self.getPercentiles(phase)
+            lines.append(f"{phase:<8} p50 {p50 * 1000:7.2f} ms  p99 {p99 * 1000:7.2f} ms")
+        return lines
+
+
+class ProfileCapture:
+    """
+    cProfile only sees the thread that enabled it, so every profiled thread calls sync from its loop
+    and starts or stops its own profiler there. A stopped profile is dumped to directory/profile_<name>.prof
+    and summarized on stdout, a thread that sleeps (a paused simulation) dumps once it runs again.
+    Since Python 3.12 cProfile runs on sys.monitoring, which takes a single profiler per process that sees
+    every thread, so only the first thread to sync profiles and the others are skipped until the next capture
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.__capturing = False
+        self.__profiles: dict[str, cProfile.Profile] = {}
+        # threads whose profiler could not be enabled in this capture
+        self.__skipped: set[str] = set()
+        self.__lock = threading.Lock()
+
+    def isCapturing(self) -> bool:
+        return self.__capturing
+
+    def toggle(self):
+        self.__capturing = not self.__capturing
+
+    def sync(self, name: str):
+        with self.__lock:
+            profile = self.__profiles.get(name)
+            skipped = name in self.__skipped
+        if self.__capturing and profile is None and not skipped:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError as error:
+                # another profiler is already active
+                with self.__lock:
+                    self.__skipped.add(name)
+                print(f"{name} thread is not profiled separately: {error}")
+                return
+            with self.__lock:
+                self.__profiles[name] = profile
+        elif not self.__capturing and (profile is not None or skipped):
+            self.finish(name)
+
+    def finish(self, name: str):
+        with self.__lock:
+            profile = self.__profiles.pop(name, None)
+            self.__skipped.discard(name)
+        if profile is None:
+            return
+
+        profile.disable()
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"profile_{name}.prof")
+        profile.dump_stats(path)
+        print(f"{name} thread profile saved to {path}")
+        pstats.Stats(profile).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_SUMMARY_LINES)
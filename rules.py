@@ -0,0 +1,49 @@
+import numpy as np
+
+CONWAY_RULESTRING = "B3/S23"
+
+
+class Rule:
+    """
+    Outer-totalistic rule parsed from a "B36/S23" style rulestring ("S23/B36" and the old "23/36" form work too).
+    Compiled once into a 2x9 next-state table indexed as table[state][amount_of_neighbours]
+    """
+    def __init__(self, rulestring: str = CONWAY_RULESTRING):
+        self.birth, self.survival = self.parseRulestring(rulestring)
+        self.rulestring = f"B{''.join(map(str, self.birth))}/S{''.join(map(str, self.survival))}"
+
+        self.table = np.zeros((2, 9), dtype=np.uint8)
+        self.table[0, list(self.birth)] = 1
+        self.table[1, list(self.survival)] = 1
+        self.flat_table = self.table.ravel()
+
+        self.birth_mask = sum(1 << count for count in self.birth)
+        self.survival_mask = sum(1 << count for count in self.survival)
+
+    @staticmethod
+    def parseRulestring(rulestring: str) -> tuple[tuple[int, ...], tuple[int, ...]]:
+        parts = rulestring.strip().upper().split("/")
+        if len(parts) != 2:
+            raise Exception(f"Incorrect rulestring: {rulestring}")
+
+        if parts[0].startswith("B") or parts[1].startswith("S"):
+            birth, survival = parts
+        else:
+            # "S23/B3" and the letterless "23/3" survival/birth notation
+            survival, birth = parts
+
+        birth = birth.removeprefix("B")
+        survival = survival.removeprefix("S")
+        if not all(c in "012345678" for c in birth + survival):
+            raise Exception(f"Incorrect rulestring: {rulestring}")
+
+        return tuple(sorted({int(c) for c in birth})), tuple(sorted({int(c) for c in survival}))
+
+    def isBirthOnZero(self) -> bool:
+        return 0 in self.birth
+
+    def __str__(self):
+        return self.rulestring
+
+
+CONWAY = Rule(CONWAY_RULESTRING)
@@ -0,0 +1,297 @@
+"""
+Versioned binary save format.
+
+Header (little-endian): magic b"GOLS", version u8, compression u8, reserved u16, width u32, height u32, rows per chunk u32.
+Body: rows bit-packed 8 cells per byte (bit b of byte k holds column k * 8 + b), written and read chunk by chunk,
+the whole body is optionally one zlib or lzma stream.
+"""
+import lzma
+import struct
+import zlib
+from collections.abc import Iterator
+
+import numpy as np
+
+import enums
+
+MAGIC = b"GOLS"
+VERSION = 1
+HEADER_FORMAT = "<4sBBHIII"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+DEFAULT_ROWS_PER_CHUNK = 256
+READ_SIZE = 1 << 20
+
+LEGACY_SAVE_FILE_PATTERN = bytes([1, 1, 1, 0, 0, 1, 0, 0])
+LEGACY_ROW_END = 255
+
+
+class SaveHeader:
+    def __init__(self, width: int, height: int, compression: enums.SaveCompressions.__dict__,
+                 rows_per_chunk: int = DEFAULT_ROWS_PER_CHUNK, version: int = VERSION):
+        self.width = width
+        self.height = height
+        self.compression = compression
+        self.rows_per_chunk = rows_per_chunk
+        self.version = version
+
+    def getRowSize(self) -> int:
+        return (self.width + 7) // 8
+
+    def pack(self) -> bytes:
+        return struct.pack(HEADER_FORMAT, MAGIC, self.version, self.compression.value, 0,
+                           self.width, self.height, self.rows_per_chunk)
+
+    @classmethod
+    def unpack(cls, data: bytes):
+        if len(data) < HEADER_SIZE:
+            raise Exception("Incorrect save file!")
+
+        magic, version, compression, _, width, height, rows_per_chunk = struct.unpack(HEADER_FORMAT, data[:HEADER_SIZE])
+        if magic != MAGIC:
+            raise Exception("Incorrect save file!")
+        if version > VERSION:
+            raise Exception(f"Save file version {version} is newer than supported version {VERSION}")
+
+        return cls(width, height, enums.SaveCompressions(compression), rows_per_chunk, version)
+
+
+def createCompressor(compression: enums.SaveCompressions.__dict__):
+    match compression:
+        case enums.SaveCompressions.none:
+            return None
+        case enums.SaveCompressions.zlib:
+            return zlib.compressobj()
+        case enums.SaveCompressions.lzma:
+            return lzma.LZMACompressor()
+        case other:
+            raise Exception(f"Unacceptable compression: {other}")
+
+
+def createDecompressor(compression: enums.SaveCompressions.__dict__):
+    match compression:
+        case enums.SaveCompressions.none:
+            return None
+        case enums.SaveCompressions.zlib:
+            return zlib.decompressobj()
+        case enums.SaveCompressions.lzma:
+            return lzma.LZMADecompressor()
+        case other:
+            raise Exception(f"Unacceptable compression: {other}")
+
+
+def packRows(rows: np.ndarray) -> bytes:
+    return np.packbits(rows, axis=1, bitorder="little").tobytes()
+
+
+def writeSave(path: str, width: int, height: int, row_chunks: Iterator[np.ndarray],
+              compression: enums.SaveCompressions.__dict__ = enums.SaveCompressions.zlib,
+              rows_per_chunk: int = DEFAULT_ROWS_PER_CHUNK):
+    """
+    row_chunks yields uint8 arrays of consecutive rows, at most rows_per_chunk rows each
+    """
+    header = SaveHeader(width, height, compression, rows_per_chunk)
+    compressor = createCompressor(compression)
+
+    with open(path, "wb") as file:
+        file.write(header.pack())
+        for rows in row_chunks:
+            data = packRows(rows)
+            file.write(compressor.compress(data) if compressor else data)
+        if compressor:
+            file.write(compressor.flush())
+
+
+def readSaveHeader(path: str) -> SaveHeader:
+    with open(path, "rb") as file:
+        return SaveHeader.unpack(file.read(HEADER_SIZE))
+
+
+def _iterBody(file, compression: enums.SaveCompressions.__dict__, max_length: int) -> Iterator[bytes]:
+    """
+    Yields the body of a save from the current position of file, decompressed in pieces of at most max_length bytes
+    """
+    decompressor = createDecompressor(compression)
+    match compression:
+        case enums.SaveCompressions.none:
+            while data := file.read(max_length):
+                yield data
+        case enums.SaveCompressions.zlib:
+            while data := file.read(READ_SIZE):
+                # the input that did not fit into max_length bytes of output is left in unconsumed_tail
+                while data:
+                    yield decompressor.decompress(data, max_length)
+                    data = decompressor.unconsumed_tail
+            yield decompressor.flush()
+        case enums.SaveCompressions.lzma:
+            while not decompressor.eof:
+                # the decompressor keeps the output that did not fit and asks for no input until it is given out
+                data = file.read(READ_SIZE) if decompressor.needs_input else b""
+                if not data and decompressor.needs_input:
+                    return
+                yield decompressor.decompress(data, max_length)
+        case other:
+            raise Exception(f"Unacceptable compression: {other}")
+
+
+def iterSaveRows(path: str) -> Iterator[tuple[int, np.ndarray]]:
+    """
+    Yields (first_row_index, rows) chunks of the saved board, at most rows_per_chunk of the header rows each,
+    without reading or decompressing the whole file into memory
+    """
+    with open(path, "rb") as file:
+        header = SaveHeader.unpack(file.read(HEADER_SIZE))
+        row_size = header.getRowSize()
+        rows_per_chunk = max(header.rows_per_chunk, 1)
+        pieces = _iterBody(file, header.compression, rows_per_chunk * row_size)
+
+        pending = bytearray()
+        row_index = 0
+        while row_index < header.height:
+            chunk_rows = min(rows_per_chunk, header.height - row_index)
+            if len(pending) < chunk_rows * row_size:
+                piece = next(pieces, None)
+                if piece is None:
+                    raise Exception("Save file is corrupted: board data ends early")
+                pending += piece
+                continue
+
+            packed = np.frombuffer(bytes(pending[:chunk_rows * row_size]), dtype=np.uint8).reshape(chunk_rows, row_size)
+            del pending[:chunk_rows * row_size]
+
+            yield row_index, np.unpackbits(packed, axis=1, bitorder="little")[:, :header.width]
+            row_index += chunk_rows
+
+
+def isLegacySave(path: str) -> bool:
+    with open(path, "rb") as file:
+        return file.read(len(LEGACY_SAVE_FILE_PATTERN)) == LEGACY_SAVE_FILE_PATTERN
+
+
+def iterLegacySaveRows(path: str) -> Iterator[tuple[int, np.ndarray]]:
+    """
+    Reads the old one-byte-per-cell format, where every row is terminated by a 255 byte
+    """
+    with open(path, "rb") as file:
+        if file.read(len(LEGACY_SAVE_FILE_PATTERN)) != LEGACY_SAVE_FILE_PATTERN:
+            raise Exception("Incorrect save file!")
+
+        pending = bytearray()
+        row_index = 0
+        while data := file.read(READ_SIZE):
+            pending += data
+            while (row_end := pending.find(LEGACY_ROW_END)) != -1:
+                yield row_index, np.frombuffer(bytes(pending[:row_end]), dtype=np.uint8).reshape(1, -1)
+                del pending[:row_end + 1]
+                row_index += 1
+
+
+def loadGrid(path: str, height: int, width: int) -> np.ndarray:
+    """
+    Reads a save file of any supported format into a height x width board,
+    a bigger saved board is cropped and a smaller one is padded with empty cells
+    """
+    row_chunks = iterLegacySaveRows(path) if isLegacySave(path) else iterSaveRows(path)
+
+    return fillGrid(row_chunks, height, width)
+
+
+def fillGrid(row_chunks: Iterator[tuple[int, np.ndarray]], height: int, width: int) -> np.ndarray:
+    """
+    Places (first_row_index, rows) chunks into an empty height x width board, cropping what does not fit
+    """
+    grid = np.zeros((height, width), dtype=np.uint8)
+
+    for top, rows in row_chunks:
+        if top >= height:
+            break
+        rows = rows[:height - top, :width]
+        grid[top:top + rows.shape[0], :rows.shape[1]] = rows
+
+    return grid
+
+
+# Memory-mapped snapshots: a 64 byte header followed by the board as uint8 cells, including the one cell halo
+# the engines keep around it, so the mapping can be used as an engine generation buffer without copying
+SNAPSHOT_MAGIC = b"GOLM"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER_FORMAT = "<4sBxxxIIQ"
+SNAPSHOT_HEADER_SIZE = 64
+
+
+class SnapshotHeader:
+    def __init__(self, width: int, height: int, generation: int = 0, version: int = SNAPSHOT_VERSION):
+        self.width = width
+        self.height = height
+        self.generation = generation
+        self.version = version
+
+    def getBoardShape(self) -> tuple[int, int]:
+        return self.height + 2, self.width + 2
+
+    def packInto(self, buffer):
+        struct.pack_into(SNAPSHOT_HEADER_FORMAT, buffer, 0, SNAPSHOT_MAGIC, self.version,
+                         self.width, self.height, self.generation)
+
+    @classmethod
+    def unpack(cls, data: bytes):
+        if len(data) < SNAPSHOT_HEADER_SIZE:
+            raise Exception("Incorrect snapshot file!")
+
+        magic, version, width, height, generation = struct.unpack_from(SNAPSHOT_HEADER_FORMAT, data)
+        if magic != SNAPSHOT_MAGIC:
+            raise Exception("Incorrect snapshot file!")
+        if version > SNAPSHOT_VERSION:
+            raise Exception(f"Snapshot version {version} is newer than supported version {SNAPSHOT_VERSION}")
+
+        return cls(width, height, generation, version)
+
+
+class Snapshot:
+    """
+    Writable mapping of a snapshot file, board is the (height + 2) x (width + 2) padded view into it
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            self.header = SnapshotHeader.unpack(file.read(SNAPSHOT_HEADER_SIZE))
+
+        self.__file_map = np.memmap(path, dtype=np.uint8, mode="r+")
+        board_size = self.header.getBoardShape()[0] * self.header.getBoardShape()[1]
+        if len(self.__file_map) < SNAPSHOT_HEADER_SIZE + board_size:
+            raise Exception("Snapshot file is corrupted: board data ends early")
+
+        self.board = self.__file_map[SNAPSHOT_HEADER_SIZE:SNAPSHOT_HEADER_SIZE + board_size].reshape(self.header.getBoardShape())
+
+    def setGeneration(self, generation: int):
+        self.header.generation = generation
+        self.header.packInto(self.__file_map)
+
+    def flush(self):
+        self.__file_map.flush()
+
+    def close(self):
+        self.flush()
+        self.board = None
+        self.__file_map = None
+
+
+def createSnapshot(path: str, width: int, height: int, row_chunks: Iterator[tuple[int, np.ndarray]] = (),
+                   generation: int = 0) -> Snapshot:
+    """
+    Creates a sparse file of the right size, writes the given (first_row_index, rows) chunks into it and maps it
+    """
+    header = SnapshotHeader(width, height, generation)
+    board_shape = header.getBoardShape()
+
+    with open(path, "wb") as file:
+        header_data = bytearray(SNAPSHOT_HEADER_SIZE)
+        header.packInto(header_data)
+        file.write(header_data)
+        file.truncate(SNAPSHOT_HEADER_SIZE + board_shape[0] * board_shape[1])
+
+    snapshot = Snapshot(path)
+    for top, rows in row_chunks:
+        snapshot.board[top + 1:top + 1 + rows.shape[0], 1:1 + rows.shape[1]] = rows
+    snapshot.flush()
+
+    return snapshot
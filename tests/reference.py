@@ -0,0 +1,132 @@
+"""
+Cell by cell implementation of a generation, slow and obvious, that the engines are checked against,
+and the boards the tests start from
+"""
+import numpy as np
+
+from engines.base import Engine
+import enums
+from field import Field
+import rules
+from utils import Vector2
+
+
+def _getNeighbour(grid: np.ndarray, i: int, j: int, boundary_mode: enums.BoundaryModes.__dict__) -> int:
+    height, width = grid.shape
+    match boundary_mode:
+        case enums.BoundaryModes.dead:
+            if 0 <= i < height and 0 <= j < width:
+                return int(grid[i, j])
+            return 0
+        case enums.BoundaryModes.toroidal:
+            return int(grid[i % height, j % width])
+        case enums.BoundaryModes.mirror:
+            # the cell behind an edge is the edge cell itself
+            return int(grid[min(max(i, 0), height - 1), min(max(j, 0), width - 1)])
+        case other:
+            raise Exception(f"Unacceptable boundary mode: {other}")
+
+
+def stepGrid(grid: np.ndarray, rule: rules.Rule = rules.CONWAY,
+             boundary_mode: enums.BoundaryModes.__dict__ = enums.BoundaryModes.dead) -> np.ndarray:
+    next_grid = np.zeros_like(grid)
+    for i, j in np.ndindex(grid.shape):
+        amount_of_neighbours = sum(_getNeighbour(grid, i + di, j + dj, boundary_mode)
+                                   for di in (-1, 0, 1) for dj in (-1, 0, 1) if di or dj)
+        if grid[i, j]:
+            next_grid[i, j] = amount_of_neighbours in rule.survival
+        else:
+            next_grid[i, j] = amount_of_neighbours in rule.birth
+    return next_grid
+
+
+def advanceUnbounded(grid: np.ndarray, generations: int, rule: rules.Rule = rules.CONWAY) -> np.ndarray:
+    """
+    The window of an unbounded universe after generations: nothing travels faster than a cell per generation,
+    so a dead boundary that far away from the window does not change it
+    """
+    margin = generations + 1
+    universe = np.pad(grid, margin)
+    for _ in range(generations):
+        universe = stepGrid(universe, rule)
+    return universe[margin:-margin, margin:-margin]
+
+
+def getGenerations(grid: np.ndarray, generations: int, rule: rules.Rule = rules.CONWAY,
+                   boundary_mode: enums.BoundaryModes.__dict__ = enums.BoundaryModes.dead) -> list[np.ndarray]:
+    grids = [grid]
+    for _ in range(generations):
+        grids.append(stepGrid(grids[-1], rule, boundary_mode))
+    return grids
+
+
+def checkSteps(engine: Engine, grids: list[np.ndarray]):
+    """
+    Starts engine from grids[0], checks every following board and the cells step reports as flipped
+    """
+    engine.setGrid(grids[0])
+    generation = engine.generation
+    for expected, previous in zip(grids[1:], grids):
+        rows, cols = engine.step()
+        np.testing.assert_array_equal(engine.getGrid(), expected)
+
+        flipped = np.zeros_like(expected)
+        flipped[rows, cols] = 1
+        np.testing.assert_array_equal(flipped, expected ^ previous)
+
+    assert engine.generation == generation + len(grids) - 1
+    assert engine.getPopulation() == int(grids[-1].sum())
+
+
+def checkCellAccess(engine: Engine, grid: np.ndarray):
+    """
+    Edits engine through setCellState and setRegion and reads it back through every accessor,
+    the same edits are made on a copy of grid
+    """
+    height, width = grid.shape
+    grid = grid.copy()
+    engine.setGrid(grid)
+
+    engine.setCellState(3, width - 5, 1)
+    engine.setCellState(4, 0, 0)
+    block = getRandomGrid(5, 9, seed=6)
+    engine.setRegion(height - 10, width - 10, block)
+    grid[3, width - 5] = 1
+    grid[4, 0] = 0
+    grid[height - 10:height - 5, width - 10:width - 1] = block
+
+    np.testing.assert_array_equal(engine.getGrid(), grid)
+    np.testing.assert_array_equal(engine.getRows(8, 12), grid[8:12])
+    np.testing.assert_array_equal(engine.getRows(height - 4, height + 5), grid[height - 4:])
+    assert engine.getCellState(3, width - 5) == 1
+    rows, cols = np.array([3, 4, height - 8]), np.array([width - 5, 0, width - 9])
+    np.testing.assert_array_equal(engine.getCellStates(rows, cols), grid[rows, cols])
+    rows, cols = np.nonzero(np.ones_like(grid))
+    np.testing.assert_array_equal(engine.getCellStates(rows, cols), grid[rows, cols])
+    assert engine.getPopulation() == int(grid.sum())
+
+
+def getRandomGrid(height: int, width: int, seed: int, density: float = 0.35) -> np.ndarray:
+    return (np.random.default_rng(seed).random((height, width)) < density).astype(np.uint8)
+
+
+def iterRowChunks(grid: np.ndarray, rows_per_chunk: int):
+    for top in range(0, grid.shape[0], rows_per_chunk):
+        yield grid[top:top + rows_per_chunk]
+
+
+def createField(width: int = 40, height: int = 30, **kwargs) -> Field:
+    field = Field(enums.FieldStartModes.empty_field, 0, Vector2(width, height), **kwargs)
+    field.getEngine().setGrid(getRandomGrid(height, width, seed=20))
+    return field
+
+
+def recordGenerations(field: Field, generations: int) -> list[np.ndarray]:
+    """
+    Ticks the field, returns copies of the board from the current generation on
+    """
+    grids = [field.getEngine().getGrid().copy()]
+    for _ in range(generations):
+        field.processTick()
+        grids.append(field.getEngine().getGrid().copy())
+    return grids
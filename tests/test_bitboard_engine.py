@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from engines.bitboard_engine import BitboardEngine, WORD_BITS, packGrid, unpackGrid
+import enums
+import rules
+from utils import Vector2
+
+import reference
+
+HEIGHT = 20
+
+
+@pytest.mark.parametrize("width", (1, 63, 64, 65, 130))
+def testPackRoundTrip(width):
+    grid = reference.getRandomGrid(HEIGHT, width, seed=9)
+    words = packGrid(grid)
+
+    assert words.shape == (HEIGHT, -(-width // WORD_BITS))
+    assert int(words[3, 0]) & 1 == grid[3, 0]
+    np.testing.assert_array_equal(unpackGrid(words, width), grid)
+
+
+@pytest.mark.parametrize("width", (63, 64, 70))
+def testMatchesReference(width):
+    engine = BitboardEngine(Vector2(width, HEIGHT))
+    reference.checkSteps(engine, reference.getGenerations(reference.getRandomGrid(HEIGHT, width, seed=1), 6))
+
+
+@pytest.mark.parametrize("boundary_mode", (enums.BoundaryModes.dead, enums.BoundaryModes.toroidal),
+                         ids=lambda mode: mode.name)
+def testBitsPastTheLastColumnStayEmpty(boundary_mode):
+    # every dead cell is born under B0/S8, including the padding bits if they were not masked
+    engine = BitboardEngine(Vector2(70, HEIGHT), rules.Rule("B0/S8"), boundary_mode)
+    engine.step()
+
+    assert engine.getPopulation() == 70 * HEIGHT
+    np.testing.assert_array_equal(engine.getWords()[:, -1], np.uint64((1 << (70 - WORD_BITS)) - 1))
+
+
+def testAdvanceMatchesSteps():
+    grids = reference.getGenerations(reference.getRandomGrid(HEIGHT, 70, seed=1), 6)
+    engine = BitboardEngine(Vector2(70, HEIGHT))
+    engine.setGrid(grids[0])
+
+    rows, cols = engine.advance(6)
+    np.testing.assert_array_equal(engine.getGrid(), grids[-1])
+    np.testing.assert_array_equal(np.nonzero(grids[0] != grids[-1]), (rows, cols))
+
+
+def testCellAccess():
+    reference.checkCellAccess(BitboardEngine(Vector2(70, HEIGHT)), reference.getRandomGrid(HEIGHT, 70, seed=5))
@@ -0,0 +1,58 @@
+import functools
+
+import numpy as np
+import pytest
+
+import engines
+import enums
+import patterns
+import rules
+from utils import Vector2
+
+import reference
+
+HEIGHT = 20
+# wider than a bitboard word and not a multiple of a tile, so partial words and tiles are covered
+WIDTH = 70
+
+ENGINE_FACTORIES = {
+    "numpy": engines.numpy_engine.NumpyEngine,
+    "bitboard": engines.bitboard_engine.BitboardEngine,
+    "tiled": engines.tiled_engine.TiledEngine,
+    "small_tiles": functools.partial(engines.tiled_engine.TiledEngine, tile_size=4),
+}
+BOUNDARY_MODES = (enums.BoundaryModes.dead, enums.BoundaryModes.toroidal, enums.BoundaryModes.mirror)
+
+
+@functools.lru_cache
+def getReferenceGenerations(boundary_mode: enums.BoundaryModes.__dict__) -> list[np.ndarray]:
+    return reference.getGenerations(reference.getRandomGrid(HEIGHT, WIDTH, seed=1), 6, rules.CONWAY, boundary_mode)
+
+
+@pytest.mark.parametrize("engine_name", ENGINE_FACTORIES)
+@pytest.mark.parametrize("boundary_mode", BOUNDARY_MODES, ids=lambda mode: mode.name)
+def testBoundaryModeMatchesReference(engine_name, boundary_mode):
+    engine = ENGINE_FACTORIES[engine_name](Vector2(WIDTH, HEIGHT), rules.CONWAY, boundary_mode)
+    reference.checkSteps(engine, getReferenceGenerations(boundary_mode))
+
+
+@pytest.mark.parametrize("engine_name", ENGINE_FACTORIES)
+def testGliderCrossesToroidalEdges(engine_name):
+    grid = np.zeros((10, 10), dtype=np.uint8)
+    grid[7:10, 7:10] = patterns.PATTERNS["glider"].cells
+    engine = ENGINE_FACTORIES[engine_name](Vector2(10, 10), rules.CONWAY, enums.BoundaryModes.toroidal)
+    engine.setGrid(grid)
+
+    # a glider moves a cell diagonally every 4 generations, so it is back after crossing the whole board
+    engine.advance(4 * 10)
+    np.testing.assert_array_equal(engine.getGrid(), grid)
+    assert engine.getPopulation() == 5
+
+
+def testEnginesRefuseUnsupportedModes():
+    with pytest.raises(Exception, match="does not support boundary mode"):
+        engines.numpy_engine.NumpyEngine(Vector2(8, 8), rules.CONWAY, enums.BoundaryModes.unbounded)
+    with pytest.raises(Exception, match="does not support boundary mode"):
+        engines.hashlife_engine.HashLifeEngine(Vector2(8, 8), rules.CONWAY, enums.BoundaryModes.toroidal)
+    with pytest.raises(Exception, match="does not support boundary mode"):
+        engines.sparse_engine.SparseEngine(Vector2(8, 8), rules.CONWAY, enums.BoundaryModes.dead)
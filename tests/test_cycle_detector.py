@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from cycle_detector import CycleDetector
+import enums
+from field import Field
+import patterns
+from utils import Vector2
+
+from reference import recordGenerations
+
+
+def createOscillatorField() -> Field:
+    field = Field(enums.FieldStartModes.empty_field, 0, Vector2(20, 20))
+    field.stampPattern(patterns.PATTERNS["blinker"].cells, 5, 5)
+    field.stampPattern(patterns.PATTERNS["block"].cells, 12, 12)
+    return field
+
+
+@pytest.mark.parametrize("check_interval", (1, 64))
+def testCycleDetection(check_interval):
+    field = createOscillatorField()
+    field.enableCycleDetection(check_interval=check_interval)
+    field.advance(1000)
+
+    cycle = field.getCycle()
+    assert cycle is not None and cycle.period == 2
+    assert field.getEngine().generation < 1000
+
+
+@pytest.mark.parametrize("generations", (64, 65, 128))
+def testChunkedCycleDetectionEndsAtTheRequestedGeneration(generations):
+    field = createOscillatorField()
+    expected = recordGenerations(createOscillatorField(), 64)[-1]
+    field.enableCycleDetection(check_interval=64)
+    field.advance(generations)
+
+    assert field.getCycle().period == 2
+    assert field.getEngine().generation == 64
+    np.testing.assert_array_equal(field.getEngine().getGrid(), expected)
+
+
+def testCycleDetectionRefusesUnboundedBoards():
+    field = Field(enums.FieldStartModes.empty_field, 0, Vector2(20, 20), engine_type=enums.EngineTypes.sparse,
+                  boundary_mode=enums.BoundaryModes.unbounded)
+    with pytest.raises(Exception):
+        field.enableCycleDetection()
+
+
+def testHashFollowsFlippedCells():
+    grid = np.zeros((16, 16), dtype=np.uint8)
+    detector = CycleDetector(16)
+    detector.reset(grid, 0)
+    empty_hash = detector.getHash()
+
+    assert detector.update((np.array([1, 2]), np.array([3, 4])), 1) is None
+    assert detector.getHash() != empty_hash
+    cycle = detector.update((np.array([2, 1]), np.array([4, 3])), 2)
+    assert (cycle.start_generation, cycle.period) == (0, 2)
+    assert detector.getHash() == empty_hash
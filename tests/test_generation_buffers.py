@@ -0,0 +1,115 @@
+import threading
+
+import numpy as np
+import pytest
+
+import generation_buffers
+from generation_buffers import GenerationBuffers
+
+
+def getChangedCells(generation: generation_buffers.Generation) -> set[tuple[int, int]]:
+    return set(zip(*(indices.tolist() for indices in generation.changed)))
+
+
+def testFirstPublishChangesEverything():
+    buffers = GenerationBuffers()
+    assert buffers.acquire() is None
+
+    buffers.publish(np.ones((4, 5), dtype=np.uint8), 1)
+    generation = buffers.acquire()
+    assert generation.generation == 1 and generation.changed is None
+    np.testing.assert_array_equal(generation.grid, 1)
+
+
+def testChangesAreReportedOnce():
+    buffers = GenerationBuffers()
+    grid = np.zeros((4, 5), dtype=np.uint8)
+    buffers.publish(grid, 0)
+    buffers.acquire()
+
+    grid[1, 2] = 1
+    buffers.addChanged((np.array([1]), np.array([2])))
+    buffers.publish(grid, 1)
+    assert not buffers.isFrontTaken()
+    assert getChangedCells(buffers.acquire()) == {(1, 2)}
+    assert buffers.isFrontTaken()
+
+    generation = buffers.acquire()
+    assert generation.generation == 1 and getChangedCells(generation) == set()
+
+
+def testSkippedGenerationKeepsItsChanges():
+    buffers = GenerationBuffers()
+    grid = np.zeros((4, 5), dtype=np.uint8)
+    buffers.publish(grid, 0)
+    buffers.acquire()
+
+    buffers.addChanged((np.array([0]), np.array([0])))
+    buffers.publish(grid, 1)
+    buffers.addChanged((np.array([3]), np.array([4])))
+    buffers.publish(grid, 2)
+
+    generation = buffers.acquire()
+    assert generation.generation == 2 and getChangedCells(generation) == {(0, 0), (3, 4)}
+
+
+def testTooManyChangeBatchesChangeEverything():
+    buffers = GenerationBuffers()
+    grid = np.zeros((4, 5), dtype=np.uint8)
+    buffers.publish(grid, 0)
+    buffers.acquire()
+
+    for _ in range(generation_buffers.MAX_PENDING_CHANGES + 1):
+        buffers.addChanged((np.array([0]), np.array([0])))
+    buffers.publish(grid, 1)
+    assert buffers.acquire().changed is None
+
+
+def testHeldGridIsNotOverwritten():
+    buffers = GenerationBuffers()
+    buffers.publish(np.zeros((4, 5), dtype=np.uint8), 0)
+    held = buffers.acquire()
+
+    for generation in range(1, 5):
+        buffers.publish(np.full((4, 5), generation, dtype=np.uint8), generation)
+    np.testing.assert_array_equal(held.grid, 0)
+    with pytest.raises(ValueError):
+        held.grid[0, 0] = 1
+    np.testing.assert_array_equal(buffers.acquire().grid, 4)
+
+
+def testRegionChangeChangesEverything():
+    buffers = GenerationBuffers()
+    buffers.publish(np.zeros((4, 5), dtype=np.uint8), 0, (0, 0, 8, 10, 2))
+    buffers.acquire()
+
+    buffers.addChanged((np.array([1]), np.array([1])))
+    buffers.publish(np.zeros((2, 3), dtype=np.uint8), 1, (4, 6, 8, 12, 2))
+    generation = buffers.acquire()
+    assert generation.changed is None
+    assert generation.getOrigin() == (4, 6, 2)
+    assert generation.grid.shape == (2, 3)
+    assert buffers.getPublishedRegion() == (4, 6, 8, 12, 2)
+
+
+def testReaderNeverSeesTornGenerations():
+    buffers = GenerationBuffers()
+    generations = 2000
+
+    def publishGenerations():
+        grid = np.zeros((64, 64), dtype=np.uint8)
+        for generation in range(1, generations + 1):
+            grid.fill(generation % 256)
+            buffers.publish(grid, generation)
+
+    writer = threading.Thread(target=publishGenerations)
+    writer.start()
+    last_generation = 0
+    while last_generation < generations:
+        generation = buffers.acquire()
+        if generation is None:
+            continue
+        assert generation.generation >= last_generation
+        np.testing.assert_array_equal(generation.grid, generation.generation % 256)
+        last_generation = generation.generation
+    writer.join()
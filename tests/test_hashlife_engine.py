@@ -0,0 +1,72 @@
+import numpy as np
+
+from engines.hashlife_engine import HashLifeEngine
+import enums
+import patterns
+from utils import Vector2
+
+import reference
+from reference import createField
+
+
+def testMatchesReference():
+    grid = reference.getRandomGrid(16, 24, seed=2)
+    engine = HashLifeEngine(Vector2(24, 16))
+    reference.checkSteps(engine, [reference.advanceUnbounded(grid, generations) for generations in range(4)])
+
+
+def testAdvanceMatchesReference():
+    grid = reference.getRandomGrid(16, 24, seed=2)
+    engine = HashLifeEngine(Vector2(24, 16))
+    engine.setGrid(grid)
+
+    rows, cols = engine.advance(7)
+    expected = reference.advanceUnbounded(grid, 7)
+    np.testing.assert_array_equal(engine.getGrid(), expected)
+    np.testing.assert_array_equal(np.nonzero(grid != expected), (rows, cols))
+    assert engine.generation == 7
+
+
+def testGliderKeepsEvolvingOutsideWindow():
+    engine = HashLifeEngine(Vector2(16, 16))
+    engine.setRegion(0, 0, patterns.PATTERNS["glider"].cells)
+
+    engine.advance(1000)
+    assert engine.getPopulation() == 0
+    assert engine.getUniversePopulation() == 5
+    assert engine.generation == 1000
+
+    engine.setCellState(-5, -7, 1)
+    assert engine.getCellState(-5, -7) == 1
+    assert engine.getPopulation() == 0
+    assert engine.getUniversePopulation() == 6
+
+
+def testNodeTableStaysBounded():
+    grid = reference.getRandomGrid(48, 48, seed=4)
+    limited = HashLifeEngine(Vector2(48, 48), max_nodes=2000)
+    unlimited = HashLifeEngine(Vector2(48, 48))
+    limited.setGrid(grid)
+    unlimited.setGrid(grid)
+
+    for _ in range(20):
+        limited.advance(64)
+        assert limited.getNodeCount() <= 2 * limited.max_nodes
+    unlimited.advance(20 * 64)
+
+    np.testing.assert_array_equal(limited.getGrid(), unlimited.getGrid())
+    assert limited.getUniversePopulation() == unlimited.getUniversePopulation()
+
+
+def testCellAccess():
+    reference.checkCellAccess(HashLifeEngine(Vector2(70, 20)), reference.getRandomGrid(20, 70, seed=5))
+
+
+def testFieldAdvancesWithHashLife():
+    field = createField(24, 16, engine_type=enums.EngineTypes.hashlife, boundary_mode=enums.BoundaryModes.unbounded)
+    grid = field.getEngine().getGrid().copy()
+
+    field.advance(9)
+    np.testing.assert_array_equal(field.getEngine().getGrid(), reference.advanceUnbounded(grid, 9))
+    assert field.getEngine().generation == 9
+    field.close()
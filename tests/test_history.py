@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from history import History
+
+from reference import createField, recordGenerations
+
+
+def testHistoryRewind():
+    field = createField()
+    field.enableHistory(capacity=100, keyframe_interval=8)
+    grids = recordGenerations(field, 60)
+    assert field.getHistoryRange() == (0, 60)
+
+    for generation in (59, 31, 0, 17, 18, 16, 60, 45):
+        field.seekGeneration(generation)
+        assert field.getEngine().generation == generation
+        np.testing.assert_array_equal(field.getEngine().getGrid(), grids[generation])
+
+
+def testHistoryDropsOldGenerations():
+    field = createField()
+    field.enableHistory(capacity=20, keyframe_interval=4)
+    grids = recordGenerations(field, 100)
+
+    first_generation, last_generation = field.getHistoryRange()
+    assert last_generation == 100
+    assert 100 - first_generation >= 20
+
+    field.seekGeneration(0)
+    assert field.getEngine().generation == first_generation
+    np.testing.assert_array_equal(field.getEngine().getGrid(), grids[first_generation])
+
+
+def testHistoryIsBoundedByBytes():
+    grids = recordGenerations(createField(200, 200), 200)
+    history = History(capacity=1000, keyframe_interval=64, max_bytes=200_000)
+    history.reset(grids[0], 0)
+    for generation in range(1, 201):
+        history.record(np.nonzero(grids[generation] != grids[generation - 1]), generation)
+        if history.needsKeyframe(generation):
+            history.addKeyframe(grids[generation], generation)
+        assert history.getByteCount() <= 200_000 * 1.5
+
+    first_generation, last_generation = history.getRange()
+    assert last_generation == 200 and first_generation > 0
+    np.testing.assert_array_equal(history.getGrid(first_generation), grids[first_generation])
+    np.testing.assert_array_equal(history.getGrid(last_generation - 1), grids[last_generation - 1])
+
+
+def testSteppingAfterRewindForgetsTheFuture():
+    field = createField()
+    field.enableHistory(capacity=100, keyframe_interval=8)
+    grids = recordGenerations(field, 30)
+
+    field.seekGeneration(10)
+    field.paintCells([(0, 0), (0, 1), (1, 0)], 1)
+    field.processTick()
+    assert field.getHistoryRange() == (0, 11)
+
+    field.seekGeneration(10)
+    expected = grids[10].copy()
+    expected[[0, 0, 1], [0, 1, 0]] = 1
+    np.testing.assert_array_equal(field.getEngine().getGrid(), expected)
+
+
+@pytest.mark.parametrize("edit_generation", (8, 9))
+def testEditDoesNotLeakIntoEarlierGenerations(edit_generation):
+    field = createField()
+    field.enableHistory(capacity=100, keyframe_interval=8)
+    grids = recordGenerations(field, edit_generation)
+    field.paintCells([(0, 0), (0, 1), (1, 1), (5, 5)], 1)
+    field.stampPattern(np.ones((2, 2), dtype=np.uint8), 20, 20)
+    grids[edit_generation] = field.getEngine().getGrid().copy()
+    grids += recordGenerations(field, 3)[1:]
+
+    # at a keyframe generation the keyframe is nearer than the previous generation
+    for generation in (edit_generation, edit_generation - 1, 0, edit_generation, edit_generation + 3,
+                       edit_generation, edit_generation - 2):
+        field.seekGeneration(generation)
+        np.testing.assert_array_equal(field.getEngine().getGrid(), grids[generation])
+
+
+def testHistoryAdvance():
+    field = createField()
+    field.enableHistory(capacity=100, keyframe_interval=8)
+    grids = recordGenerations(createField(), 25)
+
+    field.advance(25)
+    field.seekGeneration(7)
+    np.testing.assert_array_equal(field.getEngine().getGrid(), grids[7])
+
+
+def testIncorrectHistorySize():
+    with pytest.raises(Exception):
+        History(capacity=0)
+    with pytest.raises(Exception):
+        History(max_bytes=0)
@@ -0,0 +1,84 @@
+import csv
+import json
+
+import numpy as np
+import pytest
+
+import enums
+from field import Field
+import metrics
+import patterns
+from utils import Vector2
+
+from reference import createField, recordGenerations
+
+
+def getExpectedStats(previous: np.ndarray, grid: np.ndarray) -> tuple[int, int, int, tuple[int, int, int, int]]:
+    rows, cols = np.nonzero(grid)
+    bounding_box = (int(rows.min()), int(cols.min()), int(rows.max()) + 1, int(cols.max()) + 1)
+    return int(grid.sum()), int((grid & ~previous).sum()), int((previous & ~grid).sum()), bounding_box
+
+
+@pytest.mark.parametrize("engine_type", (enums.EngineTypes.numpy, enums.EngineTypes.bitboard), ids=lambda engine_type: engine_type.name)
+def testMetricsMatchBoard(engine_type):
+    field = createField(engine_type=engine_type)
+    field.enableMetrics()
+    grids = recordGenerations(field, 40)
+
+    records = field.getMetrics().getRecords()
+    assert len(records) == 40
+    for record, previous, grid in zip(records, grids, grids[1:]):
+        generation, population, births, deaths, *bounding_box = record.tolist()
+        assert (population, births, deaths, tuple(bounding_box)) == getExpectedStats(previous, grid)
+    np.testing.assert_array_equal(field.getMetrics().getColumn("generation"), np.arange(1, 41))
+
+
+def testMetricsCountEdits():
+    field = createField()
+    field.enableMetrics()
+    field.stampPattern(patterns.PATTERNS["block"].cells, 0, 0, enums.StampModes.toggle)
+    field.paintCells([(29, 39)], 1)
+
+    assert field.getMetrics().getPopulation() == field.getEngine().getPopulation()
+    assert len(field.getMetrics().getRecords()) == 0
+
+
+def testMetricsOfEmptyBoard():
+    field = Field(enums.FieldStartModes.empty_field, 0, Vector2(10, 10))
+    field.enableMetrics()
+    field.processTick()
+
+    latest = field.getMetrics().getLatest()
+    assert (latest.population, latest.births, latest.deaths, latest.bounding_box) == (0, 0, 0, None)
+    assert field.getMetrics().getRecords()[0, metrics.METRICS_FIELDS.index("top")] == -1
+
+
+def testMetricsRingBuffer():
+    field = createField()
+    field.enableMetrics(capacity=16)
+    field.advance(50)
+
+    np.testing.assert_array_equal(field.getMetrics().getColumn("generation"), np.arange(35, 51))
+
+
+@pytest.mark.parametrize("extension", (".csv", ".jsonl"))
+def testMetricsSink(tmp_path, extension):
+    path = str(tmp_path / f"metrics{extension}")
+    field = createField()
+    field.enableMetrics(sink_path=path)
+    field.advance(10)
+    field.close()
+
+    with open(path, newline="") as file:
+        if extension == ".csv":
+            rows = [{key: int(value) for key, value in row.items()} for row in csv.DictReader(file)]
+        else:
+            rows = [json.loads(line) for line in file]
+    records = field.getMetrics().getRecords()
+    assert [row["population"] for row in rows] == records[:, metrics.METRICS_FIELDS.index("population")].tolist()
+    assert [row["generation"] for row in rows] == list(range(1, 11))
+
+
+def testIncorrectMetricsSink(tmp_path):
+    with pytest.raises(Exception):
+        metrics.MetricsSink(str(tmp_path / "metrics.txt"))
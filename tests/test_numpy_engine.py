@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from engines.numpy_engine import NumpyEngine, countNeighbours
+import enums
+import rules
+from utils import Vector2
+
+import reference
+from reference import createField, recordGenerations
+
+HEIGHT = 20
+WIDTH = 70
+
+
+def testCountNeighbours():
+    grid = reference.getRandomGrid(HEIGHT, WIDTH, seed=8)
+    counts = countNeighbours(np.pad(grid, 1))
+
+    padded = np.pad(grid, 1).astype(int)
+    expected = sum(padded[1 + di:1 + di + HEIGHT, 1 + dj:1 + dj + WIDTH]
+                   for di in (-1, 0, 1) for dj in (-1, 0, 1) if di or dj)
+    np.testing.assert_array_equal(counts, expected)
+
+
+def testMatchesReference():
+    engine = NumpyEngine(Vector2(WIDTH, HEIGHT))
+    reference.checkSteps(engine, reference.getGenerations(reference.getRandomGrid(HEIGHT, WIDTH, seed=1), 6))
+
+
+def testAdvanceMatchesSteps():
+    grids = reference.getGenerations(reference.getRandomGrid(HEIGHT, WIDTH, seed=1), 6)
+    engine = NumpyEngine(Vector2(WIDTH, HEIGHT))
+    engine.setGrid(grids[0])
+
+    rows, cols = engine.advance(6)
+    np.testing.assert_array_equal(engine.getGrid(), grids[-1])
+    np.testing.assert_array_equal(np.nonzero(grids[0] != grids[-1]), (rows, cols))
+    assert engine.generation == 6
+
+
+def testCellAccess():
+    reference.checkCellAccess(NumpyEngine(Vector2(WIDTH, HEIGHT)), reference.getRandomGrid(HEIGHT, WIDTH, seed=5))
+
+
+def testFieldTicksWithNumpyEngine():
+    field = createField(engine_type=enums.EngineTypes.numpy)
+    grids = recordGenerations(field, 5)
+
+    for grid, expected in zip(grids, reference.getGenerations(grids[0], 5)):
+        np.testing.assert_array_equal(grid, expected)
+    field.close()
+
+
+@pytest.mark.parametrize("boundary_mode", (enums.BoundaryModes.dead, enums.BoundaryModes.toroidal, enums.BoundaryModes.mirror),
+                         ids=lambda mode: mode.name)
+@pytest.mark.parametrize("rulestring", ("B3/S23", "B36/S23", "B0/S8"))
+def testStepInPlaceMatchesStep(boundary_mode, rulestring):
+    rule = rules.Rule(rulestring)
+    grid = reference.getRandomGrid(HEIGHT, WIDTH, seed=11)
+    engine = NumpyEngine(Vector2(WIDTH, HEIGHT), rule, boundary_mode)
+    in_place_engine = NumpyEngine(Vector2(WIDTH, HEIGHT), rule, boundary_mode)
+    engine.setGrid(grid)
+    in_place_engine.setGrid(grid)
+
+    for _ in range(7):
+        expected_changed = engine.step()
+        changed = in_place_engine.stepInPlace()
+        np.testing.assert_array_equal(in_place_engine.getGrid(), engine.getGrid())
+        np.testing.assert_array_equal(changed, expected_changed)
+    assert in_place_engine.generation == 7
+
+
+def testStepInPlaceKeepsEditsBetweenBuffers():
+    grids = reference.getGenerations(reference.getRandomGrid(HEIGHT, WIDTH, seed=12), 3)
+    engine = NumpyEngine(Vector2(WIDTH, HEIGHT))
+    engine.setGrid(grids[0])
+
+    # the edits go into whichever buffer holds the current generation, step and stepInPlace can be mixed
+    engine.stepInPlace()
+    engine.setCellState(0, 0, 1)
+    edited = grids[1].copy()
+    edited[0, 0] = 1
+    engine.step()
+    np.testing.assert_array_equal(engine.getGrid(), reference.stepGrid(edited))
+    engine.stepInPlace()
+    np.testing.assert_array_equal(engine.getGrid(), reference.stepGrid(reference.stepGrid(edited)))
+
+
+def testCheckpointMovesTheBoardIntoTheFirstBuffer():
+    grid = reference.getRandomGrid(HEIGHT, WIDTH, seed=13)
+    buffer = np.zeros((HEIGHT + 2, WIDTH + 2), dtype=np.uint8)
+    engine = NumpyEngine(Vector2(WIDTH, HEIGHT), buffer=buffer)
+    engine.setGrid(grid)
+
+    engine.stepInPlace()
+    engine.checkpoint()
+    np.testing.assert_array_equal(buffer[1:-1, 1:-1], reference.stepGrid(grid))
+    engine.stepInPlace()
+    np.testing.assert_array_equal(engine.getGrid(), reference.stepGrid(reference.stepGrid(grid)))
+
+
+@pytest.mark.parametrize("engine_type", (enums.EngineTypes.numpy, enums.EngineTypes.bitboard), ids=lambda engine_type: engine_type.name)
+def testFieldTickInPlaceMatchesTick(engine_type):
+    ticked_field = createField(engine_type=engine_type)
+    grids = recordGenerations(ticked_field, 5)
+    ticked_field.close()
+
+    field = createField(engine_type=engine_type)
+    for expected in grids[1:]:
+        field.processTickInPlace()
+        np.testing.assert_array_equal(field.getEngine().getGrid(), expected)
+    field.close()
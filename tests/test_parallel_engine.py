@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+import engines
+import enums
+import rules
+from utils import Vector2
+
+import reference
+
+BOUNDARY_MODES = (enums.BoundaryModes.dead, enums.BoundaryModes.toroidal, enums.BoundaryModes.mirror)
+
+
+@pytest.mark.parametrize("boundary_mode", BOUNDARY_MODES, ids=lambda mode: mode.name)
+@pytest.mark.parametrize("rulestring", ("B3/S23", "B36/S23", "B2/S", "B0/S8"))
+def testParallelEngineMatchesNumpyEngine(boundary_mode, rulestring):
+    grid_size = Vector2(53, 41)
+    rule = rules.Rule(rulestring)
+    grid = reference.getRandomGrid(grid_size.y, grid_size.x, seed=7)
+
+    numpy_engine = engines.numpy_engine.NumpyEngine(grid_size, rule, boundary_mode)
+    parallel_engine = engines.parallel_engine.ParallelEngine(grid_size, rule, boundary_mode, worker_count=3)
+    try:
+        numpy_engine.setGrid(grid)
+        parallel_engine.setGrid(grid)
+        for _ in range(30):
+            expected_changed = numpy_engine.step()
+            changed = parallel_engine.step()
+            np.testing.assert_array_equal(parallel_engine.getGrid(), numpy_engine.getGrid())
+            np.testing.assert_array_equal(changed, expected_changed)
+    finally:
+        parallel_engine.close()
+
+
+def testMoreWorkersThanRows():
+    engine = engines.parallel_engine.ParallelEngine(Vector2(12, 3), worker_count=8)
+    try:
+        assert engine.worker_count == 3
+        reference.checkSteps(engine, reference.getGenerations(reference.getRandomGrid(3, 12, seed=10), 4))
+    finally:
+        engine.close()
+    engine.close()
+
+
+def testCellAccess():
+    engine = engines.parallel_engine.ParallelEngine(Vector2(70, 20), worker_count=2)
+    try:
+        reference.checkCellAccess(engine, reference.getRandomGrid(20, 70, seed=5))
+    finally:
+        engine.close()
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+import enums
+from field import Field
+import pattern_format
+import patterns
+import save_format
+from utils import Vector2
+
+import reference
+from reference import iterRowChunks
+
+
+def testRleRoundTrip(tmp_path):
+    grid = reference.getRandomGrid(50, 90, seed=14)
+    grid[-3:] = 0
+    path = str(tmp_path / "pattern.rle")
+    pattern_format.writeRle(path, 90, 50, iterRowChunks(grid, 7), "B36/S23")
+
+    header = pattern_format.readRleHeader(path)
+    assert (header.width, header.height, header.rule) == (90, 50, "B36/S23")
+    with open(path) as file:
+        assert all(len(line.rstrip("\n")) <= pattern_format.RLE_LINE_LENGTH for line in file)
+
+    loaded = save_format.fillGrid(pattern_format.iterRleRows(path, rows_per_chunk=16), 50, 90)
+    np.testing.assert_array_equal(loaded, grid)
+
+
+def testReadRle(tmp_path):
+    path = tmp_path / "glider.rle"
+    path.write_text("#N Glider\n#C a comment\nx = 3, y = 3, rule = B3/S23:T10,10\nbo$2bo\n$3o!\n")
+
+    assert pattern_format.readRleHeader(str(path)).rule == "B3/S23"
+    loaded = save_format.fillGrid(pattern_format.iterRleRows(str(path)), 3, 3)
+    np.testing.assert_array_equal(loaded, patterns.PATTERNS["glider"].cells)
+
+
+@pytest.mark.parametrize("read_rows", (pattern_format.iterRleRows, pattern_format.iterPlaintextRows),
+                         ids=("rle", "plaintext"))
+def testPatternIsReadInChunks(tmp_path, read_rows):
+    grid = np.zeros((45, 12), dtype=np.uint8)
+    grid[[0, 1, 20, 44], [0, 11, 5, 3]] = 1
+    path = str(tmp_path / "pattern")
+    if read_rows is pattern_format.iterRleRows:
+        # skips over whole chunks with a single run of empty rows
+        pattern_format.writeRle(path, 12, 45, iterRowChunks(grid, 45))
+    else:
+        pattern_format.writePlaintext(path, iterRowChunks(grid, 45))
+
+    top = 0
+    for chunk_top, rows in read_rows(path, rows_per_chunk=8):
+        assert chunk_top == top and 0 < rows.shape[0] <= 8
+        np.testing.assert_array_equal(rows, grid[top:top + rows.shape[0], :rows.shape[1]])
+        top += rows.shape[0]
+    assert top == 45
+
+
+@pytest.mark.parametrize("path, save_format_type", (("a.rle", enums.SaveFormats.rle), ("a.CELLS", enums.SaveFormats.plaintext),
+                                                    ("save.bin", enums.SaveFormats.binary)))
+def testSaveFormatFollowsExtension(path, save_format_type):
+    assert pattern_format.getSaveFormat(path) == save_format_type
+
+
+def testRleRowWiderThanHeaderIsRefused(tmp_path):
+    path = tmp_path / "wide.rle"
+    path.write_text("x = 2, y = 1\n3o!\n")
+
+    with pytest.raises(Exception):
+        list(pattern_format.iterRleRows(str(path)))
+
+
+def testPlaintextRoundTrip(tmp_path):
+    grid = reference.getRandomGrid(30, 25, seed=15)
+    grid[:, -1] = 1
+    path = str(tmp_path / "pattern.cells")
+    pattern_format.writePlaintext(path, iterRowChunks(grid, 8), "soup")
+
+    with open(path) as file:
+        assert file.readline() == "!Name: soup\n"
+    loaded = save_format.fillGrid(pattern_format.iterPlaintextRows(path, rows_per_chunk=8), 30, 25)
+    np.testing.assert_array_equal(loaded, grid)
+
+
+def testReadPlaintext(tmp_path):
+    path = tmp_path / "glider.cells"
+    path.write_bytes(b"!Name: Glider\n.O\n..O\r\nOOO\n")
+
+    loaded = save_format.fillGrid(pattern_format.iterPlaintextRows(str(path)), 3, 3)
+    np.testing.assert_array_equal(loaded, patterns.PATTERNS["glider"].cells)
+
+
+@pytest.mark.parametrize("file_name", ("pattern.rle", "pattern.cells"))
+def testFieldSaveLoad(tmp_path, file_name):
+    path = str(tmp_path / file_name)
+    field = Field(enums.FieldStartModes.random_field, 30, Vector2(40, 300))
+    grid = field.getEngine().getGrid().copy()
+    field.saveField(path)
+
+    field.refillField()
+    field.loadField(path)
+    np.testing.assert_array_equal(field.getEngine().getGrid(), grid)
+    field.close()
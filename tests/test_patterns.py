@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+import enums
+from field import Field
+import patterns
+from utils import Vector2
+
+import reference
+
+WIDTH = 40
+HEIGHT = 30
+
+
+def testGliderVariants():
+    variants = patterns.PATTERNS["glider"].variants
+    assert len(variants) == 8
+    assert any(np.array_equal(variant, patterns.PATTERNS["glider"].cells) for variant in variants)
+    # a glider of every variant moves diagonally by one cell in 4 generations
+    for variant in variants:
+        grid = np.zeros((12, 12), dtype=np.uint8)
+        grid[4:7, 4:7] = variant
+        for _ in range(4):
+            grid = reference.stepGrid(grid)
+        rows, cols = np.nonzero(grid)
+        variant_rows, variant_cols = np.nonzero(variant)
+        assert abs(rows.min() - 4 - variant_rows.min()) == 1 and abs(cols.min() - 4 - variant_cols.min()) == 1
+
+
+@pytest.mark.parametrize("name, variant_count", (("block", 1), ("blinker", 2), ("lwss", 8),
+                                                 ("gosper_glider_gun", 8)))
+def testVariantsAreDistinct(name, variant_count):
+    variants = patterns.PATTERNS[name].variants
+    assert len(variants) == variant_count
+    for k, variant in enumerate(variants):
+        assert variant.sum() == patterns.PATTERNS[name].cells.sum()
+        assert not any(variant.shape == other.shape and np.array_equal(variant, other) for other in variants[k + 1:])
+
+
+def stampOnEmptyField(cells: np.ndarray, top: int, left: int,
+                      mode: enums.StampModes.__dict__ = enums.StampModes.overlay) -> np.ndarray:
+    field = Field(enums.FieldStartModes.empty_field, 0, Vector2(WIDTH, HEIGHT))
+    field.stampPattern(cells, top, left, mode)
+    return field.getEngine().getGrid()
+
+
+def getExpectedStamp(cells: np.ndarray, top: int, left: int) -> np.ndarray:
+    margin = max(cells.shape) + max(HEIGHT, WIDTH)
+    padded = np.zeros((HEIGHT + 2 * margin, WIDTH + 2 * margin), dtype=np.uint8)
+    padded[top + margin:top + margin + cells.shape[0], left + margin:left + margin + cells.shape[1]] = cells
+    return padded[margin:-margin, margin:-margin]
+
+
+@pytest.mark.parametrize("top, left", (
+    (10, 10),
+    (-3, 10), (10, -20), (25, 10), (10, 30),
+    (-5, -30), (25, 30),
+    (HEIGHT, 0), (0, WIDTH), (HEIGHT + 3, WIDTH + 3), (-9, 0), (0, -36),
+))
+def testStampIsClippedAtTheEdges(top, left):
+    cells = patterns.PATTERNS["gosper_glider_gun"].cells
+    np.testing.assert_array_equal(stampOnEmptyField(cells, top, left), getExpectedStamp(cells, top, left))
+
+
+def testStampModes():
+    field = Field(enums.FieldStartModes.empty_field, 0, Vector2(WIDTH, HEIGHT))
+    block = patterns.PATTERNS["block"].cells
+    field.stampPattern(block, 5, 5)
+    field.stampPattern(block, 5, 6, enums.StampModes.overlay)
+    assert field.getEngine().getPopulation() == 6
+
+    field.stampPattern(block, 5, 6, enums.StampModes.toggle)
+    assert field.getEngine().getPopulation() == 2
+    np.testing.assert_array_equal(np.nonzero(field.getEngine().getGrid()), ([5, 6], [5, 5]))
@@ -0,0 +1,89 @@
+import cProfile
+import os
+import threading
+
+import profiler
+from profiler import PhaseTimer, ProfileCapture
+
+
+def testPercentiles():
+    timer = PhaseTimer(sample_count=100, enabled=True)
+    for milliseconds in range(1, 201):
+        timer.record("tick", milliseconds / 1000)
+
+    p50, p99 = timer.getPercentiles("tick")
+    assert abs(p50 - 0.1505) < 1e-9
+    assert timer.getPercentiles("draw") == (0.0, 0.0)
+    assert timer.getReport()[0].startswith("tick")
+
+
+def testEnablingForgetsSamples():
+    timer = PhaseTimer(enabled=True)
+    with timer.measure("tick"):
+        pass
+    timer.setEnabled(False)
+    with timer.measure("draw"):
+        pass
+    assert len(timer.getReport()) == 1
+
+    timer.setEnabled(True)
+    assert timer.getReport() == []
+
+
+class SingleProfile(cProfile.Profile):
+    """
+    Refuses a second active profiler like cProfile does since Python 3.12
+    """
+    active = False
+
+    def enable(self, *args, **kwargs):
+        if SingleProfile.active:
+            raise ValueError("Another profiling tool is already active")
+        SingleProfile.active = True
+        super().enable(*args, **kwargs)
+
+    def disable(self):
+        SingleProfile.active = False
+        super().disable()
+
+
+def captureFromTwoThreads(directory: str) -> list[Exception]:
+    capture = ProfileCapture(directory)
+    capture.toggle()
+    # the main thread waits on them too, so it stops the capture while both profilers are enabled
+    synced = threading.Barrier(3, timeout=10)
+    stopped = threading.Barrier(3, timeout=10)
+    errors = []
+
+    def profileThread(name: str):
+        try:
+            capture.sync(name)
+            synced.wait()
+            sum(range(1000))
+            stopped.wait()
+            capture.sync(name)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=profileThread, args=(name,)) for name in ("game", "gui")]
+    for thread in threads:
+        thread.start()
+    synced.wait()
+    capture.toggle()
+    stopped.wait()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+def testCaptureFromTwoThreads(tmp_path):
+    assert captureFromTwoThreads(str(tmp_path)) == []
+    assert os.listdir(tmp_path)
+
+
+def testCaptureFromTwoThreadsWithSingleProfiler(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler.cProfile, "Profile", SingleProfile)
+
+    assert captureFromTwoThreads(str(tmp_path)) == []
+    assert len(os.listdir(tmp_path)) == 1
+    assert not SingleProfile.active
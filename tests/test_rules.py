@@ -0,0 +1,83 @@
+import functools
+
+import numpy as np
+import pytest
+
+import engines
+import rules
+from utils import Vector2
+
+import reference
+
+
+@pytest.mark.parametrize("rulestring, birth, survival", (
+    ("B3/S23", (3,), (2, 3)),
+    ("b36/s23", (3, 6), (2, 3)),
+    ("S23/B36", (3, 6), (2, 3)),
+    ("23/36", (3, 6), (2, 3)),
+    ("B2/S", (2,), ()),
+    ("B/S012345678", (), (0, 1, 2, 3, 4, 5, 6, 7, 8)),
+    (" B33/S32 ", (3,), (2, 3)),
+))
+def testParseRulestring(rulestring, birth, survival):
+    rule = rules.Rule(rulestring)
+    assert rule.birth == birth
+    assert rule.survival == survival
+
+
+@pytest.mark.parametrize("rulestring", ("B3S23", "B3/S23/X", "B9/S23", "Bx/S23", ""))
+def testIncorrectRulestring(rulestring):
+    with pytest.raises(Exception):
+        rules.Rule(rulestring)
+
+
+def testRulestringIsNormalized():
+    assert str(rules.Rule("s32/b63")) == "B36/S23"
+    assert rules.CONWAY.rulestring == "B3/S23"
+
+
+def testNextStateTable():
+    rule = rules.Rule("B36/S23")
+    for amount_of_neighbours in range(9):
+        assert rule.table[0, amount_of_neighbours] == (amount_of_neighbours in (3, 6))
+        assert rule.table[1, amount_of_neighbours] == (amount_of_neighbours in (2, 3))
+        assert bool(rule.birth_mask >> amount_of_neighbours & 1) == (amount_of_neighbours in (3, 6))
+        assert bool(rule.survival_mask >> amount_of_neighbours & 1) == (amount_of_neighbours in (2, 3))
+    np.testing.assert_array_equal(rule.flat_table, rule.table.ravel())
+
+
+def testBirthOnZero():
+    assert rules.Rule("B0/S8").isBirthOnZero()
+    assert not rules.CONWAY.isBirthOnZero()
+
+
+BOUNDED_ENGINES = (engines.numpy_engine.NumpyEngine, engines.bitboard_engine.BitboardEngine,
+                   engines.tiled_engine.TiledEngine)
+UNBOUNDED_ENGINES = (engines.hashlife_engine.HashLifeEngine, engines.sparse_engine.SparseEngine)
+
+
+@functools.lru_cache
+def getReferenceGenerations(rulestring: str) -> list[np.ndarray]:
+    return reference.getGenerations(reference.getRandomGrid(20, 70, seed=1), 6, rules.Rule(rulestring))
+
+
+@pytest.mark.parametrize("engine_class", BOUNDED_ENGINES, ids=lambda engine_class: engine_class.__name__)
+@pytest.mark.parametrize("rulestring", ("B36/S23", "B2/S", "B0/S8"))
+def testBoundedEngineFollowsRule(engine_class, rulestring):
+    engine = engine_class(Vector2(70, 20), rules.Rule(rulestring))
+    reference.checkSteps(engine, getReferenceGenerations(rulestring))
+
+
+@pytest.mark.parametrize("engine_class", UNBOUNDED_ENGINES, ids=lambda engine_class: engine_class.__name__)
+@pytest.mark.parametrize("rulestring", ("B36/S23", "B2/S"))
+def testUnboundedEngineFollowsRule(engine_class, rulestring):
+    grid = reference.getRandomGrid(16, 24, seed=2)
+    rule = rules.Rule(rulestring)
+    engine = engine_class(Vector2(24, 16), rule)
+    reference.checkSteps(engine, [reference.advanceUnbounded(grid, generations, rule) for generations in range(4)])
+
+
+@pytest.mark.parametrize("engine_class", UNBOUNDED_ENGINES, ids=lambda engine_class: engine_class.__name__)
+def testUnboundedEngineRefusesBirthOnZero(engine_class):
+    with pytest.raises(Exception, match="birth on 0"):
+        engine_class(Vector2(8, 8), rules.Rule("B0/S8"))
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+import enums
+from field import Field
+import save_format
+from utils import Vector2
+
+import reference
+from reference import iterRowChunks
+
+
+@pytest.mark.parametrize("compression", tuple(enums.SaveCompressions), ids=lambda compression: compression.name)
+def testSaveRoundTrip(tmp_path, compression):
+    grid = reference.getRandomGrid(70, 37, seed=10)
+    path = str(tmp_path / "save.bin")
+    save_format.writeSave(path, 37, 70, iterRowChunks(grid, 16), compression, rows_per_chunk=16)
+
+    header = save_format.readSaveHeader(path)
+    assert (header.width, header.height, header.compression) == (37, 70, compression)
+    np.testing.assert_array_equal(save_format.loadGrid(path, 70, 37), grid)
+
+
+def testSaveIsCroppedAndPadded(tmp_path):
+    grid = reference.getRandomGrid(20, 30, seed=11)
+    path = str(tmp_path / "save.bin")
+    save_format.writeSave(path, 30, 20, iterRowChunks(grid, 8), rows_per_chunk=8)
+
+    np.testing.assert_array_equal(save_format.loadGrid(path, 10, 12), grid[:10, :12])
+    padded = save_format.loadGrid(path, 25, 40)
+    np.testing.assert_array_equal(padded[:20, :30], grid)
+    assert not padded[20:].any() and not padded[:, 30:].any()
+
+
+def testTruncatedSaveIsRefused(tmp_path):
+    grid = reference.getRandomGrid(40, 40, seed=12)
+    path = tmp_path / "save.bin"
+    save_format.writeSave(str(path), 40, 40, iterRowChunks(grid, 40), enums.SaveCompressions.none, rows_per_chunk=40)
+    path.write_bytes(path.read_bytes()[:-10])
+
+    with pytest.raises(Exception):
+        save_format.loadGrid(str(path), 40, 40)
+
+
+def testLegacySave(tmp_path):
+    grid = reference.getRandomGrid(6, 9, seed=13)
+    path = tmp_path / "save.bin"
+    path.write_bytes(save_format.LEGACY_SAVE_FILE_PATTERN
+                     + b"".join(row.tobytes() + bytes([save_format.LEGACY_ROW_END]) for row in grid))
+
+    assert save_format.isLegacySave(str(path))
+    np.testing.assert_array_equal(save_format.loadGrid(str(path), 6, 9), grid)
+
+
+@pytest.mark.parametrize("compression", tuple(enums.SaveCompressions), ids=lambda compression: compression.name)
+def testSaveIsReadInChunks(tmp_path, compression):
+    grid = reference.getRandomGrid(1000, 2000, seed=16)
+    path = str(tmp_path / "save.bin")
+    save_format.writeSave(path, 2000, 1000, iterRowChunks(grid, 64), compression, rows_per_chunk=64)
+
+    chunks = list(save_format.iterSaveRows(path))
+    assert [top for top, _ in chunks] == list(range(0, 1000, 64))
+    assert all(rows.shape == (64, 2000) for _, rows in chunks[:-1])
+    assert chunks[-1][1].shape == (1000 % 64, 2000)
+    np.testing.assert_array_equal(np.concatenate([rows for _, rows in chunks]), grid)
+
+
+def testFieldSaveLoad(tmp_path):
+    path = str(tmp_path / "save.bin")
+    field = Field(enums.FieldStartModes.random_field, 30, Vector2(40, 300))
+    grid = field.getEngine().getGrid().copy()
+    field.saveField(path)
+
+    field.refillField()
+    field.loadField(path)
+    np.testing.assert_array_equal(field.getEngine().getGrid(), grid)
+    field.close()
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from engines.numpy_engine import NumpyEngine
+import enums
+import save_format
+from utils import Vector2
+
+import reference
+from reference import createField
+
+
+def testSnapshotRoundTrip(tmp_path):
+    path = str(tmp_path / "field.snap")
+    field = createField()
+    field.advance(3)
+    field.createSnapshot(path)
+
+    # the field keeps running on the mapped file, a checkpoint makes the file hold the latest generation
+    field.advance(4)
+    field.processTickInPlace()
+    field.checkpointSnapshot()
+    grid = field.getEngine().getGrid().copy()
+
+    opened = createField(10, 10)
+    opened.openSnapshot(path)
+    assert (opened.getEngine().grid_size.x, opened.getEngine().grid_size.y) == (40, 30)
+    assert opened.getEngine().generation == 8
+    np.testing.assert_array_equal(opened.getEngine().getGrid(), grid)
+
+    opened.processTick()
+    np.testing.assert_array_equal(opened.getEngine().getGrid(), reference.stepGrid(grid))
+    opened.close()
+    field.close()
+
+
+def testCheckpointWithoutSnapshot():
+    field = createField()
+    with pytest.raises(Exception, match="No snapshot is opened"):
+        field.checkpointSnapshot()
+
+
+def testSnapshotIsChecked(tmp_path):
+    path = tmp_path / "field.snap"
+    path.write_bytes(b"not a snapshot" * 10)
+    with pytest.raises(Exception, match="Incorrect snapshot file"):
+        save_format.Snapshot(str(path))
+
+    save_format.createSnapshot(str(path), 40, 30).close()
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(Exception, match="board data ends early"):
+        save_format.Snapshot(str(path))
+
+
+def testNumpyEngineRefusesBufferOfWrongShape():
+    with pytest.raises(Exception, match="does not fit"):
+        NumpyEngine(Vector2(40, 30), buffer=np.zeros((30, 40), dtype=np.uint8))
+
+
+def testSnapshotIsRefusedBeforeTheEngineIsClosed(tmp_path):
+    field = createField(engine_type=enums.EngineTypes.bitboard)
+    field.processTick()
+    grid = field.getEngine().getGrid().copy()
+    path = tmp_path / "field.snap"
+
+    with pytest.raises(Exception, match="Only the numpy engine"):
+        field.createSnapshot(str(path))
+    with pytest.raises(Exception, match="Only the numpy engine"):
+        field.openSnapshot(str(path))
+
+    assert not path.exists()
+    np.testing.assert_array_equal(field.getEngine().getGrid(), grid)
+    field.processTick()
+    assert field.getEngine().generation == 2
+    field.close()
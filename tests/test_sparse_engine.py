@@ -0,0 +1,45 @@
+import numpy as np
+
+from engines.hashlife_engine import HashLifeEngine
+from engines.sparse_engine import SparseEngine
+import patterns
+from utils import Vector2
+
+import reference
+
+
+def testMatchesReference():
+    grid = reference.getRandomGrid(16, 24, seed=2)
+    engine = SparseEngine(Vector2(24, 16))
+    reference.checkSteps(engine, [reference.advanceUnbounded(grid, generations) for generations in range(4)])
+
+
+def testGliderKeepsEvolvingOutsideWindow():
+    engine = SparseEngine(Vector2(16, 16))
+    engine.setRegion(0, 0, patterns.PATTERNS["glider"].cells)
+
+    rows, cols = engine.advance(100)
+    assert engine.getPopulation() == 0
+    # 25 cells down and right after 100 generations
+    assert engine.getLiveCells() == {(i + 25, j + 25) for i, j in zip(*np.nonzero(patterns.PATTERNS["glider"].cells))}
+    np.testing.assert_array_equal(np.nonzero(patterns.PATTERNS["glider"].cells), (rows, cols))
+
+
+def testAgreesWithHashLifeOverLongAdvance():
+    grid = reference.getRandomGrid(48, 48, seed=3)
+    hashlife = HashLifeEngine(Vector2(48, 48))
+    sparse = SparseEngine(Vector2(48, 48))
+    hashlife.setGrid(grid)
+    sparse.setGrid(grid)
+
+    for generations in (1, 31, 200, 513):
+        hashlife.advance(generations)
+        sparse.advance(generations)
+        np.testing.assert_array_equal(hashlife.getGrid(), sparse.getGrid())
+        np.testing.assert_array_equal(hashlife.getRows(10, 30), sparse.getGrid()[10:30])
+        np.testing.assert_array_equal(sparse.getRows(10, 30), sparse.getGrid()[10:30])
+    assert hashlife.getUniversePopulation() == len(sparse.getLiveCells())
+
+
+def testCellAccess():
+    reference.checkCellAccess(SparseEngine(Vector2(70, 20)), reference.getRandomGrid(20, 70, seed=5))
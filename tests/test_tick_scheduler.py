@@ -0,0 +1,83 @@
+import threading
+import time
+
+from tick_scheduler import TickScheduler
+
+# generous, a loaded machine may wake the threads late
+TIMEOUT = 5
+
+
+def startWaiting(scheduler: TickScheduler) -> tuple[threading.Thread, list[bool]]:
+    results = []
+    thread = threading.Thread(target=lambda: results.append(scheduler.waitForTick()))
+    thread.start()
+    return thread, results
+
+
+def testTicksArePaced():
+    scheduler = TickScheduler(100)
+    start_time = time.perf_counter()
+    for _ in range(11):
+        assert scheduler.waitForTick()
+    assert time.perf_counter() - start_time >= 0.095
+
+
+def testLateTickIsNotCaughtUp():
+    scheduler = TickScheduler(50)
+    scheduler.waitForTick()
+    time.sleep(0.2)
+
+    scheduler.waitForTick()
+    start_time = time.perf_counter()
+    scheduler.waitForTick()
+    # the ticks missed while sleeping are dropped instead of being run back to back
+    assert time.perf_counter() - start_time >= 0.015
+
+
+def testPausedSchedulerWaitsUntilResumed():
+    scheduler = TickScheduler(1000, paused=True)
+    thread, results = startWaiting(scheduler)
+    thread.join(0.1)
+    assert thread.is_alive()
+
+    scheduler.setPaused(False)
+    thread.join(TIMEOUT)
+    assert results == [True]
+
+
+def testZeroTicksPerSecondWaitsForPace():
+    scheduler = TickScheduler(0)
+    thread, results = startWaiting(scheduler)
+    thread.join(0.1)
+    assert thread.is_alive()
+
+    scheduler.setTicksPerSecond(1000)
+    thread.join(TIMEOUT)
+    assert results == [True]
+
+
+def testStopWakesWaiter():
+    scheduler = TickScheduler(1, paused=True)
+    thread, results = startWaiting(scheduler)
+    thread.join(0.1)
+
+    scheduler.stop()
+    thread.join(TIMEOUT)
+    assert results == [False]
+    assert scheduler.isStopped()
+    assert not scheduler.waitForTick()
+
+
+def testSlowPaceIsInterruptedByNewPace():
+    scheduler = TickScheduler(1)
+    scheduler.waitForTick()
+    thread, results = startWaiting(scheduler)
+    thread.join(0.1)
+    assert thread.is_alive()
+
+    # without the change the next tick would be almost a second away
+    start_time = time.perf_counter()
+    scheduler.setTicksPerSecond(1000)
+    thread.join(TIMEOUT)
+    assert results == [True]
+    assert time.perf_counter() - start_time < 0.5
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from engines.tiled_engine import TiledEngine, dilateTiles
+import patterns
+from utils import Vector2
+
+import reference
+
+HEIGHT = 20
+WIDTH = 70
+
+
+@pytest.mark.parametrize("wrap", (False, True))
+def testDilateTiles(wrap):
+    tiles = np.zeros((4, 5), dtype=bool)
+    tiles[0, 0] = True
+
+    expected = np.zeros_like(tiles)
+    expected[:2, :2] = True
+    if wrap:
+        expected[-1, :2] = expected[:2, -1] = expected[-1, -1] = True
+    np.testing.assert_array_equal(dilateTiles(tiles, wrap), expected)
+
+
+@pytest.mark.parametrize("tile_size", (4, 32))
+def testMatchesReference(tile_size):
+    engine = TiledEngine(Vector2(WIDTH, HEIGHT), tile_size=tile_size)
+    reference.checkSteps(engine, reference.getGenerations(reference.getRandomGrid(HEIGHT, WIDTH, seed=1), 6))
+
+
+def testGliderCrossesTiles():
+    grid = np.zeros((HEIGHT, WIDTH), dtype=np.uint8)
+    grid[1:4, 1:4] = patterns.PATTERNS["glider"].cells
+    engine = TiledEngine(Vector2(WIDTH, HEIGHT), tile_size=4)
+    reference.checkSteps(engine, reference.getGenerations(grid, 40))
+
+
+def testEditsWakeUpStableTiles():
+    grid = np.zeros((HEIGHT, WIDTH), dtype=np.uint8)
+    grid[1:3, 1:3] = patterns.PATTERNS["block"].cells
+    engine = TiledEngine(Vector2(WIDTH, HEIGHT), tile_size=4)
+    engine.setGrid(grid)
+    engine.advance(3)
+
+    # a blinker put into tiles that have been stable for generations still has to oscillate
+    engine.setCellState(10, 40, 1)
+    engine.setCellState(10, 41, 1)
+    engine.setCellState(10, 42, 1)
+    engine.setRegion(15, 60, np.ones((1, 3), dtype=np.uint8))
+    grids = reference.getGenerations(engine.getGrid().copy(), 4)
+    for expected in grids[1:]:
+        engine.step()
+        np.testing.assert_array_equal(engine.getGrid(), expected)
+
+
+def testCellAccess():
+    reference.checkCellAccess(TiledEngine(Vector2(WIDTH, HEIGHT)), reference.getRandomGrid(HEIGHT, WIDTH, seed=5))
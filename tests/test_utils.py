@@ -0,0 +1,26 @@
+import pytest
+
+from utils import bresenhamLine
+
+
+def testSinglePoint():
+    assert bresenhamLine((3, 4), (3, 4)) == [(3, 4)]
+
+
+def testStraightLines():
+    assert bresenhamLine((2, 1), (2, 4)) == [(2, 1), (2, 2), (2, 3), (2, 4)]
+    assert bresenhamLine((5, 0), (2, 0)) == [(5, 0), (4, 0), (3, 0), (2, 0)]
+    assert bresenhamLine((0, 0), (-3, 3)) == [(0, 0), (-1, 1), (-2, 2), (-3, 3)]
+
+
+@pytest.mark.parametrize("end", ((7, 2), (-2, 9), (-11, -4), (3, -13), (1, 1), (0, -5)))
+def testLineHasNoGaps(end):
+    points = bresenhamLine((0, 0), end)
+
+    assert points[0] == (0, 0) and points[-1] == end
+    assert len(points) == max(abs(end[0]), abs(end[1])) + 1
+    for (i0, j0), (i1, j1) in zip(points, points[1:]):
+        assert max(abs(i1 - i0), abs(j1 - j0)) == 1
+    # every point stays within half a cell of the ideal line
+    for i, j in points:
+        assert abs(i * end[1] - j * end[0]) <= max(abs(end[0]), abs(end[1])) / 2
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from gui.viewport import Viewport, calcDensityMap
+from utils import Vector2
+
+
+def createViewport(zoom: float = 1) -> Viewport:
+    return Viewport(Vector2(100, 50), Vector2(400, 300), Vector2(4096, 2048), zoom)
+
+
+def testDensityMap():
+    sampled = np.zeros((3, 5), dtype=np.uint8)
+    sampled[0, :2] = 1
+    sampled[1, 0] = 1
+    sampled[2, 4] = 1
+
+    # blocks past the edge are padded with empty cells
+    np.testing.assert_array_equal(calcDensityMap(sampled, 2), [[191, 0, 0], [0, 0, 63]])
+    np.testing.assert_array_equal(calcDensityMap(sampled, 1), sampled * 255)
+
+
+def testScreenAndWorldAreInverse():
+    viewport = createViewport(4)
+    viewport.pan(-123, -45)
+
+    world_pos = viewport.screenToWorld(Vector2(250, 130))
+    screen_pos = viewport.worldToScreen(world_pos)
+    assert (screen_pos.x, screen_pos.y) == pytest.approx((250, 130))
+    assert (world_pos.x, world_pos.y) == pytest.approx((123 / 4 + 150 / 4, 45 / 4 + 80 / 4))
+
+
+@pytest.mark.parametrize("steps", (3, -3, 1, -1))
+def testZoomKeepsCellUnderCursor(steps):
+    viewport = createViewport()
+    viewport.pan(-2000, -1000)
+    cursor = Vector2(180, 220)
+    anchor = viewport.screenToWorld(cursor)
+
+    viewport.zoomAt(steps, cursor)
+    zoom_index = Viewport.ZOOM_LEVELS.index(1) + steps
+    assert viewport.zoom == Viewport.ZOOM_LEVELS[zoom_index]
+    moved = viewport.screenToWorld(cursor)
+    assert (moved.x, moved.y) == pytest.approx((anchor.x, anchor.y))
+
+
+def testZoomStopsAtLastLevel():
+    viewport = createViewport(Viewport.ZOOM_LEVELS[-1])
+    viewport.zoomAt(5, Vector2(100, 50))
+    assert viewport.zoom == Viewport.ZOOM_LEVELS[-1]
+    viewport.zoomAt(-100, Vector2(100, 50))
+    assert viewport.zoom == Viewport.ZOOM_LEVELS[0]
+
+
+def testPanIsClamped():
+    viewport = createViewport()
+    viewport.pan(10 ** 6, 10 ** 6)
+    assert (viewport.left, viewport.top) == (-200, -150)
+
+    viewport.pan(-10 ** 7, -10 ** 7)
+    assert (viewport.left, viewport.top) == (4096 - 200, 2048 - 150)
+    assert viewport.getVisibleCells() == (2048 - 150, 4096 - 200, 2048, 4096)
+
+
+def testVisibleCellsOfZoomedOutView():
+    viewport = createViewport(1 / 8)
+    viewport.left, viewport.top = 13.5, 21
+
+    # aligned to whole 8 x 8 pixels and cut at the board edges
+    assert viewport.getVisibleCells() == (16, 8, 2048, 3214)
+    assert viewport.getCellsPerPixel() == 8
+    assert viewport.getSampledRegion(2) == (16, 8, 2048, 3214, 4)
+    assert viewport.getSampledRegion(16) == (16, 8, 2048, 3214, 1)
+
+
+def testIsOnScreen():
+    viewport = createViewport()
+    assert viewport.isOnScreen(Vector2(100, 50))
+    assert viewport.isOnScreen(Vector2(499, 349))
+    assert not viewport.isOnScreen(Vector2(500, 100))
+    assert not viewport.isOnScreen(Vector2(99, 100))
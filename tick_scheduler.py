@@ -0,0 +1,62 @@
+import threading
+import time
+
+
+class TickScheduler:
+    """
+    Paces the simulation thread: waitForTick sleeps on a condition until the next tick is due,
+    and is woken early when the pace, the pause state or the running state changes
+    """
+    def __init__(self, ticks_per_second: int, paused: bool = False):
+        self.__condition = threading.Condition()
+        self.__ticks_per_second = ticks_per_second
+        self.__paused = paused
+        self.__stopped = False
+        self.__next_tick_time = time.perf_counter()
+
+    def setTicksPerSecond(self, ticks_per_second: int):
+        with self.__condition:
+            if ticks_per_second == self.__ticks_per_second:
+                return
+            self.__ticks_per_second = ticks_per_second
+            self.__next_tick_time = time.perf_counter()
+            self.__condition.notify_all()
+
+    def setPaused(self, paused: bool):
+        with self.__condition:
+            if paused == self.__paused:
+                return
+            self.__paused = paused
+            self.__next_tick_time = time.perf_counter()
+            self.__condition.notify_all()
+
+    def stop(self):
+        with self.__condition:
+            self.__stopped = True
+            self.__condition.notify_all()
+
+    def isStopped(self) -> bool:
+        return self.__stopped
+
+    def waitForTick(self) -> bool:
+        """
+        Blocks until the next tick is due, returns False once the scheduler is stopped
+        """
+        with self.__condition:
+            while not self.__stopped:
+                if self.__paused or not self.__ticks_per_second:
+                    self.__condition.wait()
+                    continue
+
+                now = time.perf_counter()
+                remaining = self.__next_tick_time - now
+                if remaining <= 0:
+                    # a tick late by a whole period moves the schedule instead of being caught up with a burst of ticks
+                    period = 1 / self.__ticks_per_second
+                    self.__next_tick_time += period
+                    if self.__next_tick_time <= now:
+                        self.__next_tick_time = now + period
+                    return True
+                self.__condition.wait(remaining)
+
+            return False
@@ -24,3 +24,26 @@ class Vector2:
         y = self.y * other.y
         return Vector2(x, y)
 
+
+def bresenhamLine(start: tuple[int, int], end: tuple[int, int]) -> list[tuple[int, int]]:
+    """
+    Integer points of the line between start and end, both included, with no gaps between neighbouring points
+    """
+    (i0, j0), (i1, j1) = start, end
+    di, dj = abs(i1 - i0), -abs(j1 - j0)
+    step_i, step_j = (1 if i0 < i1 else -1), (1 if j0 < j1 else -1)
+    error = di + dj
+
+    points = []
+    while True:
+        points.append((i0, j0))
+        if i0 == i1 and j0 == j1:
+            return points
+
+        doubled_error = 2 * error
+        if doubled_error >= dj:
+            error += dj
+            i0 += step_i
+        if doubled_error <= di:
+            error += di
+            j0 += step_j